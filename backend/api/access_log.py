@@ -0,0 +1,84 @@
+"""
+アクセスログ
+
+1リクエストにつき1レコード（メソッド・パス・ステータス・処理時間・ユーザー・接続元）を
+backend.access ロガーへ記録する ASGI ミドルウェア。
+
+高頻度の読み取りエンドポイント（logging.access_log_sampled_paths）は
+logging.access_log_sample_rate の割合だけ記録する。エラー（4xx/5xx）と
+遅いリクエスト（logging.access_log_slow_ms 以上）はサンプリングせず常に記録する。
+設定は1リクエスト毎に読むため、再読み込みがそのまま反映される。
+"""
+
+import logging
+import random
+import time
+
+from ..core.config import settings
+
+access_logger = logging.getLogger("backend.access")
+
+
+class AccessLogMiddleware:
+    """1リクエスト1レコードのアクセスログ（ASGI ミドルウェア）"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        # request.state の実体（後段で作られると参照できないため先に用意する）
+        scope.setdefault("state", {})
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._log(scope, status_code, (time.perf_counter() - start) * 1000)
+
+    @staticmethod
+    def _log(scope, status_code: int, duration_ms: float) -> None:
+        config = settings.logging
+        if not config.access_log or not access_logger.isEnabledFor(logging.INFO):
+            return
+
+        path = scope["path"]
+        sample_rate = 1.0
+        if (
+            status_code < 400
+            and duration_ms < config.access_log_slow_ms
+            and path.startswith(tuple(config.access_log_sampled_paths))
+        ):
+            sample_rate = config.access_log_sample_rate
+            if random.random() >= sample_rate:
+                return
+
+        client = scope.get("client")
+        # 認証済みの場合は get_current_user が request.state.user に設定する
+        user = scope.get("state", {}).get("user")
+        access_logger.info(
+            "%s %s %d %.1fms",
+            scope["method"],
+            path,
+            status_code,
+            duration_ms,
+            extra={
+                "method": scope["method"],
+                "path": path,
+                "status": status_code,
+                "duration_ms": round(duration_ms, 2),
+                "user": user,
+                "client_ip": client[0] if client else None,
+                "sample_rate": sample_rate,
+            },
+        )
@@ -0,0 +1,205 @@
+"""
+応答の圧縮
+
+Accept-Encoding に応じて応答本文を圧縮する ASGI ミドルウェア。gzip は常に、
+brotli はライブラリがインストールされている場合のみ使う（br を優先）。
+
+- JSON・テキスト系の Content-Type のみ対象（gzip 済みのエクスポートなどは対象外）
+- compression.min_size 未満の応答は圧縮しない
+- ストリーミング応答はチャンク毎に flush して逐次送る
+- 既に Content-Encoding が付いている応答（事前圧縮済みの静的ファイル）はそのまま送る
+
+圧縮した場合は Vary: Accept-Encoding を付け、ETag は弱い ETag にする
+（表現が変わるため。If-None-Match は弱い比較なので 304 の判定は変わらない）。
+"""
+
+import zlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import Message
+
+from ..core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli は任意
+    brotli = None
+
+# 圧縮する Content-Type（前方一致）
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """サーバーが使える圧縮形式（優先順）"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(
+    accept_encoding: Optional[str], available: Iterable[str]
+) -> Optional[str]:
+    """
+    Accept-Encoding から圧縮形式を選ぶ
+
+    Args:
+        accept_encoding: Accept-Encoding ヘッダー
+        available: 使える圧縮形式（優先順）
+
+    Returns:
+        圧縮形式（圧縮しない場合は None）
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    """圧縮の対象となる Content-Type か"""
+    if not content_type:
+        return False
+    return content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+class _Compressor:
+    """gzip / brotli の逐次圧縮"""
+
+    def __init__(self, encoding: str, config):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=config.brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(config.gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        """data を圧縮し、ここまでの出力を確定する（ストリーミングのチャンク毎）"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """残りを圧縮して終端する"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """Accept-Encoding に応じた応答の圧縮（ASGI ミドルウェア）"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        config = settings.compression
+        if scope["type"] != "http" or not config.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding"), available_encodings()
+        )
+        responder = _CompressionResponder(send, encoding, config)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """1つの応答の http.response.start を保留し、最初の本文を見て圧縮するかを決める"""
+
+    def __init__(self, send, encoding: Optional[str], config):
+        self._send = send
+        self.encoding = encoding
+        self.config = config
+        self._start: Optional[Message] = None
+        # None: 未決定、True: 圧縮中、False: そのまま送る
+        self._compressing: Optional[bool] = None
+        self._compressor: Optional[_Compressor] = None
+
+    async def send(self, message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressing is None:
+            start, self._start = self._start, None
+            if start is None:
+                raise RuntimeError("http.response.body sent before http.response.start")
+            headers = MutableHeaders(raw=list(start["headers"]))
+            self._compressing = self._prepare(start["status"], headers, body, more_body)
+            if self._compressing:
+                body = self._compress(body, more_body)
+                if not more_body:
+                    # 本文が1回で完結する場合は圧縮後の Content-Length を付ける
+                    headers["Content-Length"] = str(len(body))
+            await self._send({**start, "headers": headers.raw})
+        elif self._compressing:
+            body = self._compress(body, more_body)
+
+        if not self._compressing:
+            await self._send(message)
+            return
+        await self._send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
+
+    def _prepare(
+        self, status: int, headers: MutableHeaders, body: bytes, more_body: bool
+    ) -> bool:
+        """最初の本文で圧縮するかを決め、応答ヘッダーを書き換える"""
+        if (
+            status in (204, 304)
+            or "content-encoding" in headers
+            or not is_compressible(headers.get("content-type"))
+            or (not more_body and len(body) < self.config.min_size)
+        ):
+            return False
+
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None:
+            return False
+
+        self._compressor = _Compressor(self.encoding, self.config)
+        headers["Content-Encoding"] = self.encoding
+        if "content-length" in headers:
+            del headers["content-length"]
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        return True
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            raise RuntimeError("Compressor is not prepared")
+        if more_body:
+            return self._compressor.compress(body)
+        return self._compressor.finish(body)
@@ -9,43 +9,79 @@ from pathlib import Path
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse, RedirectResponse
+from fastapi.responses import (
+    HTMLResponse,
+    JSONResponse,
+    ORJSONResponse,
+    RedirectResponse,
+)
 from fastapi.staticfiles import StaticFiles
 
-from ..core import settings
-from .routes import auth, logs, processes, services, system
-
-# ログ設定
-logging.basicConfig(
-    level=getattr(logging, settings.logging.level),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+from ..core import audit_log, settings
+from ..core.config import Settings, config_manager
+from ..core.logging_setup import setup_logging
+from .access_log import AccessLogMiddleware
+from .compression import CompressionMiddleware
+from .request_metrics import RequestMetricsMiddleware
+from .routes import audit, auth, logs, metrics, processes, services, system
+from .static_files import PrecompressedStaticFiles
 
 logger = logging.getLogger(__name__)
 
+# API ドキュメントのパス（features.api_docs_enabled の場合のみ起動時に登録）
+API_DOCS_URL = "/api/docs"
+API_REDOC_URL = "/api/redoc"
+
+
+def _apply_logging(old: Settings, new: Settings) -> None:
+    """設定の再読み込みでログの構成（レベル・出力形式）を反映"""
+    if (new.logging.level, new.logging.format, new.logging.queue_size) != (
+        old.logging.level,
+        old.logging.format,
+        old.logging.queue_size,
+    ):
+        setup_logging(new.logging)
+        logger.info(
+            "Logging reconfigured: level=%s, format=%s",
+            new.logging.level,
+            new.logging.format,
+        )
+
+
+config_manager.subscribe(_apply_logging)
+
 # ===================================================================
 # FastAPI アプリケーション初期化
 # ===================================================================
+# import 時には設定を読まない（設定に依存する構成は起動時・最初のリクエスト時に行う）
 
 app = FastAPI(
     title="Linux Management System API",
     description="Secure Linux Management WebUI with sudo allowlist control",
     version="0.1.0",
-    docs_url="/api/docs" if settings.features.api_docs_enabled else None,
-    redoc_url="/api/redoc" if settings.features.api_docs_enabled else None,
+    docs_url=None,
+    redoc_url=None,
+    # 応答本文の JSON 化は orjson で行う
+    default_response_class=ORJSONResponse,
 )
 
 # ===================================================================
 # CORS 設定
 # ===================================================================
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+
+def _cors_middleware(app):
+    """CORS ミドルウェア（ミドルウェアの構築時 = 起動時に cors_origins を読む）"""
+    return CORSMiddleware(
+        app,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+
+app.add_middleware(_cors_middleware)
 
 # ===================================================================
 # ルーターの登録
@@ -56,6 +92,8 @@ app.include_router(system.router, prefix="/api")
 app.include_router(services.router, prefix="/api")
 app.include_router(logs.router, prefix="/api")
 app.include_router(processes.router, prefix="/api")
+app.include_router(audit.router, prefix="/api")
+app.include_router(metrics.router)
 
 # ===================================================================
 # 静的ファイル配信
@@ -64,31 +102,35 @@ app.include_router(processes.router, prefix="/api")
 # フロントエンドディレクトリ
 frontend_dir = Path(__file__).parent.parent.parent / "frontend"
 
-# CSS, JS ファイルの配信
-app.mount("/css", StaticFiles(directory=str(frontend_dir / "css")), name="css")
-app.mount("/js", StaticFiles(directory=str(frontend_dir / "js")), name="js")
+# CSS, JS ファイルの配信（事前圧縮済みのファイルと ?v= による長期キャッシュに対応）
+app.mount(
+    "/css", PrecompressedStaticFiles(directory=str(frontend_dir / "css")), name="css"
+)
+app.mount(
+    "/js", PrecompressedStaticFiles(directory=str(frontend_dir / "js")), name="js"
+)
 
 # dev, prod ディレクトリの配信
-app.mount("/dev", StaticFiles(directory=str(frontend_dir / "dev"), html=True), name="dev")
-app.mount("/prod", StaticFiles(directory=str(frontend_dir / "prod"), html=True), name="prod")
+app.mount(
+    "/dev", StaticFiles(directory=str(frontend_dir / "dev"), html=True), name="dev"
+)
+app.mount(
+    "/prod", StaticFiles(directory=str(frontend_dir / "prod"), html=True), name="prod"
+)
 
 # ===================================================================
 # ミドルウェア
 # ===================================================================
 
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """
-    全リクエストをログ記録
-    """
-    logger.info(f"Request: {request.method} {request.url.path}")
+# Accept-Encoding に応じた応答の圧縮
+app.add_middleware(CompressionMiddleware)
 
-    response = await call_next(request)
+# 1リクエスト1レコードのアクセスログ
+app.add_middleware(AccessLogMiddleware)
 
-    logger.info(f"Response: {request.method} {request.url.path} - {response.status_code}")
-
-    return response
+# ルート毎の処理時間のメトリクス
+app.add_middleware(RequestMetricsMiddleware)
 
 
 # ===================================================================
@@ -104,6 +146,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"status": "error", "message": exc.detail},
+        headers=exc.headers,
     )
 
 
@@ -149,12 +192,16 @@ async def root():
     html_path = frontend_dir / "dev" / "index.html"
     if not html_path.exists():
         # HTMLが見つからない場合はAPIメタデータを返す
-        return JSONResponse({
-            "message": "Linux Management System API",
-            "environment": settings.environment,
-            "version": "0.1.0",
-            "docs_url": "/api/docs" if settings.features.api_docs_enabled else None,
-        })
+        return JSONResponse(
+            {
+                "message": "Linux Management System API",
+                "environment": settings.environment,
+                "version": "0.1.0",
+                "docs_url": (
+                    API_DOCS_URL if settings.features.api_docs_enabled else None
+                ),
+            }
+        )
     return HTMLResponse(content=html_path.read_text(), status_code=200)
 
 
@@ -179,6 +226,9 @@ async def startup_event():
     """
     アプリケーション起動時の処理
     """
+    # ログ設定（出力は専用スレッドで行う）
+    setup_logging(settings.logging)
+
     logger.info("=" * 60)
     logger.info("Linux Management System Backend Starting...")
     logger.info(f"Environment: {settings.environment}")
@@ -192,6 +242,9 @@ async def startup_event():
     # Production環境のセキュリティ検証
     await validate_production_config()
 
+    if settings.features.api_docs_enabled:
+        add_api_docs_routes()
+
     # ログディレクトリの作成
     log_file = Path(settings.logging.file)
     log_file.parent.mkdir(parents=True, exist_ok=True)
@@ -200,9 +253,40 @@ async def startup_event():
     audit_dir = log_file.parent / "audit"
     audit_dir.mkdir(parents=True, exist_ok=True)
 
+    # 前日以前の監査ログの圧縮
+    if settings.audit.archive_enabled:
+        audit_log.start_archiver()
+
+    # 設定ファイルの変更を監視
+    if settings.features.config_reload:
+        config_manager.start_watching(settings.features.config_reload_poll_interval)
+
     logger.info("✅ Backend started successfully")
 
 
+def add_api_docs_routes() -> None:
+    """API ドキュメント（Swagger UI / ReDoc）のルートを登録（登録済みの場合は何もしない）"""
+    from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+
+    if any(getattr(route, "path", None) == API_DOCS_URL for route in app.router.routes):
+        return
+
+    async def swagger_ui_html(request: Request) -> HTMLResponse:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_swagger_ui_html(
+            openapi_url=root_path + app.openapi_url, title=f"{app.title} - Swagger UI"
+        )
+
+    async def redoc_html(request: Request) -> HTMLResponse:
+        root_path = request.scope.get("root_path", "").rstrip("/")
+        return get_redoc_html(
+            openapi_url=root_path + app.openapi_url, title=f"{app.title} - ReDoc"
+        )
+
+    app.add_route(API_DOCS_URL, swagger_ui_html, include_in_schema=False)
+    app.add_route(API_REDOC_URL, redoc_html, include_in_schema=False)
+
+
 async def validate_production_config():
     """
     Production環境のセキュリティ設定を検証
@@ -210,31 +294,44 @@ async def validate_production_config():
     Raises:
         RuntimeError: クリティカルなセキュリティ設定が不正な場合
     """
-    if settings.environment == "production":
+    check_production_config(settings)
+
+
+def check_production_config(config: Settings) -> None:
+    """
+    Production環境のセキュリティ設定を検証（起動時と設定の再読み込み時）
+
+    Args:
+        config: 検証する設定
+
+    Raises:
+        RuntimeError: クリティカルなセキュリティ設定が不正な場合
+    """
+    if config.environment == "production":
         # JWT秘密鍵の検証
-        if settings.jwt_secret_key == "change-this-in-production":
+        if config.jwt_secret_key == "change-this-in-production":
             raise RuntimeError(
                 "CRITICAL: JWT_SECRET not configured for production! "
                 "Set SESSION_SECRET environment variable."
             )
 
         # HTTPS必須の検証
-        if not settings.security.require_https:
+        if not config.security.require_https:
             raise RuntimeError("CRITICAL: HTTPS must be required in production!")
 
         # デバッグモードの検証
-        if settings.features.debug_mode:
+        if config.features.debug_mode:
             raise RuntimeError("CRITICAL: Debug mode must be disabled in production!")
 
         # API ドキュメントの警告
-        if settings.features.api_docs_enabled:
+        if config.features.api_docs_enabled:
             logger.warning(
                 "WARNING: API docs are enabled in production. "
                 "Consider disabling for security."
             )
 
         # CORS設定の検証
-        if "*" in settings.cors_origins:
+        if "*" in config.cors_origins:
             raise RuntimeError(
                 "CRITICAL: Wildcard CORS origin (*) is not allowed in production! "
                 "Specify explicit domains in prod.json."
@@ -243,9 +340,19 @@ async def validate_production_config():
         logger.info("✅ Production security configuration validated")
 
 
+# 再読み込みした設定も同じ検証を通す
+config_manager.add_validator(check_production_config)
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """
     アプリケーション終了時の処理
     """
     logger.info("Linux Management System Backend Shutting down...")
+
+    config_manager.stop_watching()
+
+    # バッファ中の監査ログを書き込んで書き込みスレッドを停止
+    audit_log.stop_archiver()
+    audit_log.close()
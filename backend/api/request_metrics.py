@@ -0,0 +1,72 @@
+"""
+リクエストのメトリクス
+
+ルート（パスのテンプレート）・メソッド・ステータス毎の処理時間のヒストグラム
+（http_request_duration_seconds）を記録する ASGI ミドルウェア。件数は _count で分かる。
+
+ルートのラベルには実際のパスではなくテンプレート（/api/services/{service_name} など）を
+使い、系列の数がリクエストのパスに応じて増えないようにする。静的ファイルはマウント先
+（/js など）、どのルートにも一致しなかったリクエストは "unmatched" にまとめる。
+"""
+
+import time
+
+from ..core.metrics import metrics
+
+request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method and status",
+    ("method", "route", "status"),
+)
+
+UNMATCHED = "unmatched"
+
+
+def route_label(scope, root_path: str) -> str:
+    """
+    ルートのラベル
+
+    Args:
+        scope: 処理後の ASGI スコープ（ルーターが route・root_path を設定する）
+        root_path: 処理前の root_path
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    mounted = scope.get("root_path", "")
+    if mounted != root_path:
+        return mounted[len(root_path) :]
+    return UNMATCHED
+
+
+class RequestMetricsMiddleware:
+    """ルート毎の処理時間のヒストグラム（ASGI ミドルウェア）"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        root_path = scope.get("root_path", "")
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_duration.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route_label(scope, root_path),
+                status=str(status_code),
+            )
@@ -0,0 +1,486 @@
+"""
+監査ログ API エンドポイント
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from ...core import require_permission
+from ...core.audit_log import audit_log
+from ...core.auth import TokenData
+from ...core.columnar import COLUMNAR, FORMAT_PATTERN, ROWS, ColumnarTable, to_columnar
+from ...core.serialization import model_response
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+# エクスポート時に1チャンクへまとめる行数
+EXPORT_BATCH_LINES = 500
+
+
+# ===================================================================
+# レスポンスモデル
+# ===================================================================
+
+
+class AuditLogsResponse(BaseModel):
+    """監査ログ検索レスポンス"""
+
+    status: str
+    entries: list[Dict[str, Any]]
+    count: int
+    next_cursor: Optional[str]
+    timestamp: str
+
+
+class AuditStatsBucket(BaseModel):
+    """監査ログ集計の1行"""
+
+    bucket: str
+    operation: Optional[str] = None
+    target: Optional[str] = None
+    user_id: Optional[str] = None
+    status: Optional[str] = None
+    count: int
+
+
+class _AuditStatsFields(BaseModel):
+    """監査ログ集計レスポンスの共通項目（buckets 以外）"""
+
+    status: str
+    granularity: str
+    group_by: list[str]
+    timestamp: str
+
+
+class AuditStatsResponse(_AuditStatsFields):
+    """監査ログ集計レスポンス"""
+
+    buckets: list[AuditStatsBucket]
+
+
+class AuditStatsColumnarResponse(_AuditStatsFields):
+    """監査ログ集計レスポンス（format=columnar）"""
+
+    buckets: ColumnarTable
+    format: str = COLUMNAR
+
+
+class AuditVerifyResponse(BaseModel):
+    """監査ログ検証レスポンス"""
+
+    status: str
+    full: bool
+    verified_at: str
+    records_verified: int
+    legacy_records: int
+    new_records: int
+    bytes_hashed: int
+    checkpoints_verified: int
+    new_checkpoints: int
+    errors: list[Dict[str, Any]]
+    elapsed_seconds: float
+    records_per_second: float
+    bytes_per_second: float
+
+
+def _local_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """タイムゾーン付きの日時をローカル時刻（タイムゾーンなし）に変換"""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def _query_range(
+    start_date: Optional[datetime], end_date: Optional[datetime]
+) -> tuple[Optional[datetime], Optional[datetime]]:
+    """
+    検索期間を監査ログの timestamp（ローカル時刻・タイムゾーンなし）に揃える
+
+    Raises:
+        HTTPException: 開始が終了より後の場合
+    """
+    start_date, end_date = _local_naive(start_date), _local_naive(end_date)
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'start_date' must be earlier than 'end_date'",
+        )
+    return start_date, end_date
+
+
+def _export_lines(
+    entries: Iterator[tuple[Dict[str, Any], str]],
+    user_id: str,
+    details: Dict[str, Any],
+) -> Iterator[bytes]:
+    """
+    監査ログエントリを NDJSON として順に出力
+
+    エントリはファイルから読み進めた分だけ生成されるため、件数に関わらずメモリ使用量は一定。
+    完了・中断のいずれでも件数を監査ログに記録する。
+    """
+    records = 0
+    bytes_sent = 0
+    completed = False
+    batch: list[bytes] = []
+
+    try:
+        for entry, _ in entries:
+            batch.append(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+            records += 1
+
+            if len(batch) >= EXPORT_BATCH_LINES:
+                chunk = b"".join(batch)
+                batch = []
+                bytes_sent += len(chunk)
+                yield chunk
+
+        if batch:
+            chunk = b"".join(batch)
+            bytes_sent += len(chunk)
+            yield chunk
+
+        completed = True
+
+    finally:
+        audit_log.record(
+            operation="audit_export",
+            user_id=user_id,
+            target="audit_log",
+            status="success" if completed else "failure",
+            details={**details, "records": records, "bytes_sent": bytes_sent},
+        )
+
+        logger.info(
+            f"Audit log export finished: user={user_id}, completed={completed}, "
+            f"records={records}, bytes_sent={bytes_sent}"
+        )
+
+
+# ===================================================================
+# エンドポイント
+# ===================================================================
+
+
+@router.get("", response_model=AuditLogsResponse)
+async def get_audit_logs(
+    start_date: Optional[datetime] = Query(None, description="開始日時（ISO 8601）"),
+    end_date: Optional[datetime] = Query(None, description="終了日時（ISO 8601）"),
+    user_id: Optional[str] = Query(None, max_length=128, description="ユーザーID"),
+    operation: Optional[str] = Query(None, max_length=64, description="操作種別"),
+    status_filter: Optional[str] = Query(
+        None, alias="status", max_length=32, description="ステータス"
+    ),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="並び順"),
+    limit: int = Query(100, ge=1, le=1000, description="取得件数（1-1000）"),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="前回の next_cursor"
+    ),
+    current_user: TokenData = Depends(require_permission("read:audit")),
+):
+    """
+    監査ログを検索（カーソルページング）
+
+    索引ストア（audit.index_enabled）が有効な場合は索引で、無効な場合は JSON ログの
+    走査で検索する。Viewer はアクセス不可、Operator/Approver は自分のレコードのみ、
+    Admin は全レコード。
+
+    Args:
+        start_date: 開始日時
+        end_date: 終了日時
+        user_id: ユーザーID
+        operation: 操作種別
+        status_filter: ステータス
+        order: 並び順（デフォルト: 新しい順）
+        limit: 取得件数
+        cursor: 前回レスポンスの next_cursor（続きを取得）
+        current_user: 現在のユーザー（read:audit 権限必須）
+
+    Returns:
+        監査ログエントリと次ページのカーソル
+
+    Raises:
+        HTTPException: 期間・カーソルが不正な場合、RBAC により拒否された場合
+    """
+    start_date, end_date = _query_range(start_date, end_date)
+
+    try:
+        page, next_cursor = await audit_log.query_async(
+            current_user.role,
+            current_user.user_id,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id,
+            operation=operation,
+            status=status_filter,
+            limit=limit,
+            order=order,
+            cursor=cursor,
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    audit_log.record(
+        operation="audit_view",
+        user_id=current_user.user_id,
+        target="audit_log",
+        status="success",
+        details={"returned": len(page), "cursor": cursor is not None},
+    )
+
+    return AuditLogsResponse(
+        status="success",
+        entries=page,
+        count=len(page),
+        next_cursor=next_cursor,
+        timestamp=datetime.now().isoformat(),
+    )
+
+
+@router.get("/stats", response_model=AuditStatsResponse)
+async def get_audit_stats(
+    start_date: Optional[datetime] = Query(None, description="開始日時（ISO 8601）"),
+    end_date: Optional[datetime] = Query(None, description="終了日時（ISO 8601）"),
+    granularity: str = Query("day", pattern="^(day|hour)$", description="集計単位"),
+    group_by: str = Query(
+        "operation",
+        pattern="^((operation|target|user_id|status)(,(operation|target|user_id|status))*)?$",
+        description="グループ化する列（カンマ区切り）",
+    ),
+    user_id: Optional[str] = Query(None, max_length=128, description="ユーザーID"),
+    operation: Optional[str] = Query(None, max_length=64, description="操作種別"),
+    target: Optional[str] = Query(None, max_length=128, description="操作対象"),
+    status_filter: Optional[str] = Query(
+        None, alias="status", max_length=32, description="ステータス"
+    ),
+    response_format: str = Query(
+        ROWS,
+        alias="format",
+        pattern=FORMAT_PATTERN,
+        description="応答形式（rows/columnar）",
+    ),
+    current_user: TokenData = Depends(require_permission("read:audit")),
+):
+    """
+    監査ログの件数を日次・時間別に集計
+
+    例: サービス毎・日毎の再起動回数
+        ?operation=service_restart&group_by=target
+    例: ユーザー毎・時間毎のログイン失敗回数
+        ?operation=login&status=failure&granularity=hour&group_by=user_id
+
+    Args:
+        start_date: 開始日時（バケット境界に丸める）
+        end_date: 終了日時（バケット境界に丸める）
+        granularity: day / hour
+        group_by: グループ化する列
+        user_id: ユーザーID
+        operation: 操作種別
+        target: 操作対象
+        status_filter: ステータス
+        response_format: rows（行のリスト）/ columnar（列毎の配列とスキーマ）
+        current_user: 現在のユーザー（read:audit 権限必須）
+
+    Returns:
+        集計結果（columnar の場合は AuditStatsColumnarResponse）
+
+    Raises:
+        HTTPException: 期間が不正な場合、RBAC により拒否された場合
+    """
+    start_date, end_date = _query_range(start_date, end_date)
+    dimensions = list(dict.fromkeys(d for d in group_by.split(",") if d))
+
+    try:
+        buckets = await audit_log.stats_async(
+            current_user.role,
+            current_user.user_id,
+            granularity=granularity,
+            group_by=dimensions,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id,
+            operation=operation,
+            target=target,
+            status=status_filter,
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    response = AuditStatsResponse(
+        status="success",
+        granularity=granularity,
+        group_by=dimensions,
+        buckets=buckets,
+        timestamp=datetime.now().isoformat(),
+    )
+    if response_format == COLUMNAR:
+        # 応答モデル（行形式）での再検証を通さずに返す
+        return model_response(
+            AuditStatsColumnarResponse.model_construct(
+                **{
+                    **dict(response),
+                    "buckets": to_columnar(AuditStatsBucket, response.buckets),
+                }
+            )
+        )
+    return response
+
+
+@router.get("/verify", response_model=AuditVerifyResponse)
+async def get_audit_verification(
+    current_user: TokenData = Depends(require_permission("verify:audit")),
+):
+    """
+    前回の監査ログ検証結果を取得
+
+    Args:
+        current_user: 現在のユーザー（verify:audit 権限必須）
+
+    Returns:
+        検証結果
+
+    Raises:
+        HTTPException: まだ検証していない場合
+    """
+    report = await run_in_threadpool(audit_log.verification_status)
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Audit log has not been verified yet",
+        )
+    return AuditVerifyResponse(**report)
+
+
+@router.post("/verify", response_model=AuditVerifyResponse)
+async def verify_audit_logs(
+    full: bool = Query(
+        False, description="全件を検証し直す（デフォルト: 前回の続きから）"
+    ),
+    current_user: TokenData = Depends(require_permission("verify:audit")),
+):
+    """
+    監査ログのハッシュチェーンとチェックポイントを検証
+
+    通常は前回検証した位置から新しいレコードのみを検証する。
+
+    Args:
+        full: 全件を検証し直すか
+        current_user: 現在のユーザー（verify:audit 権限必須）
+
+    Returns:
+        検証結果（改ざんを検出した場合は status=tampered と errors）
+    """
+    report = await run_in_threadpool(audit_log.verify, full)
+
+    audit_log.record(
+        operation="audit_verify",
+        user_id=current_user.user_id,
+        target="audit_log",
+        status="success" if report["status"] == "ok" else "failure",
+        details={
+            "full": full,
+            "result": report["status"],
+            "new_records": report["new_records"],
+            "errors": len(report["errors"]),
+        },
+    )
+
+    if report["status"] != "ok":
+        logger.warning(
+            f"Audit log tampering detected: user={current_user.username}, "
+            f"errors={len(report['errors'])}"
+        )
+
+    return AuditVerifyResponse(**report)
+
+
+@router.get("/export")
+async def export_audit_logs(
+    start_date: Optional[datetime] = Query(None, description="開始日時（ISO 8601）"),
+    end_date: Optional[datetime] = Query(None, description="終了日時（ISO 8601）"),
+    user_id: Optional[str] = Query(None, max_length=128, description="ユーザーID"),
+    operation: Optional[str] = Query(None, max_length=64, description="操作種別"),
+    status_filter: Optional[str] = Query(
+        None, alias="status", max_length=32, description="ステータス"
+    ),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="並び順"),
+    current_user: TokenData = Depends(require_permission("read:audit")),
+):
+    """
+    監査ログを NDJSON でエクスポート（件数制限なし）
+
+    Viewer はアクセス不可、Operator/Approver は自分のレコードのみ、Admin は全レコード。
+
+    Args:
+        start_date: 開始日時
+        end_date: 終了日時
+        user_id: ユーザーID
+        operation: 操作種別
+        status_filter: ステータス
+        order: 並び順（asc / desc）
+        current_user: 現在のユーザー（read:audit 権限必須）
+
+    Returns:
+        StreamingResponse（application/x-ndjson）
+
+    Raises:
+        HTTPException: 期間指定が不正な場合、RBAC により拒否された場合
+    """
+    start_date, end_date = _query_range(start_date, end_date)
+
+    details = {
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+        "user_id": user_id,
+        "operation": operation,
+        "status": status_filter,
+        "order": order,
+    }
+
+    try:
+        # バッファの書き込み待ちとファイルの絞り込みはイベントループの外で行う
+        # （エントリの読み込みは StreamingResponse がスレッドで進める）
+        entries = await run_in_threadpool(
+            audit_log.iter_query,
+            user_role=current_user.role,
+            requesting_user_id=current_user.user_id,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id,
+            operation=operation,
+            status=status_filter,
+            order=order,
+        )
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    # 監査ログ記録（試行）
+    audit_log.record(
+        operation="audit_export",
+        user_id=current_user.user_id,
+        target="audit_log",
+        status="attempt",
+        details=details,
+    )
+
+    logger.info(
+        f"Audit log export started: user={current_user.username}, filters={details}"
+    )
+
+    filename = f"audit_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+    return StreamingResponse(
+        _export_lines(entries, current_user.user_id, details),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
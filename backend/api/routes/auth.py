@@ -3,14 +3,24 @@
 """
 
 import logging
+import time
 from datetime import timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 
 from ...core import get_current_user, settings
-from ...core.auth import TokenData, authenticate_user, create_access_token
 from ...core.audit_log import audit_log
+from ...core.auth import (
+    ROLE_MASKS,
+    TokenData,
+    authenticate_user,
+    create_access_token,
+    permission_names,
+)
+from ...core.login_limiter import login_limiter
+from ...core.session_store import session_store
 
 logger = logging.getLogger(__name__)
 
@@ -55,26 +65,44 @@ class UserInfoResponse(BaseModel):
 
 
 @router.post("/login", response_model=LoginResponse)
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, http_request: Request):
     """
     ログイン
 
     Args:
         request: ログインリクエスト
+        http_request: HTTP リクエスト（接続元 IP の取得用）
 
     Returns:
         JWT アクセストークン
 
     Raises:
-        HTTPException: 認証失敗時
+        HTTPException: 認証失敗時、試行回数の上限を超えた場合
     """
     logger.info(f"Login attempt: {request.email}")
+    client_ip = http_request.client.host if http_request.client else None
+
+    # 試行回数の制限（パスワード検証の前に判定と試行の記録を行い、総当たりのコストを最小にする）
+    retry_after = await run_in_threadpool(login_limiter.check, request.email, client_ip)
+    if retry_after is not None:
+        audit_log.record(
+            operation="login",
+            user_id=request.email,
+            target="system",
+            status="denied",
+            details={"reason": "too_many_attempts", "client_ip": client_ip},
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Try again later.",
+            headers={"Retry-After": str(retry_after)},
+        )
 
     # 認証
-    user = authenticate_user(request.email, request.password)
+    user = await authenticate_user(request.email, request.password)
 
     if not user:
-        # 監査ログ記録（失敗）
+        # 監査ログ記録（失敗。試行回数は check で数え済み）
         audit_log.record(
             operation="login",
             user_id=request.email,
@@ -89,10 +117,26 @@ async def login(request: LoginRequest):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # JWT トークン生成
+    await run_in_threadpool(login_limiter.reset, request.email, client_ip)
+
+    # セッション登録（ログアウト・無操作タイムアウトでサーバー側から失効させる）
     access_token_expires = timedelta(minutes=settings.jwt_expiration_minutes)
+    session_id = await run_in_threadpool(
+        session_store.create,
+        user.user_id,
+        time.time() + access_token_expires.total_seconds(),
+    )
+
+    # JWT トークン生成
     access_token = create_access_token(
-        data={"sub": user.user_id, "username": user.username, "role": user.role},
+        data={
+            "sub": user.user_id,
+            "username": user.username,
+            "role": user.role,
+            # 権限ビットマスク（検証時にロールの権限と AND を取る）
+            "perm": ROLE_MASKS.get(user.role, 0),
+            "sid": session_id,
+        },
         expires_delta=access_token_expires,
     )
 
@@ -126,16 +170,16 @@ async def get_me(current_user: TokenData = Depends(get_current_user)):
     Returns:
         ユーザー情報
     """
-    from ...core.auth import ROLES
-
-    user_role = ROLES.get(current_user.role)
+    mask = current_user.permission_mask
+    if mask is None:
+        mask = ROLE_MASKS.get(current_user.role, 0)
 
     return UserInfoResponse(
         user_id=current_user.user_id,
         username=current_user.username,
         email=f"{current_user.username}@example.com",  # TODO: データベースから取得
         role=current_user.role,
-        permissions=user_role.permissions if user_role else [],
+        permissions=permission_names(mask),
     )
 
 
@@ -144,8 +188,12 @@ async def logout(current_user: TokenData = Depends(get_current_user)):
     """
     ログアウト
 
-    Note: JWT はステートレスなため、クライアント側でトークンを削除する
+    セッションを失効させ、以降このトークンでのリクエストは拒否される
+    （他のワーカーでは security.revocation_refresh_interval 以内に反映）。
     """
+    if current_user.session_id is not None:
+        await run_in_threadpool(session_store.revoke, current_user.session_id)
+
     # 監査ログ記録
     audit_log.record(
         operation="logout",
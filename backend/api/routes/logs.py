@@ -3,14 +3,21 @@
 """
 
 import logging
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
 
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from ...core import get_current_user, require_permission, sudo_wrapper
 from ...core.audit_log import audit_log
 from ...core.auth import TokenData
-from ...core.sudo_wrapper import SudoWrapperError
+from ...core.serialization import model_response
+from ...core.sudo_wrapper import SudoWrapperError, WrapperStream
 
 logger = logging.getLogger(__name__)
 
@@ -33,14 +40,453 @@ class LogsResponse(BaseModel):
     timestamp: str
 
 
+class FileLogsResponse(BaseModel):
+    """ファイルログレスポンス"""
+
+    status: str
+    log_name: str
+    path: str
+    generation: int
+    compressed: bool
+    file_size: int
+    lines_requested: int
+    lines_returned: int
+    lines: list[str]
+    start_offset: int
+    next_cursor: Optional[str]
+    timestamp: str
+
+
+class FileLogMatch(BaseModel):
+    """ファイルログ検索のマッチ行"""
+
+    offset: int
+    line: str
+
+
+class FileLogSearchResponse(BaseModel):
+    """ファイルログ検索レスポンス"""
+
+    status: str
+    log_name: str
+    path: str
+    pattern: str
+    limit: int
+    file_size: int
+    matches_returned: int
+    matches: list[FileLogMatch]
+    truncated: bool
+    resume_offset: Optional[int]
+    chunks_scanned: int
+    chunks_total: int
+    workers: int
+    timestamp: str
+
+
+# ===================================================================
+# エクスポート
+# ===================================================================
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "text": "text/plain; charset=utf-8",
+}
+
+
+async def _stream_export(
+    stream: WrapperStream,
+    service_name: str,
+    user_id: str,
+    compress: bool,
+    details: Dict[str, Any],
+) -> AsyncIterator[bytes]:
+    """
+    ラッパー出力をそのままクライアントへ中継（必要に応じて gzip 圧縮）
+
+    転送完了・失敗・クライアント切断のいずれでも、行数とバイト数を監査ログに記録する。
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    lines = 0
+    bytes_read = 0
+    bytes_sent = 0
+    completed = False
+    error: Optional[str] = None
+
+    try:
+        async for chunk in stream:
+            lines += chunk.count(b"\n")
+            bytes_read += len(chunk)
+
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+                if not chunk:
+                    continue
+
+            bytes_sent += len(chunk)
+            yield chunk
+
+        if compressor is not None:
+            chunk = compressor.flush()
+            bytes_sent += len(chunk)
+            yield chunk
+
+        completed = True
+
+    except SudoWrapperError as e:
+        error = str(e)
+        logger.error(f"Log export failed: {service_name}, error={e}")
+        raise
+
+    finally:
+        # クライアント切断で応答がキャンセルされた場合、最初の await で CancelledError が
+        # 再送出されるため、監査ログは await より前に記録する
+        audit_log.record(
+            operation="log_export",
+            user_id=user_id,
+            target=service_name,
+            status="success" if completed else "failure",
+            details={
+                **details,
+                "lines": lines,
+                "bytes": bytes_read,
+                "bytes_sent": bytes_sent,
+                **({} if completed else {"error": error or "client_disconnected"}),
+            },
+        )
+
+        logger.info(
+            f"Log export finished: service={service_name}, completed={completed}, "
+            f"lines={lines}, bytes={bytes_read}, bytes_sent={bytes_sent}"
+        )
+
+        if not completed:
+            # キャンセル中でもラッパーの終了を待つ（ゾンビプロセスを残さない）
+            with anyio.CancelScope(shield=True):
+                await stream.aclose()
+
+
 # ===================================================================
 # エンドポイント
 # ===================================================================
 
 
+@router.get("/files/{log_name}", response_model=FileLogsResponse)
+async def get_file_logs(
+    log_name: str = Path(..., min_length=1, max_length=64, pattern="^[a-zA-Z0-9_-]+$"),
+    lines: int = Query(100, ge=1, le=1000, description="取得行数（1-1000）"),
+    cursor: Optional[str] = Query(
+        None,
+        max_length=64,
+        pattern="^[0-9]{1,2}:[0-9]{1,20}:([0-9]{1,20}|end)$",
+        description="過去方向ページング用カーソル（前回レスポンスの next_cursor）",
+    ),
+    current_user: TokenData = Depends(require_permission("read:logs")),
+):
+    """
+    ファイルログ（/var/log 配下）を末尾から取得
+
+    Args:
+        log_name: ログ名（ラッパー側 allowlist のキー）
+        lines: 取得行数（1-1000）
+        cursor: 過去方向ページング用カーソル
+        current_user: 現在のユーザー（read:logs 権限必須）
+
+    Returns:
+        ログデータ（古い順）と次ページのカーソル
+
+    Raises:
+        HTTPException: ログ取得失敗時
+    """
+    logger.info(
+        f"File log view requested: log={log_name}, lines={lines}, "
+        f"cursor={cursor}, user={current_user.username}"
+    )
+
+    # 監査ログ記録（試行）
+    audit_log.record(
+        operation="file_log_view",
+        user_id=current_user.user_id,
+        target=log_name,
+        status="attempt",
+        details={"lines": lines, "cursor": cursor},
+    )
+
+    try:
+        # sudo ラッパー経由でファイルログを取得
+        result = await run_in_threadpool(
+            sudo_wrapper.get_file_logs, log_name, lines, cursor
+        )
+
+        # ラッパーがエラーを返した場合
+        if result.get("status") == "error":
+            # 監査ログ記録（拒否）
+            audit_log.record(
+                operation="file_log_view",
+                user_id=current_user.user_id,
+                target=log_name,
+                status="denied",
+                details={"reason": result.get("message", "unknown")},
+            )
+
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=result.get("message", "File log view denied"),
+            )
+
+        # 監査ログ記録（成功）
+        audit_log.record(
+            operation="file_log_view",
+            user_id=current_user.user_id,
+            target=log_name,
+            status="success",
+            details={
+                "lines_returned": result.get("lines_returned", 0),
+                "generation": result.get("generation", 0),
+            },
+        )
+
+        logger.info(f"File log view successful: {log_name}")
+
+        return FileLogsResponse(log_name=log_name, **result)
+
+    except SudoWrapperError as e:
+        # 監査ログ記録（失敗）
+        audit_log.record(
+            operation="file_log_view",
+            user_id=current_user.user_id,
+            target=log_name,
+            status="failure",
+            details={"error": str(e)},
+        )
+
+        logger.error(f"File log view failed: {log_name}, error={e}")
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"File log retrieval failed: {str(e)}",
+        )
+
+
+@router.get("/files/{log_name}/search", response_model=FileLogSearchResponse)
+async def search_file_logs(
+    log_name: str = Path(..., min_length=1, max_length=64, pattern="^[a-zA-Z0-9_-]+$"),
+    pattern: str = Query(
+        ...,
+        min_length=1,
+        max_length=128,
+        pattern="^[a-zA-Z0-9._:@/=,+-]+$",
+        description="検索文字列（固定文字列）",
+    ),
+    limit: int = Query(100, ge=1, le=1000, description="最大取得件数（1-1000）"),
+    offset: int = Query(
+        0, ge=0, description="検索開始オフセット（前回の resume_offset）"
+    ),
+    current_user: TokenData = Depends(require_permission("read:logs")),
+):
+    """
+    ファイルログ（/var/log 配下）を検索
+
+    Args:
+        log_name: ログ名（ラッパー側 allowlist のキー）
+        pattern: 検索文字列（固定文字列）
+        limit: 最大取得件数（1-1000）
+        offset: 検索開始オフセット
+        current_user: 現在のユーザー（read:logs 権限必須）
+
+    Returns:
+        マッチ行（ファイル順、バイトオフセット付き）
+
+    Raises:
+        HTTPException: 検索失敗時
+    """
+    logger.info(
+        f"File log search requested: log={log_name}, pattern={pattern}, "
+        f"limit={limit}, offset={offset}, user={current_user.username}"
+    )
+
+    # 監査ログ記録（試行）
+    audit_log.record(
+        operation="file_log_search",
+        user_id=current_user.user_id,
+        target=log_name,
+        status="attempt",
+        details={"pattern": pattern, "limit": limit, "offset": offset},
+    )
+
+    try:
+        # sudo ラッパー経由でファイルログを検索（大きなファイルでは時間がかかるためスレッドで実行）
+        result = await run_in_threadpool(
+            sudo_wrapper.search_file_logs, log_name, pattern, limit, offset
+        )
+
+        # ラッパーがエラーを返した場合
+        if result.get("status") == "error":
+            # 監査ログ記録（拒否）
+            audit_log.record(
+                operation="file_log_search",
+                user_id=current_user.user_id,
+                target=log_name,
+                status="denied",
+                details={"reason": result.get("message", "unknown")},
+            )
+
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=result.get("message", "File log search denied"),
+            )
+
+        # 監査ログ記録（成功）
+        audit_log.record(
+            operation="file_log_search",
+            user_id=current_user.user_id,
+            target=log_name,
+            status="success",
+            details={"matches_returned": result.get("matches_returned", 0)},
+        )
+
+        logger.info(f"File log search successful: {log_name}")
+
+        return FileLogSearchResponse(log_name=log_name, **result)
+
+    except SudoWrapperError as e:
+        # 監査ログ記録（失敗）
+        audit_log.record(
+            operation="file_log_search",
+            user_id=current_user.user_id,
+            target=log_name,
+            status="failure",
+            details={"error": str(e)},
+        )
+
+        logger.error(f"File log search failed: {log_name}, error={e}")
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"File log search failed: {str(e)}",
+        )
+
+
+@router.get("/{service_name}/export")
+async def export_service_logs(
+    service_name: str = Path(
+        ..., min_length=1, max_length=64, pattern="^[a-zA-Z0-9_-]+$"
+    ),
+    since: Optional[datetime] = Query(None, description="開始日時（ISO 8601）"),
+    until: Optional[datetime] = Query(None, description="終了日時（ISO 8601）"),
+    output_format: str = Query(
+        "ndjson", alias="format", pattern="^(ndjson|text)$", description="出力形式"
+    ),
+    compress: bool = Query(False, description="gzip 圧縮して転送"),
+    current_user: TokenData = Depends(require_permission("read:logs")),
+):
+    """
+    サービスのログを行数制限なしでエクスポート
+
+    journalctl の出力をチャンク転送でそのまま中継するため、
+    エクスポート量に関わらずメモリ使用量は一定。
+
+    Args:
+        service_name: サービス名
+        since: 開始日時
+        until: 終了日時
+        output_format: 出力形式（ndjson / text）
+        compress: gzip 圧縮の有無
+        current_user: 現在のユーザー（read:logs 権限必須）
+
+    Returns:
+        StreamingResponse
+
+    Raises:
+        HTTPException: 期間指定が不正な場合、エクスポート開始失敗時
+    """
+    if since and until and since > until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'since' must be earlier than 'until'",
+        )
+
+    details = {
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+        "format": output_format,
+        "compress": compress,
+    }
+
+    logger.info(
+        f"Log export requested: service={service_name}, since={since}, until={until}, "
+        f"format={output_format}, compress={compress}, user={current_user.username}"
+    )
+
+    # 監査ログ記録（試行）
+    audit_log.record(
+        operation="log_export",
+        user_id=current_user.user_id,
+        target=service_name,
+        status="attempt",
+        details=details,
+    )
+
+    try:
+        # sudo ラッパー経由でエクスポートを開始
+        stream = await sudo_wrapper.stream_logs_export(
+            service_name,
+            since=int(since.timestamp()) if since else None,
+            until=int(until.timestamp()) if until else None,
+            output_format=output_format,
+        )
+
+    except SudoWrapperError as e:
+        # 監査ログ記録（失敗）
+        audit_log.record(
+            operation="log_export",
+            user_id=current_user.user_id,
+            target=service_name,
+            status="failure",
+            details={"error": str(e)},
+        )
+
+        logger.error(f"Log export failed: {service_name}, error={e}")
+
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Log export failed: {str(e)}",
+        )
+
+    # ラッパーがエラーを返した場合
+    if stream.error is not None:
+        # 監査ログ記録（拒否）
+        audit_log.record(
+            operation="log_export",
+            user_id=current_user.user_id,
+            target=service_name,
+            status="denied",
+            details={"reason": stream.error.get("message", "unknown")},
+        )
+
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=stream.error.get("message", "Log export denied"),
+        )
+
+    extension = "ndjson" if output_format == "ndjson" else "log"
+    filename = f"{service_name}_{datetime.now().strftime('%Y%m%d%H%M%S')}.{extension}"
+    media_type = EXPORT_MEDIA_TYPES[output_format]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        _stream_export(stream, service_name, current_user.user_id, compress, details),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/{service_name}", response_model=LogsResponse)
 async def get_service_logs(
-    service_name: str = Path(..., min_length=1, max_length=64, pattern="^[a-zA-Z0-9_-]+$"),
+    service_name: str = Path(
+        ..., min_length=1, max_length=64, pattern="^[a-zA-Z0-9_-]+$"
+    ),
     lines: int = Query(100, ge=1, le=1000, description="取得行数（1-1000）"),
     current_user: TokenData = Depends(require_permission("read:logs")),
 ):
@@ -102,7 +548,8 @@ async def get_service_logs(
 
         logger.info(f"Log view successful: {service_name}")
 
-        return LogsResponse(**result)
+        # 検証は1回だけ行い、応答モデルによる再検証を通さずに JSON 化する
+        return model_response(LogsResponse(**result))
 
     except SudoWrapperError as e:
         # 監査ログ記録（失敗）
@@ -0,0 +1,44 @@
+"""
+メトリクス API エンドポイント（Prometheus のスクレイプ用）
+"""
+
+import logging
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from ...core.config import settings
+from ...core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["metrics"])
+
+# Prometheus のテキスト形式
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(request: Request):
+    """
+    全ワーカーの合計のメトリクスを返す
+
+    認証の代わりに接続元 IP（metrics.allowed_ips）で制限する。
+
+    Args:
+        request: HTTP リクエスト（接続元の判定用）
+
+    Returns:
+        Prometheus のテキスト形式
+
+    Raises:
+        HTTPException: 許可されていない接続元の場合
+    """
+    client = request.client.host if request.client else None
+    if client not in settings.metrics.allowed_ips:
+        logger.warning(f"Metrics access denied: client={client}")
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+    body = await run_in_threadpool(metrics.render)
+    return PlainTextResponse(body, media_type=CONTENT_TYPE)
@@ -3,14 +3,16 @@
 """
 
 import logging
-from typing import Optional
+from typing import Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel, Field
 
 from ...core import get_current_user, require_permission, sudo_wrapper
 from ...core.audit_log import audit_log
 from ...core.auth import TokenData
+from ...core.columnar import COLUMNAR, FORMAT_PATTERN, ROWS, ColumnarTable, to_columnar
+from ...core.snapshot import snapshot_cache, snapshot_response
 from ...core.sudo_wrapper import SudoWrapperError
 
 logger = logging.getLogger(__name__)
@@ -39,18 +41,30 @@ class ProcessInfo(BaseModel):
     command: str
 
 
-class ProcessListResponse(BaseModel):
-    """プロセス一覧レスポンス"""
+class _ProcessListFields(BaseModel):
+    """プロセス一覧レスポンスの共通項目（processes 以外）"""
 
     status: str
     total_processes: int
     returned_processes: int
     sort_by: str
     filters: dict
-    processes: list[ProcessInfo]
     timestamp: str
 
 
+class ProcessListResponse(_ProcessListFields):
+    """プロセス一覧レスポンス"""
+
+    processes: list[ProcessInfo]
+
+
+class ProcessListColumnarResponse(_ProcessListFields):
+    """プロセス一覧レスポンス（format=columnar）"""
+
+    processes: ColumnarTable
+    format: str = COLUMNAR
+
+
 # ===================================================================
 # エンドポイント
 # ===================================================================
@@ -58,6 +72,7 @@ class ProcessListResponse(BaseModel):
 
 @router.get("", response_model=ProcessListResponse)
 async def list_processes(
+    request: Request,
     sort_by: str = Query("cpu", pattern="^(cpu|mem|pid|time)$"),
     limit: int = Query(100, ge=1, le=1000),
     filter_user: Optional[str] = Query(
@@ -65,21 +80,32 @@ async def list_processes(
     ),
     min_cpu: float = Query(0.0, ge=0.0, le=100.0),
     min_mem: float = Query(0.0, ge=0.0, le=100.0),
+    response_format: str = Query(
+        ROWS,
+        alias="format",
+        pattern=FORMAT_PATTERN,
+        description="応答形式（rows/columnar）",
+    ),
     current_user: TokenData = Depends(require_permission("read:processes")),
 ):
     """
     プロセス一覧を取得
 
+    同じクエリには snapshot.ttl_seconds の間同じスナップショットを返す。ETag を付与し、
+    If-None-Match が一致した場合は 304 を返す。
+
     Args:
+        request: HTTP リクエスト（If-None-Match の参照用）
         sort_by: ソートキー (cpu/mem/pid/time)
         limit: 取得件数 (1-1000)
         filter_user: ユーザー名フィルタ
         min_cpu: 最小CPU使用率 (0.0-100.0)
         min_mem: 最小メモリ使用率 (0.0-100.0)
+        response_format: rows（行のリスト）/ columnar（列毎の配列とスキーマ）
         current_user: 現在のユーザー (read:processes 権限必須)
 
     Returns:
-        プロセス一覧
+        プロセス一覧（columnar の場合は ProcessListColumnarResponse）
 
     Raises:
         HTTPException: 取得失敗時
@@ -102,10 +128,11 @@ async def list_processes(
             "filter_user": filter_user,
             "min_cpu": min_cpu,
             "min_mem": min_mem,
+            "format": response_format,
         },
     )
 
-    try:
+    def fetch_processes() -> Union[ProcessListResponse, ProcessListColumnarResponse]:
         # sudo ラッパー経由でプロセス一覧を取得
         result = sudo_wrapper.get_processes(
             sort_by=sort_by,
@@ -131,18 +158,44 @@ async def list_processes(
                 detail=result.get("message", "Process list denied"),
             )
 
+        response = ProcessListResponse(**result)
+        if response_format == COLUMNAR:
+            return ProcessListColumnarResponse.model_construct(
+                **{
+                    **dict(response),
+                    "processes": to_columnar(ProcessInfo, response.processes),
+                }
+            )
+        return response
+
+    try:
+        # 有効なスナップショットがあればラッパーを実行しない
+        snapshot = snapshot_cache.get(
+            (
+                "processes",
+                sort_by,
+                limit,
+                filter_user,
+                min_cpu,
+                min_mem,
+                response_format,
+            ),
+            fetch_processes,
+        )
+        returned_processes = snapshot.content.returned_processes
+
         # 監査ログ記録（成功）
         audit_log.record(
             operation="process_list",
             user_id=current_user.user_id,
             target="system",
             status="success",
-            details={"returned_processes": result.get("returned_processes", 0)},
+            details={"returned_processes": returned_processes},
         )
 
-        logger.info(f"Process list retrieved: {result.get('returned_processes', 0)} processes")
+        logger.info(f"Process list retrieved: {returned_processes} processes")
 
-        return ProcessListResponse(**result)
+        return snapshot_response(request, snapshot)
 
     except SudoWrapperError as e:
         # 監査ログ記録（失敗）
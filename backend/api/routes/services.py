@@ -25,7 +25,9 @@ router = APIRouter(prefix="/services", tags=["services"])
 class ServiceRestartRequest(BaseModel):
     """サービス再起動リクエスト"""
 
-    service_name: str = Field(..., min_length=1, max_length=64, pattern="^[a-zA-Z0-9_-]+$")
+    service_name: str = Field(
+        ..., min_length=1, max_length=64, pattern="^[a-zA-Z0-9_-]+$"
+    )
 
 
 class ServiceRestartResponse(BaseModel):
@@ -66,12 +68,13 @@ async def restart_service(
         f"Service restart requested: service={service_name}, user={current_user.username}"
     )
 
-    # 監査ログ記録（試行）
+    # 監査ログ記録（試行）: 再起動の実行前にディスクへ確定させる
     audit_log.record(
         operation="service_restart",
         user_id=current_user.user_id,
         target=service_name,
         status="attempt",
+        durable=True,
     )
 
     try:
@@ -4,11 +4,14 @@
 
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 
 from ...core import get_current_user, require_permission, sudo_wrapper
 from ...core.audit_log import audit_log
 from ...core.auth import TokenData
+from ...core.config import config_manager
+from ...core.snapshot import snapshot_cache, snapshot_response
 
 logger = logging.getLogger(__name__)
 
@@ -22,12 +25,17 @@ router = APIRouter(prefix="/system", tags=["system"])
 
 @router.get("/status")
 async def get_system_status(
+    request: Request,
     current_user: TokenData = Depends(require_permission("read:status")),
 ):
     """
     システム状態を取得
 
+    snapshot.ttl_seconds の間は同じスナップショットを返す。ETag を付与し、
+    If-None-Match が一致した場合は 304 を返す。
+
     Args:
+        request: HTTP リクエスト（If-None-Match の参照用）
         current_user: 現在のユーザー（read:status 権限必須）
 
     Returns:
@@ -36,8 +44,8 @@ async def get_system_status(
     logger.info(f"System status requested by: {current_user.username}")
 
     try:
-        # sudo ラッパー経由でシステム状態を取得
-        status_data = sudo_wrapper.get_system_status()
+        # sudo ラッパー経由でシステム状態を取得（有効なスナップショットがあれば再利用）
+        snapshot = snapshot_cache.get("system_status", sudo_wrapper.get_system_status)
 
         # 監査ログ記録
         audit_log.record(
@@ -47,7 +55,7 @@ async def get_system_status(
             status="success",
         )
 
-        return status_data
+        return snapshot_response(request, snapshot)
 
     except Exception as e:
         logger.error(f"Failed to get system status: {e}")
@@ -62,3 +70,46 @@ async def get_system_status(
         )
 
         raise
+
+
+@router.get("/config")
+async def get_config_status(
+    current_user: TokenData = Depends(require_permission("manage:settings")),
+):
+    """
+    設定の再読み込み状態を取得
+
+    Args:
+        current_user: 現在のユーザー（manage:settings 権限必須）
+
+    Returns:
+        監視方式、再読み込み回数、最後の再読み込み時刻・エラー
+    """
+    return config_manager.status()
+
+
+@router.post("/config/reload")
+async def reload_config(
+    current_user: TokenData = Depends(require_permission("manage:settings")),
+):
+    """
+    設定ファイルを再読み込み（このワーカーのみ。他のワーカーはファイル監視で反映）
+
+    Args:
+        current_user: 現在のユーザー（manage:settings 権限必須）
+
+    Returns:
+        適用したか（applied）と再読み込み状態
+    """
+    applied = await run_in_threadpool(config_manager.reload)
+    reload_status = config_manager.status()
+
+    audit_log.record(
+        operation="config_reload",
+        user_id=current_user.user_id,
+        target="config",
+        status="success" if applied else "failure",
+        details={"error": reload_status["last_error"]} if not applied else None,
+    )
+
+    return {"applied": applied, **reload_status}
@@ -0,0 +1,110 @@
+"""
+静的ファイルの配信（事前圧縮・内容のハッシュによるキャッシュ）
+
+scripts/build_static_assets.py が生成した圧縮済みのファイル（api.js.br / api.js.gz）が
+あれば、Accept-Encoding に応じてそれを Content-Encoding 付きで返す。元のファイルより
+古い圧縮済みファイルは使わない。
+
+HTML からは ?v=<内容のハッシュ> 付きで参照する。ハッシュが現在の内容と一致する場合は
+長期間（compression.static_max_age）の immutable なキャッシュを許可し、それ以外は
+毎回再検証させる（ETag / Last-Modified による 304）。
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+
+from starlette.datastructures import Headers, QueryParams
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+from ..core.config import settings
+from .compression import is_compressible, negotiate_encoding
+
+# 圧縮形式と圧縮済みファイルの拡張子（優先順）
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+def content_hash(data: bytes) -> str:
+    """?v= に使う内容のハッシュ"""
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """事前圧縮済みのファイルと内容のハッシュによるキャッシュに対応した StaticFiles"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # パス → (mtime, サイズ, ハッシュ)
+        self._hashes: dict[str, tuple[float, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        media_type = mimetypes.guess_type(str(full_path))[0] or "text/plain"
+        headers = {"Cache-Control": self._cache_control(full_path, stat_result, scope)}
+
+        if is_compressible(media_type):
+            headers["Vary"] = "Accept-Encoding"
+            precompressed = self._precompressed(full_path, stat_result)
+            encoding = negotiate_encoding(
+                request_headers.get("accept-encoding"), list(precompressed)
+            )
+            if encoding is not None:
+                full_path, stat_result = precompressed[encoding]
+                headers["Content-Encoding"] = encoding
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            stat_result=stat_result,
+            media_type=media_type,
+            headers=headers,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _precompressed(full_path, stat_result: os.stat_result) -> dict:
+        """使える圧縮済みファイル（圧縮形式 → (パス, stat)、元のファイルより新しいもののみ）"""
+        found = {}
+        for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+            path = f"{full_path}{suffix}"
+            try:
+                compressed_stat = os.stat(path)
+            except OSError:
+                continue
+            if compressed_stat.st_mtime >= stat_result.st_mtime:
+                found[encoding] = (path, compressed_stat)
+        return found
+
+    def _cache_control(
+        self, full_path, stat_result: os.stat_result, scope: Scope
+    ) -> str:
+        version = QueryParams(scope.get("query_string", b"")).get("v")
+        if version and version == self._content_hash(str(full_path), stat_result):
+            return f"public, max-age={settings.compression.static_max_age}, immutable"
+        return "no-cache"
+
+    def _content_hash(self, path: str, stat_result: os.stat_result) -> str:
+        """ファイルの内容のハッシュ（mtime とサイズが変わるまで再計算しない）"""
+        key = (stat_result.st_mtime, stat_result.st_size)
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached is not None and cached[:2] == key:
+            return cached[2]
+
+        with open(path, "rb") as f:
+            digest = content_hash(f.read())
+        with self._lock:
+            self._hashes[path] = (*key, digest)
+        return digest
@@ -0,0 +1,287 @@
+"""
+監査ログのブロック圧縮アーカイブ
+
+書き込みが終わった日別ファイル（audit_YYYYMMDD.json）を
+audit_YYYYMMDD.json.blk に圧縮する。
+
+形式:
+    MAGIC | 圧縮ブロック... | 索引 JSON | 索引長（8バイト BE） | MAGIC
+
+各ブロックは約 BLOCK_RAW_BYTES 分の行を zlib 圧縮したもの。索引には各ブロックの
+位置、元ファイル上のオフセット（raw_offset）、タイムスタンプ範囲と、ファイル全体の
+サマリ（audit_summary と同じ形式）を持つ。
+オフセットは元ファイル上の位置で扱うため、圧縮前に発行した検索カーソルも引き続き有効。
+そのため元ファイルの内容は空行・壊れた行・改行のない末尾の行も含めてそのまま格納する
+（サマリとタイムスタンプ範囲には正しいレコードだけを数える）。
+"""
+
+import json
+import logging
+import os
+import struct
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .audit_summary import add_entry, new_summary, summary_path
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = ".blk"
+ARCHIVE_VERSION = 1
+MAGIC = b"AUDITBLK1\n"
+BLOCK_RAW_BYTES = 256 * 1024
+
+_FOOTER = struct.Struct(">Q")
+
+
+class AuditArchiveError(Exception):
+    """アーカイブが壊れている・形式が異なる場合の例外"""
+
+    pass
+
+
+def archive_path(log_file: Path) -> Path:
+    return log_file.with_name(log_file.name + ARCHIVE_SUFFIX)
+
+
+def segment_name(path: Path) -> str:
+    """アーカイブ・非圧縮のどちらでも、元の日別ファイル名を返す"""
+    name = path.name
+    return name[: -len(ARCHIVE_SUFFIX)] if name.endswith(ARCHIVE_SUFFIX) else name
+
+
+def read_index(path: Path) -> Dict[str, Any]:
+    """
+    アーカイブの索引を読む（末尾のみ読む）
+
+    Raises:
+        AuditArchiveError: 形式が不正な場合
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise AuditArchiveError(f"Not an audit archive: {path}")
+
+        tail = len(MAGIC) + _FOOTER.size
+        size = f.seek(0, os.SEEK_END)
+        f.seek(size - tail)
+        footer = f.read(tail)
+        if footer[_FOOTER.size :] != MAGIC:
+            raise AuditArchiveError(f"Truncated audit archive: {path}")
+
+        (index_size,) = _FOOTER.unpack(footer[: _FOOTER.size])
+        f.seek(size - tail - index_size)
+        index = json.loads(f.read(index_size))
+
+    if index.get("version") != ARCHIVE_VERSION:
+        raise AuditArchiveError(f"Unsupported audit archive version: {path}")
+    return index
+
+
+def _block_may_match(
+    block: Dict[str, Any], start_date: Optional[datetime], end_date: Optional[datetime]
+) -> bool:
+    if block["min_timestamp"] is None:
+        # 正しいレコードがない（空行・壊れた行のみの）ブロックは読んで判断する
+        return True
+    if start_date and datetime.fromisoformat(block["max_timestamp"]) < start_date:
+        return False
+    if end_date and datetime.fromisoformat(block["min_timestamp"]) > end_date:
+        return False
+    return True
+
+
+def _block_lines(f, block: Dict[str, Any]) -> Iterator[tuple[int, int, bytes]]:
+    """ブロックを展開し、(行頭オフセット, 行末の次のオフセット, 行) を返す"""
+    f.seek(block["offset"])
+    data = zlib.decompress(f.read(block["length"]))
+
+    offset = block["raw_offset"]
+    for raw in data.split(b"\n")[:-1]:
+        start = offset
+        offset += len(raw) + 1
+        line = raw.strip()
+        if line:
+            yield start, offset, line
+
+
+def read_lines(
+    path: Path,
+    start: int = 0,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Iterator[tuple[int, bytes]]:
+    """
+    アーカイブを先頭から読む（元ファイル上の start 以降）
+
+    期間外のブロックは展開しない。
+
+    Yields:
+        (元ファイル上の行末の次のオフセット, 行)
+    """
+    index = read_index(path)
+    with open(path, "rb") as f:
+        for block in index["blocks"]:
+            if block["raw_offset"] + block["raw_length"] <= start:
+                continue
+            if not _block_may_match(block, start_date, end_date):
+                continue
+            for line_start, line_end, line in _block_lines(f, block):
+                if line_start >= start:
+                    yield line_end, line
+
+
+def read_lines_reverse(
+    path: Path,
+    end: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+) -> Iterator[tuple[int, bytes]]:
+    """
+    アーカイブを末尾から読む（元ファイル上の end より前）
+
+    期間外のブロックは展開しない。
+
+    Yields:
+        (元ファイル上の行頭オフセット, 行)
+    """
+    index = read_index(path)
+    with open(path, "rb") as f:
+        for block in reversed(index["blocks"]):
+            if end is not None and block["raw_offset"] >= end:
+                continue
+            if not _block_may_match(block, start_date, end_date):
+                continue
+            lines = list(_block_lines(f, block))
+            for line_start, _, line in reversed(lines):
+                if end is None or line_start < end:
+                    yield line_start, line
+
+
+def read_raw_lines(path: Path) -> Iterator[bytes]:
+    """アーカイブに収めた元ファイルの内容を1行ずつ返す（空行・改行も含めそのまま）"""
+    index = read_index(path)
+    with open(path, "rb") as f:
+        for block in index["blocks"]:
+            f.seek(block["offset"])
+            yield from zlib.decompress(f.read(block["length"])).splitlines(
+                keepends=True
+            )
+
+
+def _source_lines(log_file: Path) -> Iterator[bytes]:
+    """
+    圧縮対象の行（既存アーカイブがあればその内容に続けて非圧縮ファイルの内容）
+
+    元ファイル上のオフセットを変えないよう、行の内容は変更しない。
+    """
+    existing = archive_path(log_file)
+    if existing.exists():
+        yield from read_raw_lines(existing)
+
+    with open(log_file, "rb") as f:
+        yield from f
+
+
+def write_archive(log_file: Path, block_raw_bytes: int = BLOCK_RAW_BYTES) -> Path:
+    """
+    日別ファイルをアーカイブに圧縮し、元ファイルとサマリを削除
+
+    同じ日付のアーカイブが既にある場合（封印後に遅れて書き込まれた場合）は、
+    その内容に追加した新しいアーカイブで置き換える。
+
+    Args:
+        log_file: audit_YYYYMMDD.json
+        block_raw_bytes: 1ブロックあたりの非圧縮サイズの目安
+
+    Returns:
+        アーカイブのパス
+    """
+    target = archive_path(log_file)
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    summary = new_summary()
+    blocks: list[Dict[str, Any]] = []
+    raw_offset = 0
+
+    malformed = 0
+
+    def flush_block(f, lines: list[bytes], timestamps: list[str]) -> None:
+        nonlocal raw_offset
+        raw = b"".join(lines)
+        compressed = zlib.compress(raw, 6)
+        blocks.append(
+            {
+                "offset": f.tell(),
+                "length": len(compressed),
+                "raw_offset": raw_offset,
+                "raw_length": len(raw),
+                "records": len(timestamps),
+                "min_timestamp": min(timestamps, default=None),
+                "max_timestamp": max(timestamps, default=None),
+            }
+        )
+        f.write(compressed)
+        raw_offset += len(raw)
+
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            lines: list[bytes] = []
+            timestamps: list[str] = []
+            size = 0
+
+            for raw in _source_lines(log_file):
+                if raw.strip():
+                    try:
+                        entry = json.loads(raw)
+                        add_entry(summary, entry)
+                        timestamps.append(entry["timestamp"])
+                    except (ValueError, KeyError, TypeError):
+                        # サマリには数えないが、後続の行のオフセットを保つため内容は残す
+                        malformed += 1
+
+                lines.append(raw)
+                size += len(raw)
+                if size >= block_raw_bytes and raw.endswith(b"\n"):
+                    flush_block(f, lines, timestamps)
+                    lines, timestamps, size = [], [], 0
+
+            if lines:
+                flush_block(f, lines, timestamps)
+
+            summary["size"] = raw_offset
+            index = json.dumps(
+                {
+                    "version": ARCHIVE_VERSION,
+                    "raw_size": raw_offset,
+                    "blocks": blocks,
+                    "summary": summary,
+                },
+                ensure_ascii=False,
+            ).encode("utf-8")
+            f.write(index)
+            f.write(_FOOTER.pack(len(index)))
+            f.write(MAGIC)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, target)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    # アーカイブが確定してから元ファイルを削除
+    log_file.unlink()
+    summary_path(log_file).unlink(missing_ok=True)
+
+    if malformed:
+        logger.warning(
+            f"Archived {malformed} malformed audit log lines as-is: {log_file}"
+        )
+    logger.info(
+        f"Audit log archived: {log_file.name} -> {target.name}, "
+        f"records={summary['records']}, blocks={len(blocks)}, "
+        f"raw={raw_offset}, compressed={target.stat().st_size}"
+    )
+    return target
@@ -0,0 +1,347 @@
+"""
+監査ログのハッシュチェーンと検証
+
+各レコードは同じ書き込み元（writer）の直前のレコードのハッシュ（prev_hash）を含み、
+自身のハッシュ（hash）を持つ。writer 毎の最初のレコード（seq=1）は GENESIS_HASH に繋がる。
+レコードの改ざん・削除・並べ替えはハッシュまたは seq の不一致として検出できる。
+
+末尾の削除（切り詰め）はチェーンだけでは検出できないため、writer は一定件数毎と
+終了時に、その時点の先頭ハッシュへの HMAC 署名（チェックポイント）を
+checkpoints.jsonl に記録する。チェックポイントは対象レコードの書き込み後に記録するため、
+検証時に対応するレコードが見つからなければ削除されたと判断できる。
+
+検証済みの位置・各 writer の先頭ハッシュは状態ファイルに保存し、
+次回の検証では新たに追記されたレコードのみをハッシュする。
+"""
+
+import fcntl
+import hashlib
+import hmac
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = "0" * 64
+CHECKPOINT_FILE = "checkpoints.jsonl"
+STATE_FILE = ".verify_state.json"
+STATE_VERSION = 1
+
+# 状態ファイルに保持するエラーの最大件数
+MAX_ERRORS = 100
+
+
+def record_hash(entry: Dict[str, Any]) -> str:
+    """
+    レコードのハッシュ（hash 以外の全フィールドの正規化 JSON の SHA-256）
+
+    ファイル上の表現（キー順・空白）には依存しない。
+    """
+    body = {key: value for key, value in entry.items() if key != "hash"}
+    canonical = json.dumps(
+        body, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def checkpoint_key(secret: str) -> bytes:
+    """チェックポイント署名用の鍵（JWT 秘密鍵から用途別に導出）"""
+    return hmac.new(
+        secret.encode("utf-8"), b"audit-checkpoint", hashlib.sha256
+    ).digest()
+
+
+def key_id(key: bytes) -> str:
+    return hashlib.sha256(key).hexdigest()[:16]
+
+
+def _signature(key: bytes, checkpoint: Dict[str, Any]) -> str:
+    message = ":".join(
+        str(checkpoint[field]) for field in ("writer", "seq", "hash", "timestamp")
+    )
+    return hmac.new(key, message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def sign_checkpoint(key: bytes, writer: str, seq: int, head: str) -> Dict[str, Any]:
+    """writer の seq 番目のレコードのハッシュに対するチェックポイントを作成"""
+    checkpoint = {
+        "timestamp": datetime.now().isoformat(),
+        "writer": writer,
+        "seq": seq,
+        "hash": head,
+        "key_id": key_id(key),
+    }
+    checkpoint["signature"] = _signature(key, checkpoint)
+    return checkpoint
+
+
+def _new_state() -> Dict[str, Any]:
+    return {
+        "version": STATE_VERSION,
+        "segments": {},
+        "writers": {},
+        "checkpoints_offset": 0,
+        "records": 0,
+        "legacy_records": 0,
+        "checkpoints_verified": 0,
+        "errors": [],
+        "last_run": None,
+    }
+
+
+def load_state(log_dir: Path) -> Dict[str, Any]:
+    """前回の検証状態（なければ初期状態）"""
+    try:
+        with open(log_dir / STATE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return _new_state()
+    if state.get("version") != STATE_VERSION:
+        return _new_state()
+    return state
+
+
+def _save_state(log_dir: Path, state: Dict[str, Any]) -> None:
+    path = log_dir / STATE_FILE
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class AuditChainVerifier:
+    """
+    監査ログのハッシュチェーンを増分検証
+
+    セグメントの列挙と読み込みは AuditLog から受け取る（圧縮済みかどうかを意識しない）。
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        key: bytes,
+        segments: Callable[[], Iterable[Path]],
+        segment_size: Callable[[Path], int],
+        read_lines: Callable[[Path, int], Iterator[tuple[int, bytes]]],
+    ):
+        """
+        初期化
+
+        Args:
+            log_dir: 監査ログディレクトリ（状態ファイル・チェックポイントの置き場所）
+            key: チェックポイント署名用の鍵
+            segments: 日別セグメントを古い順に返す関数
+            segment_size: セグメントの（非圧縮換算の）サイズを返す関数
+            read_lines: (セグメント, 開始オフセット) から (行末の次のオフセット, 行) を返す関数
+        """
+        self.log_dir = log_dir
+        self.key = key
+        self.key_id = key_id(key)
+        self._segments = segments
+        self._segment_size = segment_size
+        self._read_lines = read_lines
+
+    def verify(self, full: bool = False) -> Dict[str, Any]:
+        """
+        前回の続きから検証
+
+        Args:
+            full: True の場合は状態を破棄して全件を検証し直す
+
+        Returns:
+            検証結果（状態ファイルの last_run にも保存）
+        """
+        with open(self.log_dir / ".verify.lock", "a") as lock:
+            # 同時に実行された検証は順番に処理（2つ目はほぼ差分なしで終わる）
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            state = _new_state() if full else load_state(self.log_dir)
+            run: Dict[str, Any] = {
+                "records": 0,
+                "bytes": 0,
+                "checkpoints": 0,
+                "errors": [],
+                "pending": {},
+            }
+            started = time.perf_counter()
+
+            self._read_checkpoints(state, run)
+            self._verify_segments(state, run)
+
+            elapsed = time.perf_counter() - started
+            state["errors"] = (state["errors"] + run["errors"])[-MAX_ERRORS:]
+            report = {
+                "status": "ok" if not state["errors"] else "tampered",
+                "full": full,
+                "verified_at": datetime.now().isoformat(),
+                "records_verified": state["records"],
+                "legacy_records": state["legacy_records"],
+                "new_records": run["records"],
+                "bytes_hashed": run["bytes"],
+                "checkpoints_verified": state["checkpoints_verified"],
+                "new_checkpoints": run["checkpoints"],
+                "errors": state["errors"],
+                "elapsed_seconds": round(elapsed, 6),
+                "records_per_second": (
+                    round(run["records"] / elapsed, 1) if elapsed else 0.0
+                ),
+                "bytes_per_second": (
+                    round(run["bytes"] / elapsed, 1) if elapsed else 0.0
+                ),
+            }
+            state["last_run"] = report
+            _save_state(self.log_dir, state)
+
+        logger.info(
+            f"Audit log verified: status={report['status']}, new_records={run['records']}, "
+            f"elapsed={elapsed:.3f}s, records_per_second={report['records_per_second']}"
+        )
+        return report
+
+    def _error(self, run: Dict[str, Any], message: str, **details: Any) -> None:
+        logger.error(f"Audit log verification failed: {message} {details}")
+        run["errors"].append({"error": message, **details})
+
+    def _read_checkpoints(self, state: Dict[str, Any], run: Dict[str, Any]) -> None:
+        """
+        新しいチェックポイントの署名を確認し、照合待ちに追加
+
+        セグメントより先に読むことで、照合待ちのチェックポイントの対象レコードは
+        必ずこの後に読むセグメントに含まれる。
+        """
+        path = self.log_dir / CHECKPOINT_FILE
+        if not path.exists():
+            return
+
+        with open(path, "rb") as f:
+            f.seek(state["checkpoints_offset"])
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    # 書き込み途中の行は次回に読む
+                    break
+                state["checkpoints_offset"] += len(raw)
+                try:
+                    checkpoint = json.loads(raw)
+                    expected = _signature(self.key, checkpoint)
+                except (ValueError, KeyError, TypeError):
+                    self._error(run, "malformed checkpoint")
+                    continue
+
+                if checkpoint.get("key_id") != self.key_id:
+                    # 鍵の変更前に作成されたチェックポイントは照合できない
+                    logger.warning(
+                        f"Audit checkpoint signed with unknown key: {checkpoint.get('key_id')}"
+                    )
+                    continue
+                if not hmac.compare_digest(
+                    str(checkpoint.get("signature", "")), expected
+                ):
+                    self._error(
+                        run,
+                        "invalid checkpoint signature",
+                        writer=checkpoint.get("writer"),
+                        seq=checkpoint.get("seq"),
+                    )
+                    continue
+
+                head = state["writers"].get(checkpoint["writer"])
+                if head is None or head["seq"] < checkpoint["seq"]:
+                    run["pending"][
+                        (checkpoint["writer"], checkpoint["seq"])
+                    ] = checkpoint
+                elif head["seq"] == checkpoint["seq"]:
+                    self._match_checkpoint(state, run, checkpoint, head["hash"])
+                # 前回の検証がチェックポイントの記録より先に対象レコードを通過した場合は照合しない
+
+    def _match_checkpoint(
+        self,
+        state: Dict[str, Any],
+        run: Dict[str, Any],
+        checkpoint: Dict[str, Any],
+        actual: str,
+    ) -> None:
+        if actual == checkpoint["hash"]:
+            state["checkpoints_verified"] += 1
+            run["checkpoints"] += 1
+        else:
+            self._error(
+                run,
+                "checkpoint mismatch",
+                writer=checkpoint["writer"],
+                seq=checkpoint["seq"],
+            )
+
+    def _verify_segments(self, state: Dict[str, Any], run: Dict[str, Any]) -> None:
+        pending = run["pending"]
+        segments = list(self._segments())
+        names = {segment.name for segment in segments}
+
+        for name in state["segments"]:
+            if name not in names:
+                self._error(run, "segment missing", segment=name)
+
+        for segment in segments:
+            offset = state["segments"].get(segment.name, 0)
+            if self._segment_size(segment) < offset:
+                self._error(
+                    run,
+                    "segment truncated",
+                    segment=segment.name,
+                    verified_offset=offset,
+                )
+                continue
+
+            for end, line in self._read_lines(segment, offset):
+                state["segments"][segment.name] = end
+                run["bytes"] += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    self._error(
+                        run, "malformed record", segment=segment.name, offset=offset
+                    )
+                    offset = end
+                    continue
+                self._verify_entry(state, run, pending, entry, segment.name, offset)
+                offset = end
+
+        for writer, seq in pending:
+            self._error(run, "checkpointed record missing", writer=writer, seq=seq)
+
+    def _verify_entry(
+        self,
+        state: Dict[str, Any],
+        run: Dict[str, Any],
+        pending: Dict[tuple[Any, Any], Dict[str, Any]],
+        entry: Dict[str, Any],
+        segment: str,
+        offset: int,
+    ) -> None:
+        if "hash" not in entry:
+            # ハッシュチェーン導入前のレコード
+            state["legacy_records"] += 1
+            return
+
+        state["records"] += 1
+        run["records"] += 1
+        writer, seq = entry.get("writer"), entry.get("seq")
+        where = {"segment": segment, "offset": offset, "writer": writer, "seq": seq}
+
+        actual = record_hash(entry)
+        if actual != entry["hash"]:
+            self._error(run, "record hash mismatch", **where)
+
+        head = state["writers"].get(writer, {"seq": 0, "hash": GENESIS_HASH})
+        if seq != head["seq"] + 1 or entry.get("prev_hash") != head["hash"]:
+            self._error(run, "chain broken", expected_seq=head["seq"] + 1, **where)
+        # 改ざんされたレコードが1件でも後続のレコードまで不一致にしないよう、記録上のハッシュで繋ぐ
+        state["writers"][writer] = {"seq": seq, "hash": entry["hash"]}
+
+        checkpoint = pending.pop((writer, seq), None)
+        if checkpoint is not None:
+            self._match_checkpoint(state, run, checkpoint, actual)
@@ -2,39 +2,586 @@
 監査ログモジュール
 
 全操作を追記専用ログとして記録し、改ざん防止を実現
+
+複数ワーカープロセス（gunicorn）から同一ファイルへ追記するため、
+各バッチは O_APPEND で開いたファイルへレコード境界を保った write(2) で書き込む。
+各レコードには書き込み元（writer）と writer 内の連番（seq）を付与する。
+
+改ざん検出のため、各レコードは同じ writer の直前のレコードとハッシュで連結し、
+一定件数毎に署名付きチェックポイントを記録する（audit_chain 参照）。
 """
 
+import asyncio
+import atexit
+import base64
+import fcntl
+import itertools
 import json
 import logging
+import os
+import queue
+import threading
+import time
+import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
+from .audit_archive import ARCHIVE_SUFFIX, AuditArchiveError, archive_path, read_index
+from .audit_archive import read_lines as archive_read_lines
+from .audit_archive import read_lines_reverse as archive_read_lines_reverse
+from .audit_archive import segment_name, write_archive
+from .audit_chain import (
+    CHECKPOINT_FILE,
+    GENESIS_HASH,
+    AuditChainVerifier,
+    checkpoint_key,
+    load_state,
+    record_hash,
+    sign_checkpoint,
+)
+from .audit_store import ROLLUP_DIMENSIONS, ROLLUP_GRANULARITIES, AuditStore
+from .audit_summary import file_date, load_summary, may_match
 from .config import settings
+from .lazy import LazyObject
+from .metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+write_duration = metrics.histogram(
+    "adminui_audit_write_duration_seconds",
+    "Audit log write time including fsync (batch: one group commit, sync: one record)",
+    ("mode",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# 1回の write(2) で書き込む最大バイト数（レコード境界で分割）
+WRITE_CHUNK_BYTES = 1024 * 1024
+
+
+# 逆方向読み込みのブロックサイズ
+REVERSE_READ_BLOCK_BYTES = 64 * 1024
+
+
+class AuditLogReadError(Exception):
+    """監査ログのセグメント・アーカイブを読めない（壊れている）場合の例外"""
+
+    pass
+
+
+def _read_lines(path: Path, start: int = 0) -> Iterator[tuple[int, bytes]]:
+    """
+    ファイルを start から1行ずつ読む（空行は除く）
+
+    Yields:
+        (行末の次のオフセット, 行)
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for raw in f:
+            # 改行のない末尾の行は書き込み途中のため含めない
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            line = raw.strip()
+            if line:
+                yield offset, line
+
+
+def _read_lines_reverse(
+    path: Path, block_size: int = REVERSE_READ_BLOCK_BYTES, end: Optional[int] = None
+) -> Iterator[tuple[int, bytes]]:
+    """
+    ファイルを end（None の場合は末尾）からブロック単位で逆方向に読み、行を新しい順に返す
+
+    必要な件数が揃った時点で呼び出し側が打ち切れば、ファイルの末尾しか読まない。
+    改行のない末尾の行（書き込み途中）は含めない。
+
+    Yields:
+        (行頭のオフセット, 行)
+    """
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END) if end is None else end
+        remainder = b""
+        # 最初に見る部分は最後の改行より後（空か書き込み途中の行）
+        tail = True
+        while position > 0:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            block = f.read(read_size) + remainder
+
+            parts = block.split(b"\n")
+            # 先頭は前のブロックに続く可能性があるため持ち越す
+            remainder = parts[0]
+            offset = position + len(block)
+            for part in reversed(parts[1:]):
+                offset -= len(part)
+                line = part.strip()
+                if line and not tail:
+                    yield offset, line
+                tail = False
+                offset -= 1
+
+        line = remainder.strip()
+        if line and not tail:
+            yield 0, line
+
+
+def encode_cursor(file_name: str, offset: int, order: str) -> str:
+    """検索の続きを表す不透明なカーソルを生成"""
+    raw = json.dumps({"file": file_name, "offset": offset, "order": order})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str) -> tuple[str, int]:
+    """
+    カーソルを (ファイル名, オフセット) に戻す
+
+    Raises:
+        ValueError: カーソルが不正な場合（別の並び順で発行されたものを含む）
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        file_name, offset = data["file"], data["offset"]
+        cursor_order = data["order"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if (
+        not isinstance(file_name, str)
+        or file_date(Path(file_name)) is None
+        or Path(file_name).name != file_name
+        or not isinstance(offset, int)
+        or offset < 0
+        or cursor_order != order
+    ):
+        raise ValueError("Invalid cursor")
+    return file_name, offset
+
+
+def _new_writer_id() -> str:
+    """書き込み元の識別子（PID の再利用と区別するため乱数を付与）"""
+    return f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def _open_append(path: Path) -> int:
+    """追記専用で開く（O_APPEND により各 write はファイル末尾へ原子的に配置される）"""
+    return os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """data を全て書き込む（部分書き込みの場合は残りを続けて書く）"""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _write_records(fd: int, payloads: Iterable[bytes]) -> None:
+    """
+    レコード（改行付きバイト列）をまとめて書き込む
+
+    レコードを途中で分割しないよう、WRITE_CHUNK_BYTES 以下の単位に詰めて write する。
+    他プロセスの書き込みと行が混ざることはない。
+    """
+    chunk: list[bytes] = []
+    size = 0
+    for payload in payloads:
+        if chunk and size + len(payload) > WRITE_CHUNK_BYTES:
+            _write_all(fd, b"".join(chunk))
+            chunk, size = [], 0
+        chunk.append(payload)
+        size += len(payload)
+    if chunk:
+        _write_all(fd, b"".join(chunk))
+
+
+class _CommitWaiter:
+    """書き込み完了（fsync 済み）を待つための待機オブジェクト"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        if not self.event.wait(timeout):
+            raise TimeoutError("Timed out waiting for audit log commit")
+        if self.error is not None:
+            raise self.error
+
+
+class AuditWriter:
+    """
+    監査ログのグループコミット書き込みスレッド
+
+    record() はキューに積むだけで戻り、専用スレッドが flush_interval 毎
+    （または max_batch_size 件到達時）にまとめて追記する。
+    durable な書き込みや flush() 要求が届いた場合は待たずに即時コミットする。
+    追記に成功したバッチは on_commit（索引ストアへの登録など）に渡される。
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        path_for: Callable[[Dict[str, Any]], Path],
+        flush_interval: float = 0.05,
+        max_batch_size: int = 256,
+        fsync_policy: str = "batch",
+        on_commit: Optional[Callable[[list[Dict[str, Any]]], None]] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            path_for: エントリの書き込み先（日別ファイル）を返す関数
+            flush_interval: バッチをまとめる最大待ち時間（秒）
+            max_batch_size: 1バッチの最大レコード数
+            fsync_policy: none / batch / record
+            on_commit: 追記済みエントリを受け取るコールバック（失敗しても追記は有効）
+        """
+        self.path_for = path_for
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.fsync_policy = fsync_policy
+        self.on_commit = on_commit
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._atexit_registered = False
+        self._fd: Optional[int] = None
+        self._file_path: Optional[Path] = None
+
+    def _ensure_started(self) -> None:
+        """書き込みスレッドを遅延起動（close() 後は再起動）"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-writer", daemon=True
+                )
+                self._thread.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+    def submit(
+        self, line: bytes, entry: Dict[str, Any], durable: bool = False
+    ) -> Optional[_CommitWaiter]:
+        """
+        シリアライズ済みの1レコードをキューに積む
+
+        Args:
+            line: JSON 1行（改行付き、UTF-8）
+            entry: line の元になったエントリ（on_commit に渡す）
+            durable: True の場合、fsync 完了を待つための待機オブジェクトを返す
+
+        Returns:
+            durable=True の場合は _CommitWaiter、それ以外は None
+        """
+        self._ensure_started()
+        waiter = _CommitWaiter() if durable else None
+        self._queue.put((line, entry, waiter))
+        return waiter
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """これまでに積まれたレコードが書き込まれるまで待つ"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+
+        waiter = _CommitWaiter()
+        self._queue.put((None, None, waiter))
+        waiter.wait(timeout)
+
+    def close(self) -> None:
+        """残りのレコードを書き込んでスレッドを停止"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+
+        self._queue.put(self._STOP)
+        thread.join()
+
+    def _run(self) -> None:
+        """書き込みスレッド本体"""
+        stopping = False
+
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                break
+
+            batch = [item]
+            urgent = item[-1] is not None
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.max_batch_size:
+                # 即時コミットが必要な場合も、既に積まれている分はまとめて書く
+                timeout = 0.0 if urgent else deadline - time.monotonic()
+                try:
+                    if timeout <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if item is self._STOP:
+                    stopping = True
+                    break
+
+                batch.append(item)
+                urgent = urgent or item[-1] is not None
+
+            self._commit(batch)
+
+        self._close_file()
+
+    def _open_file(self, path: Path) -> int:
+        """
+        書き込み先を開く（日付が変わってパスが変わった場合は前のファイルを閉じて開き直す）
+
+        圧縮によって削除されたファイルを開いたままの場合も開き直す
+        （削除済みのファイルへの書き込みは失われるため）。
+        """
+        if (
+            self._fd is None
+            or path != self._file_path
+            or os.fstat(self._fd).st_nlink == 0
+        ):
+            self._close_file()
+            # 追記専用で書き込み（改ざん防止）
+            self._fd = _open_append(path)
+            self._file_path = path
+        return self._fd
+
+    def _close_file(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._file_path = None
+
+    def _commit(self, batch: list) -> None:
+        """1バッチを追記し、ポリシーに従って fsync"""
+        lines = [line for line, _, _ in batch if line is not None]
+        waiters = [waiter for _, _, waiter in batch if waiter is not None]
+        error: Optional[BaseException] = None
+
+        # 日付を跨ぐバッチは書き込み先毎に分ける（順序は維持）
+        segments: list[tuple[Path, list[bytes]]] = []
+        for line, entry, _ in batch:
+            if line is None:
+                continue
+            path = self.path_for(entry)
+            if segments and segments[-1][0] == path:
+                segments[-1][1].append(line)
+            else:
+                segments.append((path, [line]))
+
+        started = time.perf_counter()
+        try:
+            for path, segment_lines in segments:
+                fd = self._open_file(path)
+                if self.fsync_policy == "record":
+                    for line in segment_lines:
+                        _write_all(fd, line)
+                        os.fsync(fd)
+                else:
+                    _write_records(fd, segment_lines)
+                    # durable 要求があればポリシーに関わらず fsync
+                    if self.fsync_policy == "batch" or waiters:
+                        os.fsync(fd)
+            if segments:
+                write_duration.observe(time.perf_counter() - started, mode="batch")
+
+        except Exception as e:
+            error = e
+            logger.error(f"Failed to write audit log batch ({len(lines)} records): {e}")
+            self._close_file()
+
+        if error is None and lines and self.on_commit is not None:
+            try:
+                self.on_commit([entry for _, entry, _ in batch if entry is not None])
+            except Exception as e:
+                # 索引は JSON ログから再構築できるため、監査ログの記録自体は成功扱い
+                logger.error(
+                    f"Failed to index audit log batch ({len(lines)} records): {e}"
+                )
+
+        for waiter in waiters:
+            waiter.error = error
+            waiter.event.set()
+
 
 class AuditLog:
     """監査ログ管理クラス"""
 
-    def __init__(self, log_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        log_dir: Optional[Path] = None,
+        buffered: Optional[bool] = None,
+        flush_interval: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        fsync_policy: Optional[str] = None,
+        max_record_bytes: Optional[int] = None,
+        checkpoint_interval: Optional[int] = None,
+        db_path: Optional[Path] = None,
+    ):
         """
         初期化
 
         Args:
             log_dir: ログディレクトリ（None の場合は設定から取得）
+            db_path: 索引ストア（SQLite）のパス。None かつ log_dir も None の場合は
+                     設定（audit.index_enabled / database.path）に従う
+            buffered: グループコミット書き込みを使用するか（None の場合は設定から取得）
+            flush_interval: バッチをまとめる最大待ち時間（秒）
+            max_batch_size: 1バッチの最大レコード数
+            fsync_policy: none / batch / record
+            max_record_bytes: 1レコードの最大バイト数
+            checkpoint_interval: 署名付きチェックポイントを記録する間隔（レコード数）
         """
+        audit_config = settings.audit
+
         if log_dir is None:
             log_file = Path(settings.logging.file)
             log_dir = log_file.parent / "audit"
+            if db_path is None and audit_config.index_enabled:
+                db_path = Path(settings.database.path)
 
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
-        # 日別のログファイル
-        today = datetime.now().strftime("%Y%m%d")
-        self.log_file = self.log_dir / f"audit_{today}.json"
+        # JSON ログが正本、索引ストアは検索用の複製
+        self.store: Optional[AuditStore] = AuditStore(db_path) if db_path else None
+
+        self.buffered = audit_config.buffered if buffered is None else buffered
+        self.fsync_policy = fsync_policy or audit_config.fsync_policy
+        self.flush_interval = (
+            audit_config.flush_interval if flush_interval is None else flush_interval
+        )
+        self.max_batch_size = max_batch_size or audit_config.max_batch_size
+        self.max_record_bytes = max_record_bytes or audit_config.max_record_bytes
+        self.checkpoint_interval = (
+            checkpoint_interval or audit_config.checkpoint_interval
+        )
+        self._checkpoint_key = checkpoint_key(settings.jwt_secret_key)
+
+        self._archiver: Optional[threading.Thread] = None
+        self._archiver_stop = threading.Event()
+
+        self._init_writer()
+
+    def _init_writer(self) -> None:
+        """書き込み元 ID・連番・書き込みスレッドを初期化"""
+        self.writer_id = _new_writer_id()
+        self._seq = itertools.count(1)
+        self._seq_lock = threading.Lock()
+        # ハッシュチェーンの先頭（最後に採番したレコード）と最後のチェックポイント
+        self._head_seq = 0
+        self._chain_head = GENESIS_HASH
+        self._checkpoint_seq = 0
+
+        self._writer: Optional[AuditWriter] = None
+        if self.buffered:
+            self._writer = AuditWriter(
+                self._segment_for,
+                flush_interval=self.flush_interval,
+                max_batch_size=self.max_batch_size,
+                fsync_policy=self.fsync_policy,
+                on_commit=self._on_commit,
+            )
+
+    @property
+    def log_file(self) -> Path:
+        """今日の日別ログファイル"""
+        return self.log_dir / f"audit_{datetime.now().strftime('%Y%m%d')}.json"
+
+    def _segment_for(self, entry: Dict[str, Any]) -> Path:
+        """
+        エントリの書き込み先（タイムスタンプの日付の日別ファイル）
+
+        書き込み時に日付で振り分けるため、長時間稼働しても日付毎にファイルが切り替わる。
+        """
+        day = entry["timestamp"][:10].replace("-", "")
+        return self.log_dir / f"audit_{day}.json"
+
+    def _index(self, entries: list[Dict[str, Any]]) -> None:
+        """追記済みエントリを索引ストアへ登録"""
+        if self.store is not None:
+            self.store.insert_many(entries)
+
+    def _on_commit(self, entries: list[Dict[str, Any]]) -> None:
+        """追記完了後の処理（チェックポイントの記録と索引への登録）"""
+        due = [e for e in entries if e["seq"] % self.checkpoint_interval == 0]
+        if due:
+            self._write_checkpoint(due[-1]["seq"], due[-1]["hash"])
+        self._index(entries)
+
+    def _write_checkpoint(self, seq: int, head: str) -> None:
+        """チェーン先頭への署名付きチェックポイントを追記（該当レコードの書き込み後に呼ぶ）"""
+        checkpoint = sign_checkpoint(self._checkpoint_key, self.writer_id, seq, head)
+        payload = (json.dumps(checkpoint) + "\n").encode("utf-8")
+        try:
+            fd = _open_append(self.log_dir / CHECKPOINT_FILE)
+            try:
+                _write_all(fd, payload)
+                if self.fsync_policy != "none":
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._checkpoint_seq = max(self._checkpoint_seq, seq)
+        except OSError as e:
+            # チェックポイントが欠けても次のチェックポイントで検証できる
+            logger.error(f"Failed to write audit checkpoint: seq={seq}, {e}")
+
+    def reset_after_fork(self) -> None:
+        """
+        fork 後の子プロセスで書き込み状態を作り直す
+
+        親プロセスのキュー・スレッド・連番は引き継がず、新しい writer として記録する。
+        """
+        if self._writer is not None:
+            self._writer._close_file()
+        if self.store is not None:
+            self.store.reset()
+        self._init_writer()
+
+    def _seal(self, log_entry: Dict[str, Any]) -> bytes:
+        """
+        連番・タイムスタンプ・チェーンのハッシュを付与し、改行付きバイト列に変換
+
+        _seq_lock を保持して呼ぶこと（採番順とチェーンの順序を一致させるため）。
+        max_record_bytes を超える場合は details を切り詰める。
+        """
+        log_entry["timestamp"] = datetime.now().isoformat()
+        log_entry["seq"] = next(self._seq)
+        log_entry["prev_hash"] = self._chain_head
+
+        payload = self._serialize(log_entry)
+        if len(payload) > self.max_record_bytes:
+            logger.warning(
+                f"Audit log record too large ({len(payload)} bytes), truncating details: "
+                f"operation={log_entry['operation']}, seq={log_entry['seq']}"
+            )
+            log_entry["details"] = {"truncated": True, "original_bytes": len(payload)}
+            payload = self._serialize(log_entry)
+
+        self._head_seq = log_entry["seq"]
+        self._chain_head = log_entry["hash"]
+        return payload
+
+    @staticmethod
+    def _serialize(log_entry: Dict[str, Any]) -> bytes:
+        log_entry.pop("hash", None)
+        log_entry["hash"] = record_hash(log_entry)
+        return (json.dumps(log_entry, ensure_ascii=False) + "\n").encode("utf-8")
 
     def record(
         self,
@@ -43,6 +590,7 @@ class AuditLog:
         target: str,
         status: str,
         details: Optional[Dict[str, Any]] = None,
+        durable: bool = False,
     ) -> None:
         """
         監査ログを記録
@@ -53,21 +601,52 @@ class AuditLog:
             target: 操作対象（例: nginx, system）
             status: 実行結果（success, failure, denied）
             details: 追加詳細情報
+            durable: True の場合、ディスクへの fsync 完了まで待ってから戻る
+                     （状態を変更する操作の実行前に使用）
+
+        Raises:
+            Exception: 同期書き込み・durable 書き込みに失敗した場合
         """
+        # timestamp・seq・ハッシュは採番時に確定（_seal）
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": None,
             "operation": operation,
             "user_id": user_id,
             "target": target,
             "status": status,
             "details": details or {},
+            "writer": self.writer_id,
         }
 
         try:
-            # 追記モードで書き込み（改ざん防止）
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                json.dump(log_entry, f, ensure_ascii=False)
-                f.write("\n")
+            if self._writer is not None:
+                # 連番の採番とキュー投入を同じロック内で行い、ファイル上も seq 順にする
+                # （呼び出し時点の内容で確定させるため、ここでシリアライズする）
+                with self._seq_lock:
+                    payload = self._seal(log_entry)
+                    waiter = self._writer.submit(payload, log_entry, durable=durable)
+                if waiter is not None:
+                    waiter.wait()
+            else:
+                # チェーンの順序とファイル上の順序を一致させるため、書き込みまでロック内で行う
+                with self._seq_lock:
+                    payload = self._seal(log_entry)
+
+                    # 追記専用で書き込み（改ざん防止）
+                    started = time.perf_counter()
+                    fd = _open_append(self._segment_for(log_entry))
+                    try:
+                        _write_all(fd, payload)
+                        if durable or self.fsync_policy != "none":
+                            os.fsync(fd)
+                    finally:
+                        os.close(fd)
+                    write_duration.observe(time.perf_counter() - started, mode="sync")
+
+                try:
+                    self._on_commit([log_entry])
+                except Exception as e:
+                    logger.error(f"Failed to index audit log record: {e}")
 
             logger.info(
                 f"Audit log recorded: operation={operation}, user={user_id}, "
@@ -79,7 +658,53 @@ class AuditLog:
             # 監査ログの記録失敗は重大なため、再 raise
             raise
 
-    def query(
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        バッファ中の監査ログを書き込む
+
+        Args:
+            timeout: 最大待ち時間（秒）
+        """
+        if self._writer is not None:
+            self._writer.flush(timeout)
+
+    def close(self) -> None:
+        """書き込みスレッドを停止（残りのレコードは書き込み、チェーンの先頭をチェックポイントに記録）"""
+        if self._writer is not None:
+            self._writer.close()
+        with self._seq_lock:
+            if self._head_seq > self._checkpoint_seq:
+                self._write_checkpoint(self._head_seq, self._chain_head)
+        if self.store is not None:
+            self.store.close()
+
+    def verify(self, full: bool = False) -> Dict[str, Any]:
+        """
+        ハッシュチェーンとチェックポイントを検証（前回の続きから）
+
+        Args:
+            full: True の場合は全件を検証し直す
+
+        Returns:
+            検証結果（status: ok / tampered、スループット等）
+        """
+        self.flush()
+        verifier = AuditChainVerifier(
+            self.log_dir,
+            self._checkpoint_key,
+            segments=self._segments,
+            segment_size=self._segment_size,
+            read_lines=lambda segment, offset: self._segment_lines(
+                segment, "asc", offset, None, None
+            ),
+        )
+        return verifier.verify(full=full)
+
+    def verification_status(self) -> Optional[Dict[str, Any]]:
+        """前回の検証結果（未検証の場合は None）"""
+        return load_state(self.log_dir)["last_run"]
+
+    async def query_async(
         self,
         user_role: str,
         requesting_user_id: str,
@@ -89,9 +714,438 @@ class AuditLog:
         operation: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 100,
+        order: str = "asc",
+        cursor: Optional[str] = None,
+    ) -> tuple[list[Dict[str, Any]], Optional[str]]:
+        """
+        監査ログを1ページ分検索（RBAC適用、カーソルページング）
+
+        索引ストアが有効な場合は索引で検索する。無効な場合は iter_query() による
+        JSON ログの走査をスレッドで実行する。カーソルはどちらの方式で発行したものかを含み、
+        他方のカーソルは不正として扱う。
+
+        Args:
+            user_role: リクエストユーザーのロール
+            requesting_user_id: リクエストユーザーのID
+            start_date: 開始日時
+            end_date: 終了日時
+            user_id: ユーザーID（フィルタ）
+            operation: 操作種別（フィルタ）
+            status: ステータス（フィルタ）
+            limit: 最大取得件数
+            order: asc（古い順）/ desc（新しい順）
+            cursor: 前回の検索で返された次カーソル
+
+        Returns:
+            (監査ログエントリのリスト, 続きがある場合の次カーソル)
+
+        Raises:
+            PermissionError: Viewerロールの場合
+            ValueError: order・cursor が不正な場合
+        """
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Invalid order: {order}")
+        if user_role == "Viewer":
+            raise PermissionError("Viewer role cannot access audit logs")
+
+        if self.store is None:
+            return await asyncio.to_thread(
+                self._scan_page,
+                user_role,
+                requesting_user_id,
+                start_date,
+                end_date,
+                user_id,
+                operation,
+                status,
+                limit,
+                order,
+                cursor,
+            )
+
+        # RBAC: Operator/Approverは自分のログのみ閲覧可能
+        if user_role in ["Operator", "Approver"]:
+            if user_id and user_id != requesting_user_id:
+                return [], None
+            user_id = requesting_user_id
+
+        # バッファ中のレコードも検索対象にする
+        await asyncio.to_thread(self.flush)
+
+        return await self.store.query_page(
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id,
+            operation=operation,
+            status=status,
+            limit=limit,
+            order=order,
+            cursor=cursor,
+        )
+
+    def _scan_page(
+        self,
+        user_role: str,
+        requesting_user_id: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        user_id: Optional[str],
+        operation: Optional[str],
+        status: Optional[str],
+        limit: int,
+        order: str,
+        cursor: Optional[str],
+    ) -> tuple[list[Dict[str, Any]], Optional[str]]:
+        """JSON ログを走査して1ページ分を取得（索引ストア無効時）"""
+        entries = self.iter_query(
+            user_role,
+            requesting_user_id,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id,
+            operation=operation,
+            status=status,
+            order=order,
+            cursor=cursor,
+        )
+        # 続きの有無を判定するため1件多く読む
+        page = list(itertools.islice(entries, limit + 1))
+        if len(page) > limit:
+            return [entry for entry, _ in page[:limit]], page[limit - 1][1]
+        return [entry for entry, _ in page], None
+
+    async def stats_async(
+        self,
+        user_role: str,
+        requesting_user_id: str,
+        granularity: str = "day",
+        group_by: Iterable[str] = ("operation",),
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        operation: Optional[str] = None,
+        target: Optional[str] = None,
+        status: Optional[str] = None,
     ) -> list[Dict[str, Any]]:
         """
-        監査ログを検索（RBAC適用）
+        監査ログの件数を日次・時間別に集計（RBAC適用）
+
+        索引ストアが有効な場合は登録時に更新される集計テーブルから取得するため、
+        期間の長さに比例したコストで済む。無効な場合は JSON ログを走査して集計する。
+
+        Args:
+            user_role: リクエストユーザーのロール
+            requesting_user_id: リクエストユーザーのID
+            granularity: day / hour
+            group_by: バケットに加えてグループ化する列（operation / target / user_id / status）
+            start_date: 開始日時
+            end_date: 終了日時
+            user_id: ユーザーID（フィルタ）
+            operation: 操作種別（フィルタ）
+            target: 操作対象（フィルタ）
+            status: ステータス（フィルタ）
+
+        Returns:
+            [{"bucket": ..., <group_by の列>: ..., "count": ...}, ...]（bucket 昇順）
+
+        Raises:
+            PermissionError: Viewerロールの場合
+            ValueError: granularity・group_by が不正な場合
+        """
+        if user_role == "Viewer":
+            raise PermissionError("Viewer role cannot access audit logs")
+
+        # RBAC: Operator/Approverは自分のログのみ
+        if user_role in ["Operator", "Approver"]:
+            if user_id and user_id != requesting_user_id:
+                return []
+            user_id = requesting_user_id
+
+        if self.store is not None:
+            # バッファ中のレコードも集計対象にする
+            await asyncio.to_thread(self.flush)
+            return await self.store.stats(
+                granularity=granularity,
+                group_by=group_by,
+                start_date=start_date,
+                end_date=end_date,
+                user_id=user_id,
+                operation=operation,
+                target=target,
+                status=status,
+            )
+
+        return await asyncio.to_thread(
+            self._scan_stats,
+            requesting_user_id,
+            granularity,
+            list(group_by),
+            start_date,
+            end_date,
+            user_id,
+            operation,
+            target,
+            status,
+        )
+
+    def _scan_stats(
+        self,
+        requesting_user_id: str,
+        granularity: str,
+        group_by: list[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        user_id: Optional[str],
+        operation: Optional[str],
+        target: Optional[str],
+        status: Optional[str],
+    ) -> list[Dict[str, Any]]:
+        """JSON ログを走査して集計（索引ストア無効時）"""
+        if granularity not in ROLLUP_GRANULARITIES:
+            raise ValueError(f"Invalid granularity: {granularity}")
+        invalid = [d for d in group_by if d not in ROLLUP_DIMENSIONS]
+        if invalid:
+            raise ValueError(f"Invalid group_by: {', '.join(invalid)}")
+
+        length = ROLLUP_GRANULARITIES[granularity]
+        # 集計ストアと同じくバケット境界に丸める
+        start = (
+            start_date.replace(minute=0, second=0, microsecond=0)
+            if start_date
+            else None
+        )
+        if start and granularity == "day":
+            start = start.replace(hour=0)
+
+        counts: Dict[tuple, int] = {}
+        # RBAC は呼び出し元で user_id に反映済み
+        entries = self.iter_query(
+            "Admin",
+            requesting_user_id,
+            start_date=start,
+            user_id=user_id,
+            operation=operation,
+            status=status,
+        )
+        for entry, _ in entries:
+            bucket = entry["timestamp"][:length]
+            if end_date and bucket > end_date.isoformat()[:length]:
+                continue
+            if target and entry.get("target") != target:
+                continue
+            key = (bucket, *(entry.get(d) for d in group_by))
+            counts[key] = counts.get(key, 0) + 1
+
+        return [
+            {"bucket": key[0], **dict(zip(group_by, key[1:])), "count": count}
+            for key, count in sorted(counts.items())
+        ]
+
+    def _plan_files(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        operation: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> list[Path]:
+        """
+        検索対象の日別セグメントを絞り込む（古い順）
+
+        セグメントは audit_YYYYMMDD.json のパスで表す（圧縮済みの場合はファイル自体は
+        存在せず、audit_YYYYMMDD.json.blk がある）。
+
+        ファイル名の日付より前のレコードは含まれないため、end_date より後の日付の
+        セグメントはファイル名だけで除外できる。それ以外はサマリ（非圧縮はサイドカー、
+        圧縮済みはアーカイブの索引）のタイムスタンプ範囲・ユーザー・操作種別・
+        ステータスで判定する。
+        """
+        candidates = []
+        for segment in self._segments():
+            day = file_date(segment)
+            if end_date and day and day > end_date.date():
+                continue
+
+            try:
+                summaries = self._segment_summaries(segment)
+            except (OSError, AuditArchiveError) as e:
+                logger.error(f"Failed to summarize audit log {segment}: {e}")
+                candidates.append(segment)
+                continue
+
+            if any(
+                may_match(summary, start_date, end_date, user_id, operation, status)
+                for summary in summaries
+            ):
+                candidates.append(segment)
+
+        return candidates
+
+    def _segments(self) -> list[Path]:
+        """全ての日別セグメント（古い順、圧縮済みを含む）"""
+        names = {path.name for path in self.log_dir.glob("audit_*.json")}
+        names.update(
+            segment_name(path)
+            for path in self.log_dir.glob(f"audit_*.json{ARCHIVE_SUFFIX}")
+        )
+        return [self.log_dir / name for name in sorted(names)]
+
+    @staticmethod
+    def _segment_size(segment: Path) -> int:
+        """セグメントの非圧縮換算のサイズ（アーカイブと、その後に追記された分の合計）"""
+        size = 0
+        archive = archive_path(segment)
+        if archive.exists():
+            size += read_index(archive)["raw_size"]
+        if segment.exists():
+            size += segment.stat().st_size
+        return size
+
+    @staticmethod
+    def _segment_summaries(segment: Path) -> list[Dict[str, Any]]:
+        """セグメントのサマリ（アーカイブと非圧縮ファイルの両方がある場合は2つ）"""
+        summaries = []
+        archive = archive_path(segment)
+        if archive.exists():
+            summaries.append(read_index(archive)["summary"])
+        if segment.exists():
+            summaries.append(load_summary(segment))
+        return summaries
+
+    @staticmethod
+    def _segment_lines(
+        segment: Path,
+        order: str,
+        offset: Optional[int],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> Iterator[tuple[int, bytes]]:
+        """
+        セグメントの行を読む（圧縮済みかどうかを意識せずに扱う）
+
+        アーカイブ封印後に非圧縮ファイルへ遅れて書き込まれた場合は、アーカイブの後ろに
+        続くものとして扱う（次回の圧縮で同じ並びに統合されるため、オフセットは変わらない）。
+
+        Yields:
+            asc: (行末の次のオフセット, 行) / desc: (行頭のオフセット, 行)
+        """
+        archive = archive_path(segment)
+        has_archive = archive.exists()
+        base = read_index(archive)["raw_size"] if has_archive else 0
+
+        if order == "desc":
+            if segment.exists() and (offset is None or offset > base):
+                end = None if offset is None else offset - base
+                for position, line in _read_lines_reverse(segment, end=end):
+                    yield position + base, line
+            if has_archive:
+                yield from archive_read_lines_reverse(
+                    archive,
+                    end=None if offset is None else min(offset, base),
+                    start_date=start_date,
+                    end_date=end_date,
+                )
+        else:
+            start = offset or 0
+            if has_archive and start < base:
+                yield from archive_read_lines(
+                    archive, start=start, start_date=start_date, end_date=end_date
+                )
+            if segment.exists():
+                for position, line in _read_lines(segment, start=max(start - base, 0)):
+                    yield position + base, line
+
+    def compress_sealed_segments(
+        self, grace_seconds: Optional[int] = None
+    ) -> list[Path]:
+        """
+        書き込みが終わった日別ファイルをアーカイブに圧縮
+
+        今日より前の日付で、最終更新から grace_seconds 以上経過したファイルが対象。
+        複数ワーカーが同時に実行しても、ロックを取れたプロセスだけが圧縮する。
+
+        Args:
+            grace_seconds: 日付が変わった後に遅れて届く書き込みを待つ時間（秒）
+
+        Returns:
+            作成したアーカイブのパス
+        """
+        if grace_seconds is None:
+            grace_seconds = settings.audit.archive_grace_seconds
+
+        today = datetime.now().date()
+        now = time.time()
+        archived: List[Path] = []
+
+        with open(self.log_dir / ".archive.lock", "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.debug("Audit log archiving is running in another process")
+                return archived
+
+            for log_file in sorted(self.log_dir.glob("audit_*.json")):
+                day = file_date(log_file)
+                if day is None or day >= today:
+                    continue
+                try:
+                    if now - log_file.stat().st_mtime < grace_seconds:
+                        continue
+                    archived.append(write_archive(log_file))
+                except (OSError, AuditArchiveError) as e:
+                    logger.error(f"Failed to archive audit log {log_file}: {e}")
+
+        return archived
+
+    def start_archiver(self, interval: Optional[int] = None) -> None:
+        """定期的に compress_sealed_segments() を実行するスレッドを起動"""
+        if self._archiver is not None and self._archiver.is_alive():
+            return
+
+        interval = interval or settings.audit.archive_interval
+        self._archiver_stop = threading.Event()
+
+        def run(stop: threading.Event) -> None:
+            while not stop.is_set():
+                try:
+                    self.compress_sealed_segments()
+                except Exception as e:
+                    logger.error(f"Audit log archiver failed: {e}")
+                stop.wait(interval)
+
+        self._archiver = threading.Thread(
+            target=run,
+            args=(self._archiver_stop,),
+            name="audit-log-archiver",
+            daemon=True,
+        )
+        self._archiver.start()
+
+    def stop_archiver(self) -> None:
+        """アーカイブスレッドを停止（圧縮中の場合は完了を待つ）"""
+        if self._archiver is None:
+            return
+        self._archiver_stop.set()
+        self._archiver.join()
+        self._archiver = None
+
+    def iter_query(
+        self,
+        user_role: str,
+        requesting_user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        operation: Optional[str] = None,
+        status: Optional[str] = None,
+        order: str = "asc",
+        cursor: Optional[str] = None,
+    ) -> Iterator[tuple[Dict[str, Any], str]]:
+        """
+        監査ログを検索し、一致したエントリを順に返す（RBAC適用）
+
+        件数の上限はなく、読み進めた分だけファイルを読む（メモリ使用量は一定）。
+        各エントリと一緒に返すカーソルを次回の cursor に渡すと、その続きから検索する。
 
         Args:
             user_role: リクエストユーザーのロール（Admin/Operator/Approver/Viewer）
@@ -101,59 +1155,163 @@ class AuditLog:
             user_id: ユーザーID（フィルタ）
             operation: 操作種別（フィルタ）
             status: ステータス（フィルタ）
-            limit: 最大取得件数
+            order: asc（古い順）/ desc（新しい順。新しいファイルから末尾を逆方向に読む）
+            cursor: 前回の検索で返されたカーソル
 
         Returns:
-            監査ログエントリのリスト
+            (監査ログエントリ, そのエントリの次から再開するカーソル) のイテレータ
 
         Raises:
             PermissionError: Viewerロールの場合（監査ログアクセス不可）
+            ValueError: order・cursor が不正な場合
+            AuditLogReadError: 読み進めたファイルが読めない・壊れている場合（反復中に送出）
         """
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Invalid order: {order}")
+
         # RBAC: Viewerは監査ログにアクセス不可
         if user_role == "Viewer":
             raise PermissionError("Viewer role cannot access audit logs")
 
-        results = []
+        resume = decode_cursor(cursor, order) if cursor else None
+
+        # バッファ中のレコードも検索対象にする
+        self.flush()
+
+        # RBAC: Operator/Approverは自分のログのみ（ファイルの絞り込みにも使う）
+        owner = requesting_user_id if user_role in ["Operator", "Approver"] else None
+        if owner and user_id and user_id != owner:
+            return iter(())
+
+        # 一致し得るログファイルのみ走査
+        log_files = self._plan_files(
+            start_date, end_date, user_id or owner, operation, status
+        )
+        if order == "desc":
+            log_files.reverse()
+
+        if resume:
+            resume_file, _ = resume
+            if order == "desc":
+                log_files = [f for f in log_files if f.name <= resume_file]
+            else:
+                log_files = [f for f in log_files if f.name >= resume_file]
+
+        return self._iter_entries(
+            log_files,
+            owner,
+            start_date,
+            end_date,
+            user_id,
+            operation,
+            status,
+            order,
+            resume,
+        )
+
+    def _iter_entries(
+        self,
+        log_files: list[Path],
+        owner: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        user_id: Optional[str],
+        operation: Optional[str],
+        status: Optional[str],
+        order: str,
+        resume: Optional[tuple[str, int]],
+    ) -> Iterator[tuple[Dict[str, Any], str]]:
+        """iter_query() の本体（ファイルを順に読み、フィルタに一致したエントリを返す）"""
+        for log_file in log_files:
+            offset = resume[1] if resume and resume[0] == log_file.name else None
+            lines = self._segment_lines(log_file, order, offset, start_date, end_date)
 
-        # 全ログファイルを走査
-        for log_file in sorted(self.log_dir.glob("audit_*.json")):
             try:
-                with open(log_file, "r", encoding="utf-8") as f:
-                    for line in f:
-                        entry = json.loads(line.strip())
+                for position, line in lines:
+                    entry = json.loads(line)
 
-                        # RBAC: Operator/Approverは自分のログのみ閲覧可能
-                        if user_role in ["Operator", "Approver"]:
-                            if entry.get("user_id") != requesting_user_id:
-                                continue
+                    # RBAC: Operator/Approverは自分のログのみ閲覧可能
+                    # （Admin は全てのログを閲覧可能）
+                    if owner and entry.get("user_id") != owner:
+                        continue
 
-                        # Admin は全てのログを閲覧可能（RBACフィルタなし）
+                    # フィルタ適用
+                    if user_id and entry.get("user_id") != user_id:
+                        continue
+                    if operation and entry.get("operation") != operation:
+                        continue
+                    if status and entry.get("status") != status:
+                        continue
 
-                        # フィルタ適用
-                        if user_id and entry.get("user_id") != user_id:
-                            continue
-                        if operation and entry.get("operation") != operation:
-                            continue
-                        if status and entry.get("status") != status:
-                            continue
+                    entry_time = datetime.fromisoformat(entry["timestamp"])
+                    if start_date and entry_time < start_date:
+                        continue
+                    if end_date and entry_time > end_date:
+                        continue
 
-                        entry_time = datetime.fromisoformat(entry["timestamp"])
-                        if start_date and entry_time < start_date:
-                            continue
-                        if end_date and entry_time > end_date:
-                            continue
+                    yield entry, encode_cursor(log_file.name, position, order)
 
-                        results.append(entry)
+            except (OSError, ValueError, KeyError, AuditArchiveError) as e:
+                # 読めないファイルを飛ばすと欠けた結果を返してしまうため、呼び出し側へ伝える
+                raise AuditLogReadError(
+                    f"Failed to read audit log {log_file}: {e}"
+                ) from e
 
-                        if len(results) >= limit:
-                            return results
+    def query(
+        self,
+        user_role: str,
+        requesting_user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        operation: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        order: str = "asc",
+    ) -> list[Dict[str, Any]]:
+        """
+        監査ログを検索（RBAC適用）
+
+        Args:
+            user_role: リクエストユーザーのロール（Admin/Operator/Approver/Viewer）
+            requesting_user_id: リクエストユーザーのID
+            start_date: 開始日時
+            end_date: 終了日時
+            user_id: ユーザーID（フィルタ）
+            operation: 操作種別（フィルタ）
+            status: ステータス（フィルタ）
+            limit: 最大取得件数
+            order: asc（古い順）/ desc（新しい順）
+
+        Returns:
+            監査ログエントリのリスト
+
+        Raises:
+            PermissionError: Viewerロールの場合（監査ログアクセス不可）
+            ValueError: order が不正な場合
+            AuditLogReadError: ファイルが読めない・壊れている場合
+        """
+        entries = self.iter_query(
+            user_role,
+            requesting_user_id,
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id,
+            operation=operation,
+            status=status,
+            order=order,
+        )
+        return [entry for entry, _ in itertools.islice(entries, limit)]
+
+
+# グローバルインスタンス（最初の使用時に生成。import 時にはディレクトリ・索引を作らない）
+audit_log = LazyObject(AuditLog)
 
-            except Exception as e:
-                logger.error(f"Failed to read audit log {log_file}: {e}")
-                continue
 
-        return results
+def _reset_after_fork() -> None:
+    if audit_log.lazy_initialized:
+        audit_log.reset_after_fork()
 
 
-# グローバルインスタンス
-audit_log = AuditLog()
+# gunicorn --preload などで fork された場合、ワーカー毎に別の writer として記録する
+os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,486 @@
+"""
+監査ログ索引ストア
+
+JSON 監査ログ（正本）と並行して SQLite（WAL モード）に記録し、
+timestamp / user_id / operation / status の索引で検索する。
+日次・時間別の件数集計（audit_rollups）も登録時に更新する。
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+import aiosqlite
+
+from .audit_archive import archive_path, read_raw_lines, segment_name
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_events (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    target TEXT NOT NULL,
+    status TEXT NOT NULL,
+    details TEXT NOT NULL,
+    writer TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    UNIQUE (writer, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_audit_timestamp ON audit_events (timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_user ON audit_events (user_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_operation ON audit_events (operation, timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_status ON audit_events (status, timestamp);
+
+CREATE TABLE IF NOT EXISTS audit_rollups (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    target TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (granularity, bucket, operation, target, user_id, status)
+) WITHOUT ROWID;
+"""
+
+# 集計（日次・時間別）はレコード登録時にトリガーで加算する。
+# INSERT OR IGNORE で無視された重複レコードではトリガーは発火しない。
+ROLLUP_GRANULARITIES = {"day": 10, "hour": 13}
+
+ROLLUP_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS trg_audit_rollup AFTER INSERT ON audit_events
+BEGIN
+{statements}
+END;
+"""
+
+ROLLUP_UPSERT = """
+    INSERT INTO audit_rollups
+        (granularity, bucket, operation, target, user_id, status, count)
+    VALUES ('{granularity}', substr(NEW.timestamp, 1, {length}),
+            NEW.operation, NEW.target, NEW.user_id, NEW.status, 1)
+    ON CONFLICT (granularity, bucket, operation, target, user_id, status)
+    DO UPDATE SET count = count + 1;
+"""
+
+ROLLUP_REBUILD = """
+INSERT INTO audit_rollups (granularity, bucket, operation, target, user_id, status, count)
+SELECT '{granularity}', substr(timestamp, 1, {length}), operation, target, user_id, status,
+       COUNT(*)
+FROM audit_events
+GROUP BY 2, 3, 4, 5, 6
+"""
+
+# 集計結果のグループ化に使える列
+ROLLUP_DIMENSIONS = ("operation", "target", "user_id", "status")
+
+COLUMNS = (
+    "timestamp",
+    "operation",
+    "user_id",
+    "target",
+    "status",
+    "details",
+    "writer",
+    "seq",
+)
+
+# 複数ワーカーからの同時書き込み時にロック解放を待つ時間（ミリ秒）
+BUSY_TIMEOUT_MS = 5000
+
+
+def _row(entry: Dict[str, Any]) -> tuple:
+    """監査ログエントリを INSERT 用のタプルに変換"""
+    return (
+        entry["timestamp"],
+        entry["operation"],
+        entry["user_id"],
+        entry["target"],
+        entry["status"],
+        json.dumps(entry.get("details") or {}, ensure_ascii=False),
+        entry["writer"],
+        entry["seq"],
+    )
+
+
+def _bucket(value: datetime, granularity: str) -> str:
+    """日時を集計バケット（YYYY-MM-DD / YYYY-MM-DDTHH）に変換"""
+    return value.isoformat()[: ROLLUP_GRANULARITIES[granularity]]
+
+
+def _entry(row: aiosqlite.Row) -> Dict[str, Any]:
+    """検索結果の行を監査ログエントリ（JSON ログと同じ形式）に変換"""
+    entry = dict(row)
+    entry.pop("id", None)
+    entry["details"] = json.loads(entry["details"])
+    return entry
+
+
+def encode_cursor(timestamp: str, row_id: int, order: str) -> str:
+    """索引ストアの検索の続き（最後に返した行の位置）を表す不透明なカーソルを生成"""
+    raw = json.dumps({"ts": timestamp, "id": row_id, "order": order})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str) -> tuple[str, int]:
+    """
+    カーソルを (timestamp, id) に戻す
+
+    Raises:
+        ValueError: カーソルが不正な場合（別の並び順で発行されたものを含む）
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        timestamp, row_id, cursor_order = data["ts"], data["id"], data["order"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if (
+        not isinstance(timestamp, str)
+        or not isinstance(row_id, int)
+        or isinstance(row_id, bool)
+        or cursor_order != order
+    ):
+        raise ValueError("Invalid cursor")
+    return timestamp, row_id
+
+
+def _segment_raw_lines(segment: Path) -> Iterator[bytes]:
+    """セグメントの全行（アーカイブ、続けて非圧縮ファイル）"""
+    archive = archive_path(segment)
+    if archive.exists():
+        yield from read_raw_lines(archive)
+    if segment.exists():
+        with open(segment, "rb") as f:
+            yield from f
+
+
+class AuditStore:
+    """
+    SQLite 監査ログストア
+
+    書き込みは同期（監査ログの書き込みスレッドから呼ぶ）、検索は aiosqlite による非同期。
+    (writer, seq) の一意制約により、同じレコードの重複登録は無視される。
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        初期化
+
+        Args:
+            db_path: SQLite データベースファイルのパス
+        """
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """書き込み用接続を遅延生成（初回はスキーマを作成）"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(SCHEMA)
+            self._ensure_rollups(conn)
+            self._conn = conn
+        return self._conn
+
+    def _ensure_rollups(self, conn: sqlite3.Connection) -> None:
+        """集計トリガーを作成（導入前のレコードがあれば集計を作り直す）"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_audit_rollup'"
+        ).fetchone()
+        if exists:
+            return
+
+        with conn:
+            conn.execute("DELETE FROM audit_rollups")
+            for granularity, length in ROLLUP_GRANULARITIES.items():
+                conn.execute(
+                    ROLLUP_REBUILD.format(granularity=granularity, length=length)
+                )
+            statements = "".join(
+                ROLLUP_UPSERT.format(granularity=granularity, length=length)
+                for granularity, length in ROLLUP_GRANULARITIES.items()
+            )
+            conn.execute(ROLLUP_TRIGGER.format(statements=statements))
+
+    def insert_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        監査ログエントリを1トランザクションで登録
+
+        Args:
+            entries: 監査ログエントリ（writer / seq を含むこと）
+
+        Returns:
+            新たに登録した件数
+        """
+        rows = [_row(entry) for entry in entries]
+        if not rows:
+            return 0
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                # rowcount は集計トリガーによる変更を含まない
+                cursor = conn.executemany(
+                    f"INSERT OR IGNORE INTO audit_events ({', '.join(COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                    rows,
+                )
+                return cursor.rowcount
+
+    def import_file(self, path: Path, batch_size: int = 1000) -> int:
+        """
+        既存の JSON 監査ログ（日別のセグメント）を取り込む
+
+        圧縮済みのセグメントはアーカイブ（.json.blk）から読み、封印後に遅れて書き込まれた
+        非圧縮ファイルがあればその後ろに続けて読む。
+        writer / seq を持たない旧形式のレコードは「import:<ファイル名>」とセグメント内の
+        行番号を割り当てるため、同じセグメントを再度取り込んでも（圧縮の前後でも）重複しない。
+
+        Args:
+            path: audit_YYYYMMDD.json または audit_YYYYMMDD.json.blk のパス
+            batch_size: 1トランザクションあたりの件数
+
+        Returns:
+            新たに登録した件数
+        """
+        segment = Path(path).with_name(segment_name(Path(path)))
+        imported = 0
+        batch: list[Dict[str, Any]] = []
+
+        for line_no, line in enumerate(_segment_raw_lines(segment), start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(
+                    f"Skipping malformed audit log line: {segment}:{line_no}"
+                )
+                continue
+
+            if "writer" not in entry or "seq" not in entry:
+                entry["writer"] = f"import:{segment.name}"
+                entry["seq"] = line_no
+            batch.append(entry)
+
+            if len(batch) >= batch_size:
+                imported += self.insert_many(batch)
+                batch = []
+
+        imported += self.insert_many(batch)
+        return imported
+
+    def reset(self) -> None:
+        """fork 後の子プロセスで接続を破棄（親の接続は閉じずに手放す）"""
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        """書き込み用接続を閉じる"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _ensure_schema(self) -> None:
+        """書き込み用接続でスキーマ・集計トリガーを確定させる（初回は集計の作り直しを含む）"""
+        with self._lock:
+            self._connect()
+
+    async def query(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        operation: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        order: str = "asc",
+    ) -> list[Dict[str, Any]]:
+        """
+        索引を使って監査ログを検索
+
+        Args:
+            start_date: 開始日時
+            end_date: 終了日時
+            user_id: ユーザーID
+            operation: 操作種別
+            status: ステータス
+            limit: 最大取得件数
+            order: asc（古い順）/ desc（新しい順）
+
+        Returns:
+            監査ログエントリのリスト
+        """
+        entries, _ = await self.query_page(
+            start_date=start_date,
+            end_date=end_date,
+            user_id=user_id,
+            operation=operation,
+            status=status,
+            limit=limit,
+            order=order,
+        )
+        return entries
+
+    async def query_page(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        operation: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 100,
+        order: str = "asc",
+        cursor: Optional[str] = None,
+    ) -> tuple[list[Dict[str, Any]], Optional[str]]:
+        """
+        索引を使って監査ログを1ページ分検索（(timestamp, id) によるカーソルページング）
+
+        引数は query() と同じ。cursor には前回の戻り値の次カーソルを渡す。
+
+        Returns:
+            (監査ログエントリのリスト, 続きがある場合の次カーソル)
+
+        Raises:
+            ValueError: cursor が不正な場合
+        """
+        conditions = []
+        params: list[Any] = []
+
+        if cursor:
+            timestamp, row_id = decode_cursor(cursor, order)
+            op = "<" if order == "desc" else ">"
+            conditions.append(f"(timestamp {op} ? OR (timestamp = ? AND id {op} ?))")
+            params.extend([timestamp, timestamp, row_id])
+
+        if start_date:
+            conditions.append("timestamp >= ?")
+            params.append(start_date.isoformat())
+        if end_date:
+            conditions.append("timestamp <= ?")
+            params.append(end_date.isoformat())
+        if user_id:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if operation:
+            conditions.append("operation = ?")
+            params.append(operation)
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+
+        direction = "DESC" if order == "desc" else "ASC"
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (
+            f"SELECT id, {', '.join(COLUMNS)} FROM audit_events {where} "
+            f"ORDER BY timestamp {direction}, id {direction} LIMIT ?"
+        )
+        # 続きの有無を判定するため1件多く取得
+        params.append(limit + 1)
+
+        if not self.db_path.exists():
+            return [], None
+
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            db.row_factory = aiosqlite.Row
+            async with db.execute(sql, params) as rows:
+                page = [row async for row in rows]
+
+        next_cursor = None
+        if len(page) > limit:
+            page = page[:limit]
+            last = page[-1]
+            next_cursor = encode_cursor(last["timestamp"], last["id"], order)
+        return [_entry(row) for row in page], next_cursor
+
+    async def stats(
+        self,
+        granularity: str = "day",
+        group_by: Iterable[str] = ("operation",),
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        user_id: Optional[str] = None,
+        operation: Optional[str] = None,
+        target: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> list[Dict[str, Any]]:
+        """
+        集計テーブルから件数を取得（バケット単位のため、期間はバケット境界に丸める）
+
+        Args:
+            granularity: day / hour
+            group_by: バケットに加えてグループ化する列（ROLLUP_DIMENSIONS のいずれか）
+            start_date: 開始日時
+            end_date: 終了日時
+            user_id: ユーザーID
+            operation: 操作種別
+            target: 操作対象
+            status: ステータス
+
+        Returns:
+            [{"bucket": ..., <group_by の列>: ..., "count": ...}, ...]（bucket 昇順）
+
+        Raises:
+            ValueError: granularity・group_by が不正な場合
+        """
+        if granularity not in ROLLUP_GRANULARITIES:
+            raise ValueError(f"Invalid granularity: {granularity}")
+        dimensions = list(group_by)
+        invalid = [d for d in dimensions if d not in ROLLUP_DIMENSIONS]
+        if invalid:
+            raise ValueError(f"Invalid group_by: {', '.join(invalid)}")
+
+        conditions = ["granularity = ?"]
+        params: list[Any] = [granularity]
+
+        if start_date:
+            conditions.append("bucket >= ?")
+            params.append(_bucket(start_date, granularity))
+        if end_date:
+            conditions.append("bucket <= ?")
+            params.append(_bucket(end_date, granularity))
+        for column, value in (
+            ("user_id", user_id),
+            ("operation", operation),
+            ("target", target),
+            ("status", status),
+        ):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        columns = ", ".join(["bucket", *dimensions])
+        sql = (
+            f"SELECT {columns}, SUM(count) AS count FROM audit_rollups "
+            f"WHERE {' AND '.join(conditions)} GROUP BY {columns} ORDER BY {columns}"
+        )
+
+        if not self.db_path.exists():
+            return []
+
+        # 集計トリガーが未作成の既存 DB に対応するため、書き込み用接続でスキーマを確定させる
+        # （初回は集計を作り直すため、イベントループの外で行う）
+        await asyncio.to_thread(self._ensure_schema)
+
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            db.row_factory = aiosqlite.Row
+            async with db.execute(sql, params) as cursor:
+                return [dict(row) async for row in cursor]
@@ -0,0 +1,168 @@
+"""
+監査ログファイルのサマリ（サイドカー）
+
+audit_YYYYMMDD.json 毎に audit_YYYYMMDD.json.summary を置き、
+最小/最大タイムスタンプとユーザー・操作種別・ステータス毎の件数を保持する。
+検索時にサマリで一致し得ないと判断できるファイルは開かない。
+
+サマリは検索時に遅延生成し、ファイルが伸びていれば前回の末尾から差分だけ読んで更新する。
+"""
+
+import json
+import logging
+import os
+import re
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_SUFFIX = ".summary"
+SUMMARY_VERSION = 1
+
+_FILE_DATE_PATTERN = re.compile(r"^audit_(\d{8})\.json$")
+
+
+def file_date(log_file: Path) -> Optional[date]:
+    """ファイル名（audit_YYYYMMDD.json）から日付を取得"""
+    match = _FILE_DATE_PATTERN.match(log_file.name)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%Y%m%d").date()
+    except ValueError:
+        return None
+
+
+def summary_path(log_file: Path) -> Path:
+    return log_file.with_name(log_file.name + SUMMARY_SUFFIX)
+
+
+def new_summary() -> Dict[str, Any]:
+    """空のサマリ"""
+    return {
+        "version": SUMMARY_VERSION,
+        "size": 0,
+        "records": 0,
+        "min_timestamp": None,
+        "max_timestamp": None,
+        "users": {},
+        "operations": {},
+        "statuses": {},
+    }
+
+
+def _read_summary(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if summary.get("version") != SUMMARY_VERSION:
+        return None
+    return summary
+
+
+def add_entry(summary: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """サマリに1レコードを加える"""
+    timestamp = entry["timestamp"]
+    for key, field in (
+        ("users", "user_id"),
+        ("operations", "operation"),
+        ("statuses", "status"),
+    ):
+        counts = summary[key]
+        value = entry.get(field)
+        counts[value] = counts.get(value, 0) + 1
+
+    summary["records"] += 1
+    if summary["min_timestamp"] is None or timestamp < summary["min_timestamp"]:
+        summary["min_timestamp"] = timestamp
+    if summary["max_timestamp"] is None or timestamp > summary["max_timestamp"]:
+        summary["max_timestamp"] = timestamp
+
+
+def _write_summary(path: Path, summary: Dict[str, Any]) -> None:
+    """一時ファイル経由で置き換え（複数のワーカー・スレッドが同時に更新しても壊れない）"""
+    tmp_path: Optional[Path] = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=path.parent,
+            prefix=f"{path.name}.",
+            suffix=".tmp",
+            delete=False,
+        ) as f:
+            tmp_path = Path(f.name)
+            json.dump(summary, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to write audit log summary {path}: {e}")
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+
+def load_summary(log_file: Path) -> Dict[str, Any]:
+    """
+    ログファイルのサマリを取得（必要なら差分を読んで更新）
+
+    Args:
+        log_file: 監査ログファイル
+
+    Returns:
+        サマリ（size はサマリに反映済みのバイト数）
+    """
+    path = summary_path(log_file)
+    summary = _read_summary(path) or new_summary()
+    size = log_file.stat().st_size
+
+    if summary["size"] == size:
+        return summary
+    if summary["size"] > size:
+        # ファイルが切り詰められた・置き換えられた場合は作り直す
+        summary = new_summary()
+
+    # 差分は1行ずつ読む（未集計の末尾が大きくてもまとめてメモリに載せない）
+    remaining = size - summary["size"]
+    with open(log_file, "rb") as f:
+        f.seek(summary["size"])
+        for raw in f:
+            # stat 以降に追記された分と、書き込み途中の行は含めない
+            if len(raw) > remaining or not raw.endswith(b"\n"):
+                break
+            remaining -= len(raw)
+            summary["size"] += len(raw)
+            try:
+                add_entry(summary, json.loads(raw))
+            except (ValueError, KeyError):
+                continue
+
+    _write_summary(path, summary)
+    return summary
+
+
+def may_match(
+    summary: Dict[str, Any],
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    user_id: Optional[str] = None,
+    operation: Optional[str] = None,
+    status: Optional[str] = None,
+) -> bool:
+    """サマリから、条件に一致するレコードが存在し得るかを判定"""
+    if summary["records"] == 0:
+        return False
+    if start_date and datetime.fromisoformat(summary["max_timestamp"]) < start_date:
+        return False
+    if end_date and datetime.fromisoformat(summary["min_timestamp"]) > end_date:
+        return False
+    if user_id and user_id not in summary["users"]:
+        return False
+    if operation and operation not in summary["operations"]:
+        return False
+    if status and status not in summary["statuses"]:
+        return False
+    return True
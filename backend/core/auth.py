@@ -4,22 +4,58 @@
 JWT ベースの認証と、ユーザーロールベースの認可を実装
 """
 
+import asyncio
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional
 
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from pydantic import BaseModel
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from pydantic import BaseModel, ConfigDict
 
 from .config import settings
+from .lazy import LazyObject
+from .metrics import metrics
+from .session_store import session_store
+from .user_store import UserStore
 
 logger = logging.getLogger(__name__)
 
+
+def _create_pwd_context():
+    # passlib / bcrypt はログイン時まで読み込まない（ワーカーの起動を速くする）
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 # パスワードハッシュ化
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = LazyObject(_create_pwd_context)
+
+
+def _create_password_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=settings.security.password_hash_workers,
+        thread_name_prefix="password-hash",
+    )
+
+
+# bcrypt 専用のスレッドプール（ログインが集中しても他のリクエストの処理を妨げない）
+_password_executor = LazyObject(_create_password_executor)
+
+
+def _create_user_store() -> UserStore:
+    return UserStore(settings.database.path)
+
+
+# 本番環境のユーザーストア（設定は最初の使用時に読む）
+user_store = LazyObject(_create_user_store)
 
 # JWT Bearer トークン
 security = HTTPBearer()
@@ -49,11 +85,17 @@ class User(BaseModel):
 
 
 class TokenData(BaseModel):
-    """JWT トークンデータ"""
+    """JWT トークンデータ（検証キャッシュで共有するため不変）"""
+
+    model_config = ConfigDict(frozen=True)
 
     user_id: str
     username: str
     role: str
+    # 権限ビットマスク（None の場合はロールから求める）
+    permission_mask: Optional[int] = None
+    # セッションID（sid クレーム。ない場合は失効・無操作タイムアウトの対象外）
+    session_id: Optional[str] = None
 
 
 # ===================================================================
@@ -67,7 +109,13 @@ ROLES = {
     ),
     "Operator": UserRole(
         name="Operator",
-        permissions=["read:status", "read:logs", "read:processes", "execute:service_restart"],
+        permissions=[
+            "read:status",
+            "read:logs",
+            "read:processes",
+            "read:audit",
+            "execute:service_restart",
+        ],
     ),
     "Approver": UserRole(
         name="Approver",
@@ -75,6 +123,7 @@ ROLES = {
             "read:status",
             "read:logs",
             "read:processes",
+            "read:audit",
             "execute:service_restart",
             "approve:dangerous_operation",
         ],
@@ -85,14 +134,65 @@ ROLES = {
             "read:status",
             "read:logs",
             "read:processes",
+            "read:audit",
             "execute:service_restart",
             "approve:dangerous_operation",
             "manage:users",
             "manage:settings",
+            "verify:audit",
         ],
     ),
 }
 
+# ===================================================================
+# 権限ビットマスク
+# ===================================================================
+
+# 権限とビット位置の対応（トークンの perm クレームに使用するため、追加は末尾のみ）
+PERMISSIONS: tuple[str, ...] = (
+    "read:status",
+    "read:logs",
+    "read:processes",
+    "read:audit",
+    "execute:service_restart",
+    "approve:dangerous_operation",
+    "manage:users",
+    "manage:settings",
+    "verify:audit",
+)
+
+PERMISSION_BITS: Mapping[str, int] = MappingProxyType(
+    {permission: 1 << bit for bit, permission in enumerate(PERMISSIONS)}
+)
+
+
+def permission_mask(permissions: Iterable[str]) -> int:
+    """
+    権限名の一覧をビットマスクに変換
+
+    Raises:
+        ValueError: 未定義の権限が含まれる場合
+    """
+    mask = 0
+    for permission in permissions:
+        bit = PERMISSION_BITS.get(permission)
+        if bit is None:
+            raise ValueError(f"Unknown permission: {permission}")
+        mask |= bit
+    return mask
+
+
+def permission_names(mask: int) -> list[str]:
+    """ビットマスクを権限名の一覧に変換"""
+    return [permission for permission, bit in PERMISSION_BITS.items() if mask & bit]
+
+
+# ロール毎の権限ビットマスク（起動時に確定）
+ROLE_MASKS: Mapping[str, int] = MappingProxyType(
+    {name: permission_mask(role.permissions) for name, role in ROLES.items()}
+)
+
+
 # ===================================================================
 # デモユーザー（開発環境のみ）
 # ===================================================================
@@ -149,6 +249,31 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """パスワード検証（専用スレッドプールで実行）"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor, verify_password, plain_password, hashed_password
+    )
+
+
+async def get_password_hash_async(password: str) -> str:
+    """パスワードハッシュ化（専用スレッドプールで実行）"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, get_password_hash, password)
+
+
+# 存在しないユーザーでも同じ時間をかけて検証するためのハッシュ（初回使用時に生成）
+_dummy_password_hash: Optional[str] = None
+
+
+async def _dummy_hash() -> str:
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = await get_password_hash_async("dummy-password")
+    return _dummy_password_hash
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     JWT アクセストークンを生成
@@ -160,6 +285,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         JWT トークン文字列
     """
+    from jose import jwt
+
     to_encode = data.copy()
 
     if expires_delta:
@@ -176,7 +303,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-def authenticate_user(email: str, password: str) -> Optional[User]:
+async def authenticate_user(email: str, password: str) -> Optional[User]:
     """
     ユーザー認証
 
@@ -212,11 +339,111 @@ def authenticate_user(email: str, password: str) -> Optional[User]:
         logger.info(f"Authentication successful (DEV mode): {email}")
         return user
 
-    else:
-        # 本番環境: bcrypt 使用（TODO: データベースから取得）
-        logger.error("Production authentication not implemented yet")
+    # 本番環境: ユーザーストア + bcrypt（専用スレッドプールで検証）
+    record = await user_store.get_by_email(email)
+
+    if not record:
+        # ユーザーの存在がレスポンス時間から分からないよう、同じコストの検証を行う
+        await verify_password_async(password, await _dummy_hash())
+        logger.warning(f"Authentication failed: user not found - {email}")
         return None
 
+    if not await verify_password_async(password, record["hashed_password"]):
+        logger.warning(f"Authentication failed: invalid password - {email}")
+        return None
+
+    user = User(**record)
+    if user.disabled:
+        logger.warning(f"Authentication failed: user disabled - {email}")
+        return None
+
+    logger.info(f"Authentication successful: {email}")
+    return user
+
+
+# ===================================================================
+# トークン検証キャッシュ
+# ===================================================================
+
+
+class TokenCache:
+    """
+    検証済みトークンの LRU キャッシュ
+
+    同じトークンでの連続したリクエストで署名検証・デコードを省略する。
+    キーはトークンの SHA-256（トークン自体は保持しない）。エントリはトークンの
+    exp まで有効で、exp 以降は必ず再検証（＝期限切れとして拒否）される。
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[TokenData, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[TokenData]:
+        """有効期限内のキャッシュ済み TokenData（なければ None）"""
+        key = self._key(token)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                token_data, expires_at = cached
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return token_data
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, token_data: TokenData, expires_at: float) -> None:
+        if self.maxsize <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (token_data, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """全エントリを破棄（秘密鍵の変更時など）"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """ヒット・ミス数とサイズ"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+def _create_token_cache() -> TokenCache:
+    return TokenCache(settings.security.token_cache_size)
+
+
+token_cache = LazyObject(_create_token_cache)
+
+# cached: キャッシュヒット、valid: 署名検証に成功、expired: 期限切れ、invalid: それ以外
+token_verifications = metrics.counter(
+    "adminui_token_verifications_total", "JWT verifications by result", ("result",)
+)
+# トークン自体は有効だが、セッションが失効・無操作タイムアウトしていた件数
+session_rejections = metrics.counter(
+    "adminui_session_rejections_total",
+    "Valid tokens rejected by session state",
+    ("reason",),
+)
+
 
 # ===================================================================
 # 認可関数
@@ -227,6 +454,8 @@ def decode_token(token: str) -> TokenData:
     """
     JWT トークンをデコード
 
+    検証済みのトークンは exp までキャッシュし、署名検証を省略する。
+
     Args:
         token: JWT トークン文字列
 
@@ -236,6 +465,14 @@ def decode_token(token: str) -> TokenData:
     Raises:
         HTTPException: トークンが無効な場合
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        token_verifications.inc(result="cached")
+        return cached
+
+    # jose（cryptography を含む）は最初の検証時に読み込む
+    from jose import ExpiredSignatureError, JWTError, jwt
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -252,62 +489,121 @@ def decode_token(token: str) -> TokenData:
         role: str = payload.get("role")
 
         if user_id is None or username is None or role is None:
+            token_verifications.inc(result="invalid")
             raise credentials_exception
 
-        return TokenData(user_id=user_id, username=username, role=role)
+        # perm クレームがあればロールの権限の範囲内で絞り込む（ロールの権限を超えない）
+        mask = ROLE_MASKS.get(role, 0)
+        claim = payload.get("perm")
+        if isinstance(claim, int):
+            mask &= claim
+
+        session_id = payload.get("sid")
+        token_data = TokenData(
+            user_id=user_id,
+            username=username,
+            role=role,
+            permission_mask=mask,
+            session_id=session_id if isinstance(session_id, str) else None,
+        )
+
+        # exp のないトークンはキャッシュしない（常に検証する）
+        expires_at = payload.get("exp")
+        if isinstance(expires_at, (int, float)):
+            token_cache.put(token, token_data, float(expires_at))
+
+        token_verifications.inc(result="valid")
+        return token_data
 
     except JWTError as e:
+        expired = isinstance(e, ExpiredSignatureError)
+        token_verifications.inc(result="expired" if expired else "invalid")
         logger.error(f"JWT decode error: {e}")
         raise credentials_exception
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
 ) -> TokenData:
     """
     現在のユーザーを取得（依存性注入用）
 
+    署名検証はキャッシュされるが、セッションの失効・無操作タイムアウトは
+    キャッシュヒット時も毎回判定する。
+
     Args:
+        request: HTTP リクエスト（アクセスログ用にユーザー名を request.state に残す）
         credentials: HTTP Bearer トークン
 
     Returns:
         TokenData オブジェクト
+
+    Raises:
+        HTTPException: トークンが無効、またはセッションが失効している場合
     """
     token = credentials.credentials
-    return decode_token(token)
+    token_data = decode_token(token)
 
+    if token_data.session_id is not None:
+        reason = await session_store.validate(token_data.session_id)
+        if reason is not None:
+            session_rejections.inc(reason=reason)
+            logger.warning(
+                f"Session rejected: user={token_data.username}, reason={reason}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Session expired" if reason == "expired" else "Session revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    request.state.user = token_data.username
+    return token_data
 
-def require_permission(permission: str):
+
+def require_permission(*permissions: str):
     """
     権限チェックのデコレータファクトリ
 
+    必要な権限はビットマスクに変換しておき、リクエスト毎の判定は1回の AND で行う。
+
     Args:
-        permission: 必要な権限（例: "execute:service_restart"）
+        permissions: 必要な権限（例: "execute:service_restart"。複数指定時は全て必要）
 
     Returns:
         依存性注入関数
+
+    Raises:
+        ValueError: 未定義の権限を指定した場合（ルート定義時に検出）
     """
+    if not permissions:
+        raise ValueError("At least one permission is required")
+    required = permission_mask(permissions)
 
     async def check_permission(current_user: TokenData = Depends(get_current_user)):
-        user_role = ROLES.get(current_user.role)
+        mask = current_user.permission_mask
+        if mask is None:
+            mask = ROLE_MASKS.get(current_user.role, 0)
+
+        if mask & required == required:
+            return current_user
 
-        if not user_role:
+        if current_user.role not in ROLE_MASKS:
             logger.error(f"Invalid role: {current_user.role}")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Invalid role: {current_user.role}",
             )
 
-        if permission not in user_role.permissions:
-            logger.warning(
-                f"Permission denied: user={current_user.username}, "
-                f"role={current_user.role}, required={permission}"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Permission denied: {permission} required",
-            )
-
-        return current_user
+        missing = ", ".join(permission_names(required & ~mask))
+        logger.warning(
+            f"Permission denied: user={current_user.username}, "
+            f"role={current_user.role}, required={missing}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Permission denied: {missing} required",
+        )
 
     return check_permission
@@ -0,0 +1,62 @@
+"""
+列指向の応答形式
+
+一覧系のエンドポイントは format=columnar を指定すると、行のリストの代わりに
+列毎の配列とスキーマ（列名・型）を返す。行数が多い場合に項目名の繰り返しがなくなり、
+応答の大きさと JSON のシリアライズ・パースの時間が減る。
+"""
+
+from functools import lru_cache
+from typing import Any, Sequence
+
+from pydantic import BaseModel
+
+# format クエリパラメータの値
+ROWS = "rows"
+COLUMNAR = "columnar"
+FORMAT_PATTERN = f"^({ROWS}|{COLUMNAR})$"
+
+
+class ColumnSchema(BaseModel):
+    """列のスキーマ"""
+
+    name: str
+    type: str
+    nullable: bool = False
+
+
+class ColumnarTable(BaseModel):
+    """列指向の表（fields[i] が columns[i] のスキーマ）"""
+
+    fields: list[ColumnSchema]
+    columns: list[list[Any]]
+
+
+@lru_cache(maxsize=None)
+def column_schema(model: type[BaseModel]) -> tuple[ColumnSchema, ...]:
+    """行モデルの各項目の JSON Schema の型"""
+    properties = model.model_json_schema()["properties"]
+    schema = []
+    for name in model.model_fields:
+        prop = properties[name]
+        types = [option.get("type", "any") for option in prop.get("anyOf", [prop])]
+        nullable = "null" in types
+        types = [t for t in types if t != "null"] or ["any"]
+        schema.append(ColumnSchema(name=name, type=types[0], nullable=nullable))
+    return tuple(schema)
+
+
+def to_columnar(model: type[BaseModel], rows: Sequence[BaseModel]) -> ColumnarTable:
+    """
+    検証済みの行を列指向の表にする
+
+    Args:
+        model: 行のモデル
+        rows: model のインスタンスのリスト
+
+    Returns:
+        列指向の表
+    """
+    fields = column_schema(model)
+    columns = [[getattr(row, field.name) for row in rows] for field in fields]
+    return ColumnarTable.model_construct(fields=list(fields), columns=columns)
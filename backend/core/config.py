@@ -5,13 +5,21 @@
 """
 
 import json
+import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import List, Literal
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+if TYPE_CHECKING:
+    from .file_watcher import FileWatcher
+
+logger = logging.getLogger(__name__)
+
 
 class ServerConfig(BaseSettings):
     """サーバー設定"""
@@ -39,15 +47,96 @@ class LoggingConfig(BaseSettings):
     file: str = "./logs/dev/app.log"
     max_size: str = "10MB"
     backup_count: int = 5
+    # 出力形式（json: 1行1レコードの JSON / text: 従来の1行形式）
+    format: Literal["json", "text"] = "json"
+    # 出力スレッドへのキューの長さ（溢れたレコードは破棄する）
+    queue_size: int = 10000
+    # アクセスログ（1リクエスト1レコード）
+    access_log: bool = True
+    # 高頻度の読み取りエンドポイント（前方一致）は access_log_sample_rate の割合だけ記録する
+    # （4xx/5xx と access_log_slow_ms 以上かかったリクエストは常に記録）
+    access_log_sampled_paths: List[str] = Field(
+        default_factory=lambda: ["/health", "/api/system/status", "/api/processes"]
+    )
+    access_log_sample_rate: float = Field(default=1.0, ge=0.0, le=1.0)
+    access_log_slow_ms: float = 1000.0
 
 
 class SecurityConfig(BaseSettings):
     """セキュリティ設定"""
 
-    allowed_services: List[str] = Field(default_factory=lambda: ["nginx", "postgresql", "redis"])
+    allowed_services: List[str] = Field(
+        default_factory=lambda: ["nginx", "postgresql", "redis"]
+    )
+    # 無操作タイムアウト（秒、0 で無効。トークンの有効期限とは別にサーバー側で失効させる）
     session_timeout: int = 3600
+    # セッションの最終アクセス時刻をデータベースへ反映する間隔（秒）
+    session_touch_interval: int = 60
+    # 他のワーカーで失効したトークンを読み込む間隔（秒）
+    revocation_refresh_interval: float = 1.0
+    # 失効リストのブルームフィルタの初期容量
+    revocation_filter_capacity: int = 10000
+    # ログイン失敗回数の上限（login_attempt_window 秒のスライディングウィンドウ内、0 で無効）
     max_login_attempts: int = 5
+    max_login_attempts_per_ip: int = 20
+    login_attempt_window: int = 900
     require_https: bool = False
+    # 検証済み JWT のキャッシュ件数（0 で無効）
+    token_cache_size: int = 4096
+    # bcrypt のハッシュ化・検証に使うスレッド数
+    password_hash_workers: int = 2
+
+
+class AuditConfig(BaseSettings):
+    """監査ログ設定"""
+
+    buffered: bool = True
+    flush_interval: float = 0.05
+    max_batch_size: int = 256
+    # none: fsync しない / batch: バッチ毎 / record: レコード毎（コンプライアンスモード）
+    fsync_policy: Literal["none", "batch", "record"] = "batch"
+    # 1レコードの最大バイト数（超過時は details を切り詰める。1回の write(2) で追記するため）
+    max_record_bytes: int = 65536
+    # SQLite 索引ストア（database.path）への記録と索引検索
+    index_enabled: bool = True
+    # 前日以前の日別ファイルのブロック圧縮（最終更新から archive_grace_seconds 経過後）
+    archive_enabled: bool = True
+    archive_interval: int = 3600
+    archive_grace_seconds: int = 600
+    # 署名付きチェックポイントを記録する間隔（writer 毎のレコード数）
+    checkpoint_interval: int = 1000
+
+
+class SnapshotConfig(BaseSettings):
+    """スナップショット応答（システム状態・プロセス一覧）の設定"""
+
+    # 同じスナップショットを返す期間（秒、0 で毎回取得）
+    ttl_seconds: float = 2.0
+    # 保持するスナップショット数（クエリの組み合わせ毎）
+    max_entries: int = 128
+
+
+class CompressionConfig(BaseSettings):
+    """応答の圧縮の設定"""
+
+    enabled: bool = True
+    # これより小さい応答は圧縮しない（バイト）
+    min_size: int = 1024
+    gzip_level: int = 6
+    # brotli がインストールされている場合のみ使用
+    brotli_quality: int = 4
+    # 内容のハッシュ付き（?v=）の静的ファイルのキャッシュ期間（秒）
+    static_max_age: int = 31536000
+
+
+class MetricsConfig(BaseSettings):
+    """メトリクス（/metrics）の設定"""
+
+    enabled: bool = True
+    # ワーカー内の増分を共有データベースへ書き込む間隔（秒）
+    flush_interval: float = 1.0
+    # /metrics へのアクセスを許可する接続元 IP
+    allowed_ips: List[str] = Field(default_factory=lambda: ["127.0.0.1", "::1"])
 
 
 class FeaturesConfig(BaseSettings):
@@ -57,6 +146,9 @@ class FeaturesConfig(BaseSettings):
     debug_mode: bool = True
     hot_reload: bool = True
     api_docs_enabled: bool = True
+    # 設定ファイルの変更を監視して再読み込み（inotify が使えない場合のポーリング間隔は秒）
+    config_reload: bool = True
+    config_reload_poll_interval: float = 2.0
 
 
 class FrontendConfig(BaseSettings):
@@ -78,6 +170,10 @@ class Settings(BaseSettings):
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     security: SecurityConfig = Field(default_factory=SecurityConfig)
+    audit: AuditConfig = Field(default_factory=AuditConfig)
+    snapshot: SnapshotConfig = Field(default_factory=SnapshotConfig)
+    compression: CompressionConfig = Field(default_factory=CompressionConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
     features: FeaturesConfig = Field(default_factory=FeaturesConfig)
     frontend: FrontendConfig = Field(default_factory=FrontendConfig)
 
@@ -110,18 +206,22 @@ class Settings(BaseSettings):
     }
 
 
-def load_config(env: Literal["dev", "prod"] = "dev") -> Settings:
+def load_config(
+    env: Literal["dev", "prod"] = "dev", config_file: Optional[Path] = None
+) -> Settings:
     """
     環境設定を読み込む
 
     Args:
         env: 環境（dev / prod）
+        config_file: 設定ファイル（省略時は config/{env}.json）
 
     Returns:
         Settings オブジェクト
     """
     project_root = Path(__file__).parent.parent.parent
-    config_file = project_root / "config" / f"{env}.json"
+    if config_file is None:
+        config_file = project_root / "config" / f"{env}.json"
 
     if not config_file.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_file}")
@@ -146,20 +246,180 @@ def load_config(env: Literal["dev", "prod"] = "dev") -> Settings:
     return settings
 
 
-# デフォルト設定のインスタンス（遅延初期化）
-_settings_cache = None
+# ===================================================================
+# 設定の再読み込み
+# ===================================================================
 
+# 起動時の値を使い続ける項目（ポート・DB パス・CORS などはプロセスの再起動が必要）
+RESTART_REQUIRED_FIELDS = (
+    "environment",
+    "server",
+    "database",
+    "cors_origins",
+    "jwt_secret_key",
+)
 
-def get_settings() -> Settings:
-    """設定を取得（遅延初期化）"""
-    global _settings_cache
 
-    if _settings_cache is None:
-        current_env = os.getenv("ENV", "dev")
-        _settings_cache = load_config(current_env)
+class ConfigManager:
+    """
+    設定の保持と再読み込み
+
+    現在の設定は不変のスナップショットとして1つの参照で保持し、再読み込み時は
+    新しい Settings を検証してから参照を差し替える（読み手は常にどちらか一方の
+    完全な設定を見る）。検証に失敗した場合は現在の設定を使い続ける。
+    """
+
+    def __init__(self, env: Literal["dev", "prod"], config_file: Optional[Path] = None):
+        self.env = env
+        self.config_file = config_file or (
+            Path(__file__).parent.parent.parent / "config" / f"{env}.json"
+        )
+        self._current: Optional[Settings] = None
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[Settings, Settings], None]] = []
+        self._validators: List[Callable[[Settings], None]] = []
+        self._watcher: Optional["FileWatcher"] = None
+        self.reload_count = 0
+        self.last_reload_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+
+    @property
+    def current(self) -> Settings:
+        """現在の設定（初回アクセス時に読み込む）"""
+        current = self._current
+        if current is None:
+            with self._lock:
+                current = self._load_locked()
+        return current
+
+    def _load_locked(self) -> Settings:
+        """未読み込みなら読み込む（_lock を保持して呼ぶ）"""
+        if self._current is None:
+            self._current = load_config(self.env, self.config_file)
+        return self._current
+
+    @property
+    def loaded(self) -> bool:
+        """設定を読み込み済みか（読み込みはしない）"""
+        return self._current is not None
+
+    def subscribe(self, callback: Callable[[Settings, Settings], None]) -> None:
+        """
+        設定変更の通知を受け取る
+
+        Args:
+            callback: callback(old, new)。差し替え後に再読み込みしたスレッドから呼ばれる
+        """
+        self._subscribers.append(callback)
+
+    def add_validator(self, validator: Callable[[Settings], None]) -> None:
+        """再読み込み時の検証を追加（例外を送出した設定は適用しない）"""
+        self._validators.append(validator)
+
+    def reload(self) -> bool:
+        """
+        設定ファイルを読み直して適用
+
+        Returns:
+            適用した場合は True、検証に失敗した場合は False
+        """
+        with self._lock:
+            old = self._load_locked()
+            try:
+                new = load_config(self.env, self.config_file)
+                # 再起動が必要な項目は現在の値を引き継ぐ
+                changed = [
+                    name
+                    for name in RESTART_REQUIRED_FIELDS
+                    if getattr(new, name) != getattr(old, name)
+                ]
+                if changed:
+                    logger.warning(
+                        f"Config changes require restart and were not applied: {', '.join(changed)}"
+                    )
+                    new = new.model_copy(
+                        update={name: getattr(old, name) for name in changed}
+                    )
+                for validator in self._validators:
+                    validator(new)
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                self.last_error_at = time.time()
+                logger.error(
+                    f"Config reload failed, keeping current settings: {self.last_error}"
+                )
+                return False
+
+            self._current = new
+            self.reload_count += 1
+            self.last_reload_at = time.time()
+            self.last_error = None
+            subscribers = list(self._subscribers)
+
+        logger.info(
+            f"Config reloaded from {self.config_file} (count={self.reload_count})"
+        )
+        for callback in subscribers:
+            try:
+                callback(old, new)
+            except Exception as e:
+                logger.error(f"Config subscriber {callback!r} failed: {e}")
+        return True
+
+    def start_watching(self, poll_interval: float = 2.0) -> None:
+        """設定ファイルの監視を開始（inotify、使えない場合はポーリング）"""
+        from .file_watcher import FileWatcher
+
+        if self._watcher is None:
+            self._watcher = FileWatcher(
+                self.config_file, self.reload, poll_interval=poll_interval
+            )
+            self._watcher.start()
+
+    def stop_watching(self) -> None:
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def status(self) -> Dict[str, Any]:
+        """再読み込みの状態"""
+        return {
+            "config_file": str(self.config_file),
+            "watch_mode": self._watcher.mode if self._watcher is not None else None,
+            "reload_count": self.reload_count,
+            "last_reload_at": self.last_reload_at,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+        }
+
+
+class SettingsProxy:
+    """
+    現在の設定への参照
+
+    `from .config import settings` で取り込んだモジュールも、属性アクセスの度に
+    ConfigManager の現在のスナップショットを参照するため、再読み込みが反映される。
+    1回の処理で複数の値を一貫して使う場合は config_manager.current を変数に取る。
+    """
+
+    def __init__(self, manager: ConfigManager):
+        object.__setattr__(self, "_manager", manager)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._manager.current, name)
+
+    def __repr__(self) -> str:
+        return f"SettingsProxy({self._manager.current!r})"
 
-    return _settings_cache
+
+config_manager = ConfigManager(os.getenv("ENV", "dev"))
+
+
+def get_settings() -> Settings:
+    """現在の設定を取得"""
+    return config_manager.current
 
 
-# 後方互換性のため
-settings = get_settings()
+# 後方互換性のため（属性アクセス毎に現在の設定を参照する）
+settings = SettingsProxy(config_manager)
@@ -0,0 +1,167 @@
+"""
+ファイル変更の監視
+
+Linux では inotify（ctypes 経由）でファイルのあるディレクトリを監視し、
+使えない環境ではファイルの更新時刻・サイズ・inode のポーリングで検出する。
+エディタや設定管理ツールは一時ファイルからの rename で置き換えることが多いため、
+ファイルそのものではなくディレクトリを監視し、ファイル名で絞り込む。
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# inotify のイベント（<sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    name = ctypes.util.find_library("c")
+    if name is None:
+        return None
+    try:
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class FileWatcher:
+    """ファイルが書き換えられたらコールバックを呼ぶ監視スレッド"""
+
+    def __init__(
+        self,
+        path: Path,
+        callback: Callable[[], object],
+        poll_interval: float = 2.0,
+        debounce: float = 0.2,
+    ):
+        """
+        初期化
+
+        Args:
+            path: 監視するファイル
+            callback: 変更時に呼ぶ関数（監視スレッドから呼ばれる）
+            poll_interval: ポーリング間隔（秒、inotify が使えない場合）
+            debounce: 変更検出から callback までの待ち時間（連続した書き込みをまとめる）
+        """
+        self.path = Path(path)
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.mode: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        fd = self._inotify_fd()
+        self.mode = "inotify" if fd is not None else "polling"
+        target: Callable[..., None]
+        args: tuple[Any, ...]
+        if fd is not None:
+            target, args = self._run_inotify, (fd,)
+        else:
+            # 開始前の状態を基準にする（スレッド起動中の変更も検出する）
+            target, args = self._run_polling, (self._signature(),)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=target, args=args, name="config-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching {self.path} ({self.mode})")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _inotify_fd(self) -> Optional[int]:
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        if libc.inotify_add_watch(fd, os.fsencode(self.path.parent), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _notify(self) -> None:
+        try:
+            self.callback()
+        except Exception as e:
+            logger.error(f"File watcher callback failed: {e}")
+
+    @staticmethod
+    def _drain(fd: int) -> None:
+        """待っている間に届いたイベントを捨てる（1回の書き換えで1回だけ通知する）"""
+        try:
+            while os.read(fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _run_inotify(self, fd: int) -> None:
+        name = os.fsencode(self.path.name)
+        try:
+            while not self._stop.is_set():
+                readable, _, _ = select.select([fd], [], [], 0.5)
+                if not readable:
+                    continue
+                changed = False
+                try:
+                    data = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                offset = 0
+                while offset < len(data):
+                    _, _, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                    offset += _EVENT_HEADER.size
+                    event_name = data[offset : offset + length].rstrip(b"\0")
+                    offset += length
+                    changed = changed or event_name == name
+                if changed:
+                    # 書き込み途中のファイルを読まないよう少し待つ
+                    if self._stop.wait(self.debounce):
+                        break
+                    self._drain(fd)
+                    self._notify()
+        finally:
+            os.close(fd)
+
+    def _signature(self) -> Optional[tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _run_polling(self, last: Optional[tuple[int, int, int]]) -> None:
+        while not self._stop.wait(self.poll_interval):
+            current = self._signature()
+            if current != last:
+                if self._stop.wait(self.debounce):
+                    break
+                last = self._signature()
+                self._notify()
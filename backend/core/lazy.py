@@ -0,0 +1,54 @@
+"""
+遅延初期化
+
+モジュールレベルのシングルトン（audit_log / sudo_wrapper など）を import 時ではなく
+最初の属性アクセスで生成するためのプロキシ。ワーカーの起動（import）で
+ファイルシステムへのアクセスや重いライブラリの読み込みを行わないようにする。
+"""
+
+import threading
+from typing import Any, Callable
+
+
+class LazyObject:
+    """
+    初回の属性アクセスで factory() を呼び、以降は生成したオブジェクトへ委譲するプロキシ
+
+    属性の設定・削除も委譲するため、unittest.mock.patch.object もそのまま使える。
+    """
+
+    __slots__ = ("_factory", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_instance", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _lazy_instance(self) -> Any:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                instance = self._instance
+                if instance is None:
+                    instance = self._factory()
+                    object.__setattr__(self, "_instance", instance)
+        return instance
+
+    @property
+    def lazy_initialized(self) -> bool:
+        """生成済みか（生成はしない）"""
+        return self._instance is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lazy_instance(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._lazy_instance(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._lazy_instance(), name)
+
+    def __repr__(self) -> str:
+        if self._instance is None:
+            return f"<LazyObject {getattr(self._factory, '__qualname__', self._factory)!r} (not initialized)>"
+        return repr(self._instance)
@@ -0,0 +1,144 @@
+"""
+ログ出力の構成
+
+ルートロガーにはキューへ積むだけの QueueHandler を付け、整形と出力（stderr /
+journal）は QueueListener の専用スレッドで行う。イベントループ上でのログ呼び出しは
+メッセージの組み立てとキューへの追加だけになり、出力先の書き込み待ちで止まらない。
+
+キューの長さには上限があり、溢れたレコードは破棄して件数を数える
+（出力が詰まってもメモリを使い切らない）。
+"""
+
+import atexit
+import copy
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Optional
+
+from .config import LoggingConfig
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+JSON_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+
+class DroppingQueueHandler(QueueHandler):
+    """キューが満杯の場合はレコードを破棄して数える QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        メッセージを確定し、例外はテキストにしてから渡す
+
+        標準の prepare と異なり、例外のトレースバックは message に連結せず
+        exc_text に残す（JSON では exc_info フィールドになる）。
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _Listener(QueueListener):
+    queue: queue.Queue
+    # QueueListener の終了の合図（型定義にないため明示する。値は基底クラスと同じ）
+    _sentinel = None
+
+    def enqueue_sentinel(self) -> None:
+        # キューが満杯でも停止できるよう、空きを待って終了の合図を積む
+        self.queue.put(self._sentinel)
+
+
+def create_formatter(log_format: str) -> logging.Formatter:
+    """出力形式（json / text）の Formatter"""
+    if log_format == "json":
+        from pythonjsonlogger.json import JsonFormatter
+
+        return JsonFormatter(
+            JSON_FORMAT,
+            rename_fields={"asctime": "time", "levelname": "level", "name": "logger"},
+        )
+    return logging.Formatter(TEXT_FORMAT)
+
+
+_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[_Listener] = None
+_atexit_registered = False
+
+
+def setup_logging(config: LoggingConfig, stream: Optional[IO[str]] = None) -> None:
+    """
+    ルートロガーを構成（再度呼ぶと前回の構成を置き換える）
+
+    Args:
+        config: ログ設定
+        stream: 出力先（None の場合は stderr）
+    """
+    global _handler, _listener, _atexit_registered
+
+    stop_logging()
+
+    output = logging.StreamHandler(stream if stream is not None else sys.stderr)
+    output.setFormatter(create_formatter(config.format))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=config.queue_size)
+    handler = DroppingQueueHandler(log_queue)
+    listener = _Listener(log_queue, output)
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(getattr(logging, config.level))
+    listener.start()
+
+    _handler, _listener = handler, listener
+    if not _atexit_registered:
+        atexit.register(stop_logging)
+        _atexit_registered = True
+
+
+def stop_logging() -> None:
+    """キューに残ったレコードを出力してから出力スレッドを停止"""
+    global _handler, _listener
+
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """キューが満杯で破棄したレコード数（現在の構成になってから）"""
+    return _handler.dropped if _handler is not None else 0
+
+
+def _restart_after_fork() -> None:
+    # fork した子プロセスには出力スレッドが引き継がれないため作り直す
+    global _listener
+
+    if _listener is None or _handler is None:
+        return
+    log_queue: queue.Queue = queue.Queue(maxsize=_listener.queue.maxsize)
+    _handler.queue = log_queue
+    _listener = _Listener(log_queue, *_listener.handlers)
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
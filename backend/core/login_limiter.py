@@ -0,0 +1,272 @@
+"""
+ログイン試行回数の制限
+
+アカウント（メールアドレス）毎と接続元 IP 毎に、一定時間内のログイン失敗回数を制限する。
+状態は SQLite（database.path、WAL モード）の表に置き、全ワーカープロセスで共有する。
+
+スライディングウィンドウは固定長ウィンドウ2つ（直前・現在）の件数から近似する
+（直前の件数 × 現在のウィンドウの残り割合 + 現在の件数）。1キー1行で、判定と記録は
+UPSERT 1回で済む。
+
+試行はパスワード検証の前（check）に数える（予約する）。検証の後に数えると、同じ
+アカウント・IP への並行した試行が全て判定を通り、それぞれがパスワード検証を行って
+しまうため。ログインに成功した場合は reset で予約を取り消す。
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from .config import Settings, config_manager, settings
+from .lazy import LazyObject
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS login_attempts (
+    key TEXT PRIMARY KEY,
+    window_start INTEGER NOT NULL,
+    prev_count INTEGER NOT NULL,
+    curr_count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_login_attempts_window ON login_attempts (window_start);
+"""
+
+# 失敗の記録。ウィンドウが1つ進んだ場合は現在の件数を直前に移し、2つ以上進んだ場合は破棄する
+RECORD_FAILURE = """
+INSERT INTO login_attempts (key, window_start, prev_count, curr_count)
+VALUES (?, ?, 0, 1)
+ON CONFLICT (key) DO UPDATE SET
+    prev_count = CASE
+        WHEN excluded.window_start = window_start THEN prev_count
+        WHEN excluded.window_start = window_start + ? THEN curr_count
+        ELSE 0 END,
+    curr_count = CASE
+        WHEN excluded.window_start = window_start THEN curr_count + 1
+        ELSE 1 END,
+    window_start = excluded.window_start
+"""
+
+# 試行の予約（失敗の記録と同じ更新で、更新後の件数を返す）
+RESERVE_ATTEMPT = RECORD_FAILURE + "RETURNING key, window_start, prev_count, curr_count"
+
+# 予約の取り消し（ウィンドウが進んでいれば直前の件数から減らす）
+RELEASE_ATTEMPT = """
+UPDATE login_attempts SET
+    curr_count = CASE WHEN curr_count > 0 THEN curr_count - 1 ELSE 0 END,
+    prev_count = CASE
+        WHEN curr_count = 0 AND prev_count > 0 THEN prev_count - 1
+        ELSE prev_count END
+WHERE key = ?
+"""
+
+# ロック待ちの最大時間（ミリ秒）
+BUSY_TIMEOUT_MS = 5000
+
+# 期限切れの行を削除する頻度（記録 N 回毎）
+PURGE_EVERY = 256
+
+
+class LoginLimiter:
+    """アカウント毎・IP 毎のログイン失敗回数制限"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_attempts: int,
+        max_attempts_per_ip: int,
+        window_seconds: int,
+    ):
+        """
+        初期化
+
+        Args:
+            db_path: SQLite データベースのパス
+            max_attempts: アカウント毎の最大失敗回数（0 以下で無効）
+            max_attempts_per_ip: 接続元 IP 毎の最大失敗回数（0 以下で無効）
+            window_seconds: ウィンドウの長さ（秒）
+        """
+        self.db_path = Path(db_path)
+        self.max_attempts = max_attempts
+        self.max_attempts_per_ip = max_attempts_per_ip
+        self.window_seconds = window_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """接続を遅延生成（fork 後の子プロセスでは作り直す）"""
+        if self._conn is None or self._pid != os.getpid():
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _keys(email: str, client_ip: Optional[str]) -> dict[str, str]:
+        keys = {"account": f"account:{email.strip().lower()}"}
+        if client_ip:
+            keys["ip"] = f"ip:{client_ip}"
+        return keys
+
+    def _window(self, now: float) -> int:
+        return int(now // self.window_seconds) * self.window_seconds
+
+    def _estimate(
+        self, row: tuple[int, int, int], window_start: int, now: float
+    ) -> float:
+        """スライディングウィンドウ内の失敗回数（近似）"""
+        row_window, prev_count, curr_count = row
+        if row_window == window_start:
+            previous, current = prev_count, curr_count
+        elif row_window == window_start - self.window_seconds:
+            previous, current = curr_count, 0
+        else:
+            return 0.0
+        remaining = 1 - (now - window_start) / self.window_seconds
+        return previous * remaining + current
+
+    def check(self, email: str, client_ip: Optional[str]) -> Optional[int]:
+        """
+        ログイン試行を受け付けるか判定し、受け付ける場合は試行を数える（パスワード検証の前に呼ぶ）
+
+        判定と記録は1つのトランザクションで行うため、並行した試行も1件ずつ数えられる。
+        受け付けた試行は失敗として数えたままになる（成功した場合は reset で取り消す）。
+        制限中として拒否した試行は数えない。
+
+        Args:
+            email: ログインしようとしているメールアドレス
+            client_ip: 接続元 IP
+
+        Returns:
+            制限中の場合は再試行までの秒数、受け付ける場合は None
+        """
+        keys = self._limited_keys(email, client_ip)
+        if not keys:
+            return None
+
+        limits = {"account": self.max_attempts, "ip": self.max_attempts_per_ip}
+        scopes = {key: scope for scope, key in keys.items()}
+        now = time.time()
+        window_start = self._window(now)
+        blocked = None
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key in keys.values():
+                    _, *row = conn.execute(
+                        RESERVE_ATTEMPT, (key, window_start, self.window_seconds)
+                    ).fetchone()
+                    # 更新後の件数からこの試行の分を除いて判定する
+                    estimate = self._estimate(tuple(row), window_start, now) - 1
+                    if estimate >= limits[scopes[key]]:
+                        blocked = key
+                        break
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            if blocked is not None:
+                conn.execute("ROLLBACK")
+            else:
+                conn.execute("COMMIT")
+                self._after_write(conn, window_start)
+
+        if blocked is None:
+            return None
+        # 現在のウィンドウの終わりまで待てば必ず直前の件数は減る
+        retry_after = math.ceil(window_start + self.window_seconds - now)
+        logger.warning(f"Login rate limited: {blocked}, retry_after={retry_after}s")
+        return max(retry_after, 1)
+
+    def record_failure(self, email: str, client_ip: Optional[str]) -> None:
+        """check を通らなかったログイン失敗を記録（存在しないアカウントも記録する）"""
+        now = time.time()
+        window_start = self._window(now)
+        keys = list(self._keys(email, client_ip).values())
+
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                RECORD_FAILURE,
+                [(key, window_start, self.window_seconds) for key in keys],
+            )
+            self._after_write(conn, window_start)
+
+    def reset(self, email: str, client_ip: Optional[str] = None) -> None:
+        """
+        ログイン成功時にアカウントの失敗回数を消去し、IP の予約を取り消す
+
+        IP の失敗回数は他のアカウントへの試行を含むため、この試行の分だけ減らす。
+        """
+        keys = self._limited_keys(email, client_ip)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "DELETE FROM login_attempts WHERE key = ?",
+                (self._keys(email, None)["account"],),
+            )
+            if "ip" in keys:
+                conn.execute(RELEASE_ATTEMPT, (keys["ip"],))
+
+    def _limited_keys(self, email: str, client_ip: Optional[str]) -> dict[str, str]:
+        """制限が有効なスコープのキー"""
+        limits = {"account": self.max_attempts, "ip": self.max_attempts_per_ip}
+        return {
+            scope: key
+            for scope, key in self._keys(email, client_ip).items()
+            if limits[scope] > 0
+        }
+
+    def _after_write(self, conn: sqlite3.Connection, window_start: int) -> None:
+        """記録 PURGE_EVERY 回毎に期限切れの行を削除（_lock を保持して呼ぶ）"""
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            conn.execute(
+                "DELETE FROM login_attempts WHERE window_start < ?",
+                (window_start - self.window_seconds,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def _create_login_limiter() -> LoginLimiter:
+    return LoginLimiter(
+        settings.database.path,
+        max_attempts=settings.security.max_login_attempts,
+        max_attempts_per_ip=settings.security.max_login_attempts_per_ip,
+        window_seconds=settings.security.login_attempt_window,
+    )
+
+
+# グローバルインスタンス（設定は最初の使用時に読む）
+login_limiter = LazyObject(_create_login_limiter)
+
+
+def _apply_settings(old: Settings, new: Settings) -> None:
+    """設定の再読み込みを反映（未生成の場合は生成時に新しい設定を読む）"""
+    if not login_limiter.lazy_initialized:
+        return
+    login_limiter.max_attempts = new.security.max_login_attempts
+    login_limiter.max_attempts_per_ip = new.security.max_login_attempts_per_ip
+    login_limiter.window_seconds = new.security.login_attempt_window
+
+
+config_manager.subscribe(_apply_settings)
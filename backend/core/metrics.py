@@ -0,0 +1,362 @@
+"""
+メトリクス（Prometheus のテキスト形式）
+
+カウンタとヒストグラムの増分はワーカー内のメモリに溜め、metrics.flush_interval 毎に
+SQLite（database.path、WAL モード）の metric_samples 表へ加算する。表は全ワーカーで
+共有するため、/metrics はどのワーカーが応答しても全ワーカーの合計を返す
+（gunicorn の複数ワーカー構成）。応答するワーカー自身の増分は応答前に書き込むが、
+他のワーカーの値は最大 flush_interval 秒遅れる。
+
+値はプロセスの再起動を跨いで累積する（カウンタとして単調増加のまま）。
+"""
+
+import atexit
+import bisect
+import logging
+import math
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_samples (
+    name TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    suffix TEXT NOT NULL,
+    le REAL NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, labels, suffix, le)
+) WITHOUT ROWID;
+"""
+
+UPSERT = """
+INSERT INTO metric_samples (name, labels, suffix, le, value) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (name, labels, suffix, le) DO UPDATE SET value = value + excluded.value
+"""
+
+BUSY_TIMEOUT_MS = 5000
+
+# 秒単位のヒストグラムのバケット上限
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# バケット以外の系列の le 列の値
+_NO_LE = 0.0
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """メトリクスの系列（ラベルの組み合わせ毎に値を持つ）"""
+
+    type = ""
+
+    def __init__(
+        self, registry: "MetricsRegistry", name: str, documentation: str, labelnames
+    ):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _label_key(self, labels: Dict[str, str]) -> str:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}"
+            )
+        return ",".join(
+            f'{name}="{_escape(str(labels[name]))}"' for name in self.labelnames
+        )
+
+
+class Counter(_Metric):
+    """カウンタ"""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        self.registry._add_counter(self.name, self._label_key(labels), amount)
+
+
+class Histogram(_Metric):
+    """ヒストグラム（_bucket・_sum・_count）"""
+
+    type = "histogram"
+
+    def __init__(
+        self, registry, name, documentation, labelnames, buckets: Sequence[float]
+    ):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        self.registry._add_observation(self, self._label_key(labels), index, value)
+
+
+class MetricsRegistry:
+    """メトリクスの定義と、ワーカー間で共有するデータベースへの書き込み・集計"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        flush_interval: Optional[float] = None,
+        enabled: Optional[bool] = None,
+    ):
+        """
+        初期化
+
+        省略した値は使用時に現在の設定（database.path・metrics.*）から読む。
+        メトリクスの定義は import 時に行うため、ここでは設定を読まない。
+
+        Args:
+            db_path: SQLite データベースのパス
+            flush_interval: 増分をデータベースへ書き込む間隔（秒）
+            enabled: False の場合は記録しない
+        """
+        self._db_path = Path(db_path) if db_path is not None else None
+        self._flush_interval = flush_interval
+        self._enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._init_local_state()
+
+    @property
+    def db_path(self) -> Path:
+        if self._db_path is None:
+            return Path(settings.database.path)
+        return self._db_path
+
+    @db_path.setter
+    def db_path(self, value: Path) -> None:
+        self._db_path = Path(value)
+
+    @property
+    def flush_interval(self) -> float:
+        if self._flush_interval is None:
+            return settings.metrics.flush_interval
+        return self._flush_interval
+
+    @flush_interval.setter
+    def flush_interval(self, value: float) -> None:
+        self._flush_interval = value
+
+    @property
+    def enabled(self) -> bool:
+        if self._enabled is None:
+            return settings.metrics.enabled
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool) -> None:
+        self._enabled = value
+
+    def _init_local_state(self) -> None:
+        self._lock = threading.Lock()
+        # データベースへの書き込み中も記録を止めないよう、接続は別のロックで守る
+        self._db_lock = threading.Lock()
+        # (名前, ラベル) -> 増分
+        self._counters: Dict[tuple[str, str], float] = {}
+        # (Histogram, ラベル) -> [バケット毎の件数..., +Inf の件数, 合計]
+        self._histograms: Dict[tuple[Histogram, str], list] = {}
+        # 書き込みに失敗した行（次回に持ち越す）
+        self._unsent: list[tuple] = []
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ---------------------------------------------------------------
+    # 定義
+    # ---------------------------------------------------------------
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """カウンタを定義"""
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """ヒストグラムを定義"""
+        return self._register(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    # ---------------------------------------------------------------
+    # 記録（メモリ上に溜めるだけ）
+    # ---------------------------------------------------------------
+
+    def _add_counter(self, name: str, label_key: str, amount: float) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._ensure_flusher()
+            key = (name, label_key)
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def _add_observation(
+        self, metric: Histogram, label_key: str, index: int, value: float
+    ) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._ensure_flusher()
+            key = (metric, label_key)
+            state = self._histograms.get(key)
+            if state is None:
+                state = self._histograms[key] = [0] * (len(metric.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def _ensure_flusher(self) -> None:
+        """書き込みスレッドを起動（ロック内で呼ぶ）"""
+        if self._flusher is None:
+            self._flusher = threading.Thread(
+                target=self._run, name="metrics-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def _run(self) -> None:
+        stop = self._stop
+        while not stop.wait(self.flush_interval):
+            self.flush()
+
+    def _reset_after_fork(self) -> None:
+        # fork した子プロセスには親の増分・書き込みスレッド・接続を引き継がない
+        self._conn = None
+        self._init_local_state()
+
+    # ---------------------------------------------------------------
+    # データベース
+    # ---------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """接続を遅延生成（_db_lock 内で呼ぶ）"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _take_pending(self) -> list[tuple]:
+        """溜まった増分を metric_samples の行にして取り出す"""
+        with self._lock:
+            counters, self._counters = self._counters, {}
+            histograms, self._histograms = self._histograms, {}
+            rows, self._unsent = self._unsent, []
+
+        rows.extend(
+            (name, label_key, "", _NO_LE, amount)
+            for (name, label_key), amount in counters.items()
+        )
+        for (metric, label_key), state in histograms.items():
+            cumulative = 0
+            for upper, count in zip(metric.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                rows.append((metric.name, label_key, "_bucket", upper, cumulative))
+            rows.append((metric.name, label_key, "_count", _NO_LE, cumulative))
+            rows.append((metric.name, label_key, "_sum", _NO_LE, state[-1]))
+        return rows
+
+    def flush(self) -> None:
+        """溜まった増分をデータベースへ加算（失敗した場合は次回に持ち越す）"""
+        with self._db_lock:
+            rows = self._take_pending()
+            if not rows:
+                return
+            try:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(UPSERT, rows)
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Failed to write metrics ({len(rows)} samples): {e}")
+                with self._lock:
+                    self._unsent = rows + self._unsent
+
+    def render(self) -> str:
+        """
+        全ワーカーの合計を Prometheus のテキスト形式で返す
+
+        自身の増分は先に書き込む。
+        """
+        self.flush()
+        with self._db_lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT name, labels, suffix, le, value FROM metric_samples "
+                    "ORDER BY name, labels, suffix, le"
+                )
+                .fetchall()
+            )
+
+        samples: Dict[str, list[tuple]] = {}
+        for row in rows:
+            samples.setdefault(row[0], []).append(row[1:])
+
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for label_key, suffix, le, value in samples.get(name, []):
+                if suffix == "_bucket":
+                    le_label = f'le="{_format_value(le)}"'
+                    label_key = f"{label_key},{le_label}" if label_key else le_label
+                labels = f"{{{label_key}}}" if label_key else ""
+                lines.append(f"{name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        """書き込みスレッドを止めて残りを書き込み、接続を閉じる"""
+        with self._lock:
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._stop.set()
+            flusher.join()
+            self._stop = threading.Event()
+        self.flush()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# グローバルインスタンス（設定は使用時に読むため、再読み込みもそのまま反映される）
+metrics = MetricsRegistry()
+
+atexit.register(metrics.close)
+os.register_at_fork(after_in_child=metrics._reset_after_fork)
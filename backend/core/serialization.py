@@ -0,0 +1,45 @@
+"""
+JSON の高速なパース・シリアライズ
+
+ラッパーの出力のパースと応答本文の生成には orjson を使う。pydantic のモデルは
+model_dump_json（pydantic-core）で直接バイト列にし、FastAPI の jsonable_encoder と
+応答モデルの再検証を通さない。
+"""
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+# orjson.JSONDecodeError は json.JSONDecodeError のサブクラス
+JSONDecodeError = orjson.JSONDecodeError
+
+
+def loads(data: str | bytes) -> Any:
+    """JSON をパース"""
+    return orjson.loads(data)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    JSON にシリアライズ（UTF-8 のバイト列）
+
+    pydantic のモデルは model_dump_json、それ以外は orjson を使う。orjson が直接
+    扱えない値（Decimal や Path など）は jsonable_encoder で変換する。
+    """
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    return orjson.dumps(
+        content, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS
+    )
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """モデルをそのまま JSON 応答にする（response_model による再検証を行わない）"""
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,377 @@
+"""
+セッションストア（トークン失効・サーバー側セッションタイムアウト）
+
+ログイン毎にセッション（トークンの sid クレーム）を SQLite（database.path、WAL モード）に
+登録し、全ワーカープロセスで共有する。
+
+失効したセッションは revocations 表に追記され、各ワーカーは新しい行だけを定期的に読んで
+メモリ上のブルームフィルタに加える。リクエスト毎の判定はブルームフィルタのみで行い、
+陽性（失効済み、または偽陽性）の場合だけデータベースで確認するため、通常のリクエストに
+データベースへの問い合わせは発生しない。
+
+無操作タイムアウト（security.session_timeout）のための最終アクセス時刻は、
+ワーカー内で保持し、session_touch_interval 毎にデータベースへ反映する。
+期限切れのセッションとワーカー内の最終アクセス時刻は、失効リストの更新
+PRUNE_EVERY 回毎に削除する。
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import Settings, config_manager, settings
+from .lazy import LazyObject
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    revoked_at REAL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at);
+
+CREATE TABLE IF NOT EXISTS revocations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_revocations_session ON revocations (session_id);
+"""
+
+# ロック待ちの最大時間（ミリ秒）
+BUSY_TIMEOUT_MS = 5000
+
+# 期限切れのセッションを削除する頻度（refresh N 回毎）
+PRUNE_EVERY = 300
+
+
+class BloomFilter:
+    """ブルームフィルタ（偽陰性なし、偽陽性率は error_rate 程度）"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # ダブルハッシング: h1 + i * h2
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class SessionStore:
+    """ワーカー間で共有するセッション・失効リスト"""
+
+    def __init__(
+        self,
+        db_path: Path,
+        session_timeout: int,
+        touch_interval: int,
+        refresh_interval: float,
+        filter_capacity: int,
+    ):
+        """
+        初期化
+
+        Args:
+            db_path: SQLite データベースのパス
+            session_timeout: 無操作タイムアウト（秒、0 以下で無効）
+            touch_interval: 最終アクセス時刻をデータベースへ反映する間隔（秒）
+            refresh_interval: 他のワーカーでの失効を読み込む間隔（秒）
+            filter_capacity: ブルームフィルタの初期容量（超えたら作り直す）
+        """
+        self.db_path = Path(db_path)
+        self.session_timeout = session_timeout
+        self.touch_interval = touch_interval
+        self.refresh_interval = refresh_interval
+        self.filter_capacity = filter_capacity
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._init_local_state()
+
+    def _init_local_state(self) -> None:
+        self._filter = BloomFilter(self.filter_capacity)
+        self._last_revocation_id = 0
+        self._refreshed_at = 0.0
+        self._refresh_count = 0
+        # session_id -> (最終アクセス時刻, データベースへの最終反映時刻)
+        self._seen: Dict[str, tuple[float, float]] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        """接続を遅延生成（fork 後の子プロセスでは接続とメモリ上の状態を作り直す）"""
+        if self._conn is None or self._pid != os.getpid():
+            if self._pid is not None and self._pid != os.getpid():
+                self._init_local_state()
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, isolation_level=None
+            )
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    # ---------------------------------------------------------------
+    # セッションの登録・失効
+    # ---------------------------------------------------------------
+
+    def create(self, user_id: str, expires_at: float) -> str:
+        """
+        セッションを登録
+
+        Args:
+            user_id: ユーザーID
+            expires_at: トークンの有効期限（UNIX 時刻）
+
+        Returns:
+            セッションID（トークンの sid クレームに入れる）
+        """
+        session_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO sessions (session_id, user_id, created_at, last_seen, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (session_id, user_id, now, now, expires_at),
+            )
+            self._seen[session_id] = (now, now)
+        return session_id
+
+    def revoke(self, session_id: str) -> bool:
+        """
+        セッションを失効（このワーカーでは即時、他のワーカーでは refresh_interval 以内に反映）
+
+        Returns:
+            失効させた場合は True（存在しない・失効済みの場合は False）
+        """
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.execute(
+                    "UPDATE sessions SET revoked_at = ? WHERE session_id = ? AND revoked_at IS NULL",
+                    (time.time(), session_id),
+                )
+                revoked = cursor.rowcount > 0
+                if revoked:
+                    conn.execute(
+                        "INSERT INTO revocations (session_id, expires_at) "
+                        "SELECT session_id, expires_at FROM sessions WHERE session_id = ?",
+                        (session_id,),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+            if revoked:
+                self._filter.add(session_id)
+                self._seen.pop(session_id, None)
+
+        if revoked:
+            logger.info(f"Session revoked: {session_id}")
+        return revoked
+
+    # ---------------------------------------------------------------
+    # リクエスト毎の検証
+    # ---------------------------------------------------------------
+
+    async def validate(self, session_id: str) -> Optional[str]:
+        """
+        セッションが有効か判定
+
+        通常はメモリ上の判定のみで終わり、データベースへの問い合わせは
+        失効リストの更新（refresh_interval 毎）、ブルームフィルタ陽性時、
+        最終アクセス時刻の反映（touch_interval 毎）のときだけ行う。
+
+        Returns:
+            無効な場合は理由（revoked / expired / unknown）、有効な場合は None
+        """
+        now = time.time()
+        if now - self._refreshed_at >= self.refresh_interval:
+            # 同時に届いたリクエストが揃って読み込まないよう、先に時刻を進める
+            self._refreshed_at = now
+            await asyncio.to_thread(self.refresh)
+
+        if session_id in self._filter and await asyncio.to_thread(
+            self._is_revoked, session_id
+        ):
+            return "revoked"
+
+        last_seen, synced_at = self._seen.get(session_id, (None, 0.0))
+        if (
+            last_seen is None
+            or now - synced_at >= self.touch_interval
+            or (self.session_timeout > 0 and now - last_seen > self.session_timeout)
+        ):
+            return await asyncio.to_thread(self._touch, session_id, now)
+
+        self._seen[session_id] = (now, synced_at)
+        return None
+
+    def refresh(self) -> None:
+        """他のワーカーで失効したセッションをブルームフィルタに追加"""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT id, session_id FROM revocations WHERE id > ? ORDER BY id",
+                (self._last_revocation_id,),
+            ).fetchall()
+            for revocation_id, session_id in rows:
+                self._filter.add(session_id)
+                self._seen.pop(session_id, None)
+                self._last_revocation_id = revocation_id
+            self._refreshed_at = time.time()
+
+            if self._filter.count > self._filter.capacity:
+                self._rebuild(conn)
+            else:
+                self._refresh_count += 1
+                if self._refresh_count % PRUNE_EVERY == 0:
+                    self._prune(conn, self._refreshed_at)
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """期限切れのセッションと、無操作の長いセッションの最終アクセス時刻を削除"""
+        conn.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+
+        # 無操作タイムアウトが無効なら、touch_interval を過ぎた時刻は次のアクセスで反映し直す
+        horizon = (
+            self.session_timeout if self.session_timeout > 0 else self.touch_interval
+        )
+        self._seen = {
+            session_id: seen
+            for session_id, seen in self._seen.items()
+            if now - seen[0] <= horizon
+        }
+
+    def _rebuild(self, conn: sqlite3.Connection) -> None:
+        """期限切れのセッション・失効を削除し、ブルームフィルタを作り直す"""
+        now = time.time()
+        conn.execute("DELETE FROM revocations WHERE expires_at < ?", (now,))
+        self._prune(conn, now)
+        active = [row[0] for row in conn.execute("SELECT session_id FROM revocations")]
+
+        capacity = max(self.filter_capacity, len(active) * 2)
+        bloom = BloomFilter(capacity)
+        for session_id in active:
+            bloom.add(session_id)
+        self._filter = bloom
+        logger.info(
+            f"Revocation filter rebuilt: revoked={len(active)}, capacity={capacity}"
+        )
+
+    def _is_revoked(self, session_id: str) -> bool:
+        """データベースで失効を確認（ブルームフィルタの偽陽性を除く）"""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT 1 FROM revocations WHERE session_id = ? LIMIT 1",
+                    (session_id,),
+                )
+                .fetchone()
+            )
+        return row is not None
+
+    def _touch(self, session_id: str, now: float) -> Optional[str]:
+        """最終アクセス時刻を確認・反映（無操作タイムアウトした場合は失効）"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT last_seen, revoked_at FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return "unknown"
+            if row[1] is not None:
+                self._filter.add(session_id)
+                return "revoked"
+
+            # 他のワーカーでのアクセスも含めた最終アクセス時刻
+            local_last_seen = self._seen.get(session_id, (0.0, 0.0))[0]
+            last_seen = max(row[0], local_last_seen)
+            expired = (
+                self.session_timeout > 0 and now - last_seen > self.session_timeout
+            )
+            if not expired:
+                conn.execute(
+                    "UPDATE sessions SET last_seen = ? WHERE session_id = ?",
+                    (now, session_id),
+                )
+                self._seen[session_id] = (now, now)
+
+        if expired:
+            logger.info(f"Session timed out: {session_id}, idle={now - last_seen:.0f}s")
+            self.revoke(session_id)
+            return "expired"
+        return None
+
+    def close(self) -> None:
+        """接続を閉じ、メモリ上の状態も破棄（次回の接続時に読み直す）"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._init_local_state()
+
+
+def _create_session_store() -> SessionStore:
+    return SessionStore(
+        settings.database.path,
+        session_timeout=settings.security.session_timeout,
+        touch_interval=settings.security.session_touch_interval,
+        refresh_interval=settings.security.revocation_refresh_interval,
+        filter_capacity=settings.security.revocation_filter_capacity,
+    )
+
+
+# グローバルインスタンス（設定は最初の使用時に読む）
+session_store = LazyObject(_create_session_store)
+
+
+def _apply_settings(old: Settings, new: Settings) -> None:
+    """設定の再読み込みを反映（ブルームフィルタの容量は次の作り直しから）"""
+    if not session_store.lazy_initialized:
+        return
+    session_store.session_timeout = new.security.session_timeout
+    session_store.touch_interval = new.security.session_touch_interval
+    session_store.refresh_interval = new.security.revocation_refresh_interval
+    session_store.filter_capacity = new.security.revocation_filter_capacity
+
+
+config_manager.subscribe(_apply_settings)
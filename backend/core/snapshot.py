@@ -0,0 +1,162 @@
+"""
+スナップショット応答と条件付き GET
+
+ポーリングされるエンドポイント（システム状態・プロセス一覧）の応答を、取得時に1回だけ
+JSON にしてスナップショットとして保持する。ETag は JSON 本文のハッシュ（強い ETag）で、
+同じ内容なら取得し直しても同じ値になる。
+
+スナップショットは ttl_seconds の間再利用し、その間のリクエストではラッパーの実行と
+JSON 化を行わない。If-None-Match が一致した場合は本文なしの 304 を返す。
+
+ラッパーの出力には取得時刻（timestamp）が含まれ、作り直す度に本文が変わる。
+作り直した内容が取得時刻以外は前回と同じ場合は、前回の本文と ETag をそのまま使う
+（ポーリング間隔が TTL より長くても 304 を返せる）。
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from .config import Settings, config_manager, settings
+from .lazy import LazyObject
+from .serialization import dumps
+
+# 認証付きの応答のため共有キャッシュには置かせず、毎回再検証させる
+CACHE_CONTROL = "private, no-cache"
+
+# 内容が同じかの判定から除く（取得の度に変わる）トップレベルのフィールド
+VOLATILE_FIELDS = ("timestamp",)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """JSON 化済みの応答本文と ETag"""
+
+    body: bytes
+    etag: str
+    created_at: float
+    # JSON 化する前の内容（監査ログの詳細などに使う。変更しないこと）
+    content: Any = field(default=None, repr=False, compare=False)
+    # VOLATILE_FIELDS を除いた内容のハッシュ（作り直した内容が前回と同じかの判定に使う）
+    content_hash: str = field(default="", repr=False, compare=False)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _without_volatile(content: Any) -> Any:
+    """VOLATILE_FIELDS を除いた内容"""
+    if isinstance(content, dict):
+        return {k: v for k, v in content.items() if k not in VOLATILE_FIELDS}
+    if isinstance(content, BaseModel):
+        fields = type(content).model_fields
+        return content.model_copy(
+            update={name: None for name in VOLATILE_FIELDS if name in fields}
+        )
+    return content
+
+
+def make_snapshot(content: Any) -> Snapshot:
+    """応答内容を JSON 化してスナップショットにする"""
+    body = dumps(content)
+    return Snapshot(
+        body=body,
+        etag=f'"{_digest(body)}"',
+        created_at=time.monotonic(),
+        content=content,
+        content_hash=_digest(dumps(_without_volatile(content))),
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match が ETag と一致するか（弱い比較、RFC 9110 13.1.2）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def snapshot_response(request: Request, snapshot: Snapshot) -> Response:
+    """スナップショットの応答（If-None-Match が一致すれば 304）"""
+    headers = {"ETag": snapshot.etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=snapshot.body, media_type="application/json", headers=headers
+    )
+
+
+class SnapshotCache:
+    """キー（エンドポイントとクエリ）毎のスナップショットの LRU キャッシュ"""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Snapshot] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, produce: Callable[[], Any]) -> Snapshot:
+        """
+        有効なスナップショットを返す（なければ produce() の結果から作る）
+
+        produce が例外を送出した場合はキャッシュせずにそのまま送出する。
+        """
+        now = time.monotonic()
+        with self._lock:
+            snapshot = self._entries.get(key)
+            if snapshot is not None and now - snapshot.created_at < self.ttl_seconds:
+                self._entries.move_to_end(key)
+                return snapshot
+
+        previous = snapshot
+        snapshot = make_snapshot(produce())
+        if previous is not None and previous.content_hash == snapshot.content_hash:
+            # 取得時刻以外は同じ：前回の本文と ETag を使い続ける
+            snapshot = replace(previous, created_at=snapshot.created_at)
+        if self.ttl_seconds > 0:
+            with self._lock:
+                self._entries[key] = snapshot
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _create_snapshot_cache() -> SnapshotCache:
+    return SnapshotCache(
+        ttl_seconds=settings.snapshot.ttl_seconds,
+        max_entries=settings.snapshot.max_entries,
+    )
+
+
+# グローバルインスタンス（設定は最初の使用時に読む）
+snapshot_cache = LazyObject(_create_snapshot_cache)
+
+
+def _apply_settings(old: Settings, new: Settings) -> None:
+    """設定の再読み込みを反映"""
+    if not snapshot_cache.lazy_initialized:
+        return
+    snapshot_cache.ttl_seconds = new.snapshot.ttl_seconds
+    snapshot_cache.max_entries = new.snapshot.max_entries
+
+
+config_manager.subscribe(_apply_settings)
@@ -4,14 +4,32 @@ sudo ラッパー呼び出しモジュール
 CLAUDE.md のセキュリティ原則に従った安全な sudo 実行
 """
 
+import asyncio
 import json
 import logging
 import subprocess
+import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional
+
+import anyio
+
+from . import serialization
+from .lazy import LazyObject
+from .metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+wrapper_duration = metrics.histogram(
+    "adminui_wrapper_duration_seconds",
+    "Wrapper script execution time by wrapper and exit status",
+    ("wrapper", "exit_status"),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+# ストリーミング実行時の読み取り単位
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class SudoWrapperError(Exception):
     """sudo ラッパー実行エラー"""
@@ -19,6 +37,137 @@ class SudoWrapperError(Exception):
     pass
 
 
+def _pipe(reader: Optional[asyncio.StreamReader]) -> asyncio.StreamReader:
+    """PIPE で起動したプロセスの stdout/stderr を取得"""
+    if reader is None:
+        raise SudoWrapperError("Wrapper process was started without pipes")
+    return reader
+
+
+class WrapperStream:
+    """
+    ラッパースクリプトの標準出力ストリーム
+
+    出力をメモリに溜めずにチャンク単位で返す。ラッパーが入力検証で
+    即時終了した場合は、その JSON エラーを error に保持する。
+    """
+
+    def __init__(
+        self,
+        wrapper_name: str,
+        process: asyncio.subprocess.Process,
+        first_chunk: bytes,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ):
+        self.wrapper_name = wrapper_name
+        self.process = process
+        self.chunk_size = chunk_size
+        self.error: Optional[Dict[str, Any]] = None
+        self._first_chunk = first_chunk
+        self._started = time.perf_counter()
+        self._observed = False
+
+    @classmethod
+    async def open(
+        cls,
+        wrapper_name: str,
+        process: asyncio.subprocess.Process,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> "WrapperStream":
+        """
+        起動済みプロセスからストリームを作成
+
+        最初のチャンクは満杯になるか EOF まで読み、早期終了を確実に判定する。
+        """
+        first_chunk = b""
+        while len(first_chunk) < chunk_size:
+            part = await _pipe(process.stdout).read(chunk_size - len(first_chunk))
+            if not part:
+                break
+            first_chunk += part
+
+        stream = cls(wrapper_name, process, first_chunk, chunk_size)
+        await stream._check_early_exit()
+        return stream
+
+    async def _check_early_exit(self) -> None:
+        """最初のチャンクでラッパーが異常終了していれば error を設定"""
+        if not _pipe(self.process.stdout).at_eof():
+            return
+
+        returncode = await self.process.wait()
+        if returncode == 0:
+            return
+
+        self._observe(str(returncode))
+        error: Dict[str, Any]
+        try:
+            error = json.loads(self._first_chunk or b"{}")
+        except json.JSONDecodeError:
+            error = {}
+        error.setdefault("status", "error")
+        error.setdefault("message", f"Wrapper execution failed: {self.wrapper_name}")
+        self.error = error
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """
+        出力をチャンク単位で返す
+
+        Raises:
+            SudoWrapperError: ラッパーが途中で異常終了した場合
+        """
+        try:
+            if self._first_chunk:
+                yield self._first_chunk
+
+            while True:
+                chunk = await _pipe(self.process.stdout).read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+            returncode = await self.process.wait()
+            if returncode != 0:
+                stderr = (await _pipe(self.process.stderr).read()).decode(
+                    errors="replace"
+                )
+                logger.error(
+                    f"Wrapper stream failed: {self.wrapper_name}, "
+                    f"returncode={returncode}, stderr={stderr}"
+                )
+                raise SudoWrapperError(f"Wrapper execution failed: {self.wrapper_name}")
+
+            logger.info(f"Wrapper stream completed: {self.wrapper_name}")
+
+        finally:
+            # 途中で終了させた場合（クライアント切断など）は cancelled
+            # （キャンセル中は await で CancelledError が再送出されるため、await より前に記録する）
+            final_returncode = self.process.returncode
+            self._observe(
+                "cancelled" if final_returncode is None else str(final_returncode)
+            )
+            with anyio.CancelScope(shield=True):
+                await self.aclose()
+
+    def _observe(self, exit_status: str) -> None:
+        """実行時間を記録（1ストリームにつき1回）"""
+        if self._observed:
+            return
+        self._observed = True
+        wrapper_duration.observe(
+            time.perf_counter() - self._started,
+            wrapper=self.wrapper_name,
+            exit_status=exit_status,
+        )
+
+    async def aclose(self) -> None:
+        """実行中のラッパーを終了（クライアント切断時など）"""
+        if self.process.returncode is None:
+            logger.warning(f"Terminating wrapper stream: {self.wrapper_name}")
+            self.process.kill()
+            await self.process.wait()
+
+
 class SudoWrapper:
     """sudo ラッパー呼び出しクラス"""
 
@@ -43,7 +192,9 @@ class SudoWrapper:
                 f"using development directory: {self.wrapper_dir}"
             )
 
-    def _execute(self, wrapper_name: str, args: list[str], timeout: int = 30) -> Dict[str, Any]:
+    def _execute(
+        self, wrapper_name: str, args: list[str], timeout: int = 30
+    ) -> Dict[str, Any]:
         """
         ラッパースクリプトを実行
 
@@ -71,6 +222,8 @@ class SudoWrapper:
 
         logger.info(f"Executing wrapper: {wrapper_name}, args={args}")
 
+        started = time.perf_counter()
+        exit_status = "error"
         try:
             result = subprocess.run(
                 cmd,
@@ -79,23 +232,26 @@ class SudoWrapper:
                 text=True,
                 timeout=timeout,
             )
+            exit_status = "0"
 
             logger.info(f"Wrapper execution successful: {wrapper_name}")
 
             # JSON レスポンスをパース
             try:
-                output = json.loads(result.stdout)
+                output = serialization.loads(result.stdout)
                 return output
-            except json.JSONDecodeError:
+            except serialization.JSONDecodeError:
                 # JSON でない場合はそのまま返す
                 return {"status": "success", "output": result.stdout.strip()}
 
         except subprocess.TimeoutExpired:
+            exit_status = "timeout"
             error_msg = f"Wrapper execution timed out: {wrapper_name}"
             logger.error(error_msg)
             raise SudoWrapperError(error_msg)
 
         except subprocess.CalledProcessError as e:
+            exit_status = str(e.returncode)
             error_msg = f"Wrapper execution failed: {wrapper_name}"
             logger.error(f"{error_msg}, stderr={e.stderr}")
 
@@ -111,6 +267,56 @@ class SudoWrapper:
             logger.error(f"{error_msg}: {e}")
             raise SudoWrapperError(f"{error_msg}: {str(e)}")
 
+        finally:
+            wrapper_duration.observe(
+                time.perf_counter() - started,
+                wrapper=wrapper_name,
+                exit_status=exit_status,
+            )
+
+    async def _execute_stream(
+        self, wrapper_name: str, args: list[str], chunk_size: int = STREAM_CHUNK_SIZE
+    ) -> WrapperStream:
+        """
+        ラッパースクリプトを起動し、標準出力をストリームとして返す
+
+        Args:
+            wrapper_name: ラッパースクリプト名
+            args: 引数リスト
+            chunk_size: 読み取り単位（バイト）
+
+        Returns:
+            WrapperStream（入力検証で拒否された場合は error が設定される）
+
+        Raises:
+            SudoWrapperError: 起動失敗時
+        """
+        wrapper_path = self.wrapper_dir / wrapper_name
+
+        if not wrapper_path.exists():
+            error_msg = f"Wrapper script not found: {wrapper_path}"
+            logger.error(error_msg)
+            raise SudoWrapperError(error_msg)
+
+        # ラッパースクリプトの実行（配列渡し）
+        # 注意: shell=True は絶対に使用しない
+        cmd = ["sudo", str(wrapper_path)] + args
+
+        logger.info(f"Executing wrapper (stream): {wrapper_name}, args={args}")
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            return await WrapperStream.open(wrapper_name, process, chunk_size)
+
+        except Exception as e:
+            error_msg = f"Unexpected error during wrapper execution: {wrapper_name}"
+            logger.error(f"{error_msg}: {e}")
+            raise SudoWrapperError(f"{error_msg}: {str(e)}")
+
     def get_system_status(self) -> Dict[str, Any]:
         """
         システム状態を取得
@@ -145,6 +351,97 @@ class SudoWrapper:
         """
         return self._execute("adminui-logs.sh", [service_name, str(lines)])
 
+    async def stream_logs_export(
+        self,
+        service_name: str,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        output_format: str = "ndjson",
+    ) -> WrapperStream:
+        """
+        サービスのログを行数制限なしでストリーミング取得
+
+        Args:
+            service_name: サービス名
+            since: 開始時刻（UNIX 秒）
+            until: 終了時刻（UNIX 秒）
+            output_format: 出力形式（ndjson / text）
+
+        Returns:
+            WrapperStream
+
+        Raises:
+            SudoWrapperError: 起動失敗時
+        """
+        args = [service_name, f"--format={output_format}"]
+
+        if since is not None:
+            args.append(f"--since=@{since}")
+        if until is not None:
+            args.append(f"--until=@{until}")
+
+        return await self._execute_stream("adminui-logs-export.sh", args)
+
+    def get_file_logs(
+        self,
+        log_name: str,
+        lines: int = 100,
+        cursor: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        ファイルログ（/var/log 配下）を末尾から取得
+
+        Args:
+            log_name: ログ名（ラッパー側 allowlist のキー）
+            lines: 取得行数 (1-1000)
+            cursor: 過去方向ページング用カーソル（前回の next_cursor）
+
+        Returns:
+            ログデータの辞書
+
+        Raises:
+            SudoWrapperError: 実行失敗時
+        """
+        args = ["tail", log_name, f"--lines={lines}"]
+
+        if cursor:
+            args.append(f"--cursor={cursor}")
+
+        return self._execute("adminui-filelog.sh", args)
+
+    def search_file_logs(
+        self,
+        log_name: str,
+        pattern: str,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        ファイルログ（/var/log 配下）を固定文字列で検索
+
+        Args:
+            log_name: ログ名（ラッパー側 allowlist のキー）
+            pattern: 検索文字列（固定文字列）
+            limit: 最大取得件数 (1-1000)
+            offset: 検索開始オフセット（前回の resume_offset）
+
+        Returns:
+            検索結果の辞書（マッチはファイル順、バイトオフセット付き）
+
+        Raises:
+            SudoWrapperError: 実行失敗時
+        """
+        args = [
+            "search",
+            log_name,
+            f"--pattern={pattern}",
+            f"--limit={limit}",
+            f"--offset={offset}",
+        ]
+
+        # 数GBのファイルを走査するためタイムアウトを延長
+        return self._execute("adminui-filelog.sh", args, timeout=120)
+
     def get_processes(
         self,
         sort_by: str = "cpu",
@@ -184,5 +481,5 @@ class SudoWrapper:
         return self._execute("adminui-processes.sh", args, timeout=10)
 
 
-# グローバルインスタンス
-sudo_wrapper = SudoWrapper()
+# グローバルインスタンス（最初の使用時に生成）
+sudo_wrapper = LazyObject(SudoWrapper)
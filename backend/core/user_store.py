@@ -0,0 +1,128 @@
+"""
+ユーザーストア
+
+本番環境のユーザーを SQLite（database.path）で管理する。
+検索は aiosqlite で行い、イベントループをブロックしない。
+パスワードのハッシュ化・検証は auth 側（専用スレッドプール）で行い、ここでは扱わない。
+"""
+
+import logging
+import sqlite3
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL UNIQUE,
+    email TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    role TEXT NOT NULL,
+    hashed_password TEXT NOT NULL,
+    disabled INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+COLUMNS = ("user_id", "username", "email", "role", "hashed_password", "disabled")
+
+# ロック待ちの最大時間（ミリ秒）
+BUSY_TIMEOUT_MS = 5000
+
+
+def _user(row: aiosqlite.Row) -> Dict[str, Any]:
+    user = dict(zip(COLUMNS, row))
+    user["disabled"] = bool(user["disabled"])
+    return user
+
+
+class UserStore:
+    """SQLite ユーザーストア"""
+
+    def __init__(self, db_path: Path):
+        """
+        初期化（データベースは最初のアクセス時に作成）
+
+        Args:
+            db_path: SQLite データベースのパス
+        """
+        self.db_path = Path(db_path)
+        self._schema_ready = False
+
+    @asynccontextmanager
+    async def _connect(self) -> AsyncIterator[aiosqlite.Connection]:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            if not self._schema_ready:
+                await db.execute("PRAGMA journal_mode = WAL")
+                await db.executescript(SCHEMA)
+                await db.commit()
+                self._schema_ready = True
+            yield db
+
+    async def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        メールアドレス（大文字小文字を区別しない）でユーザーを取得
+
+        Returns:
+            ユーザー（user_id, username, email, role, hashed_password, disabled）。
+            存在しない場合は None
+        """
+        async with self._connect() as db:
+            async with db.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM users WHERE email = ?", (email,)
+            ) as cursor:
+                row = await cursor.fetchone()
+        return _user(row) if row else None
+
+    async def create_user(
+        self,
+        user_id: str,
+        username: str,
+        email: str,
+        role: str,
+        hashed_password: str,
+    ) -> None:
+        """
+        ユーザーを登録
+
+        Raises:
+            ValueError: user_id / username / email が既に使われている場合
+        """
+        now = datetime.now().isoformat()
+        try:
+            async with self._connect() as db:
+                await db.execute(
+                    "INSERT INTO users (user_id, username, email, role, hashed_password, "
+                    "disabled, created_at, updated_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                    (user_id, username, email, role, hashed_password, now, now),
+                )
+                await db.commit()
+        except sqlite3.IntegrityError as e:
+            raise ValueError(f"User already exists: {e}") from e
+
+        logger.info(
+            f"User created: user_id={user_id}, username={username}, role={role}"
+        )
+
+    async def set_disabled(self, user_id: str, disabled: bool) -> bool:
+        """
+        ユーザーの無効化・有効化
+
+        Returns:
+            対象ユーザーが存在した場合は True
+        """
+        async with self._connect() as db:
+            cursor = await db.execute(
+                "UPDATE users SET disabled = ?, updated_at = ? WHERE user_id = ?",
+                (int(disabled), datetime.now().isoformat(), user_id),
+            )
+            await db.commit()
+            return cursor.rowcount > 0
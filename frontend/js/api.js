@@ -8,6 +8,8 @@ class APIClient {
         // 相対パスを使用（現在のホストを自動使用）
         this.baseURL = baseURL || '';
         this.token = localStorage.getItem('access_token');
+        // GET 応答の ETag と本文（URL 毎、304 の場合に再利用）
+        this.etagCache = new Map();
     }
 
     /**
@@ -25,10 +27,19 @@ class APIClient {
             headers['Authorization'] = `Bearer ${this.token}`;
         }
 
+        // GET は前回の ETag で条件付きリクエストにする（ブラウザの HTTP キャッシュは使わない）
+        const cached = method === 'GET' ? this.etagCache.get(url) : undefined;
+        if (cached) {
+            headers['If-None-Match'] = cached.etag;
+        }
+
         const options = {
             method,
             headers,
         };
+        if (method === 'GET') {
+            options.cache = 'no-store';
+        }
 
         if (data && (method === 'POST' || method === 'PUT')) {
             options.body = JSON.stringify(data);
@@ -44,12 +55,22 @@ class APIClient {
                 throw new Error('Unauthorized');
             }
 
+            if (response.status === 304 && cached) {
+                // 変更なし: 前回の本文を返す
+                return cached.data;
+            }
+
             const result = await response.json();
 
             if (!response.ok) {
                 throw new Error(result.message || `HTTP ${response.status}`);
             }
 
+            const etag = method === 'GET' ? response.headers.get('ETag') : null;
+            if (etag) {
+                this.etagCache.set(url, { etag, data: result });
+            }
+
             return result;
 
         } catch (error) {
@@ -71,6 +92,7 @@ class APIClient {
      */
     clearToken() {
         this.token = null;
+        this.etagCache.clear();
         localStorage.removeItem('access_token');
     }
 
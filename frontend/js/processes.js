@@ -5,7 +5,9 @@
 
 class ProcessManager {
     constructor() {
-        this.processes = [];
+        // 列指向の一覧（列名 → 値の配列）と行数
+        this.columns = {};
+        this.processCount = 0;
         this.autoRefreshInterval = null;
         this.autoRefreshEnabled = false;
         this.currentFilters = {
@@ -100,6 +102,8 @@ class ProcessManager {
             const params = new URLSearchParams();
             params.append('sort_by', this.currentFilters.sortBy);
             params.append('limit', this.currentFilters.limit);
+            // 項目名を行毎に繰り返さない列指向の形式で受け取る
+            params.append('format', 'columnar');
 
             if (this.currentFilters.user) {
                 params.append('user', this.currentFilters.user);
@@ -115,7 +119,7 @@ class ProcessManager {
 
             console.log('ProcessManager: Processes loaded', response);
 
-            this.processes = response.processes;
+            this.setColumns(response.processes);
 
             // テーブル描画
             this.renderProcessTable();
@@ -136,6 +140,27 @@ class ProcessManager {
         }
     }
 
+    /**
+     * 列指向の一覧（fields と columns）を列名 → 配列の形で保持
+     */
+    setColumns(table) {
+        this.columns = {};
+        table.fields.forEach((field, index) => {
+            this.columns[field.name] = table.columns[index];
+        });
+        this.processCount = table.columns.length > 0 ? table.columns[0].length : 0;
+    }
+
+    /**
+     * index 行目のプロセス（一覧にない列は undefined）
+     */
+    processAt(index) {
+        const columns = this.columns;
+        return new Proxy({}, {
+            get: (target, name) => (columns[name] ? columns[name][index] : undefined)
+        });
+    }
+
     /**
      * プロセステーブルを描画
      */
@@ -143,12 +168,13 @@ class ProcessManager {
         const tbody = document.getElementById('processTableBody');
         tbody.innerHTML = '';
 
-        if (this.processes.length === 0) {
+        if (this.processCount === 0) {
             this.showNoData('プロセスが見つかりませんでした');
             return;
         }
 
-        this.processes.forEach(proc => {
+        for (let index = 0; index < this.processCount; index++) {
+            const proc = this.processAt(index);
             const row = document.createElement('tr');
 
             // 高CPU/高メモリのハイライト
@@ -241,7 +267,7 @@ class ProcessManager {
             });
 
             tbody.appendChild(row);
-        });
+        }
     }
 
     /**
@@ -277,7 +303,8 @@ class ProcessManager {
             // const response = await api.request('GET', `/api/processes/${pid}`);
 
             // 現在は一覧データから表示
-            const proc = this.processes.find(p => p.pid === pid);
+            const index = this.columns.pid ? this.columns.pid.indexOf(pid) : -1;
+            const proc = index >= 0 ? this.processAt(index) : null;
             if (!proc) {
                 modalBody.innerHTML = '<p class="error">プロセスが見つかりませんでした</p>';
                 return;
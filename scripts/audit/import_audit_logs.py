@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+既存 JSON 監査ログの索引ストア取り込みツール
+
+audit_YYYYMMDD.json と圧縮済みの audit_YYYYMMDD.json.blk を SQLite 索引ストア
+（database.path）へ登録する。同じファイルを繰り返し取り込んでも重複しない。
+
+使用方法:
+    ENV=prod python scripts/audit/import_audit_logs.py
+    python scripts/audit/import_audit_logs.py --log-dir logs/dev/audit --db data/dev/database.db
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("ENV", "dev")
+
+from backend.core.audit_archive import ARCHIVE_SUFFIX, segment_name  # noqa: E402
+from backend.core.audit_store import AuditStore  # noqa: E402
+from backend.core.config import settings  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import JSON audit logs into the SQLite store")
+    parser.add_argument(
+        "--log-dir",
+        type=Path,
+        default=Path(settings.logging.file).parent / "audit",
+        help="監査ログディレクトリ（デフォルト: 設定から取得）",
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path(settings.database.path),
+        help="SQLite データベース（デフォルト: database.path）",
+    )
+    args = parser.parse_args()
+
+    # 圧縮済みのセグメントはアーカイブ（と封印後に遅れて書き込まれた非圧縮ファイル）から読む
+    names = {
+        segment_name(path)
+        for pattern in ("audit_*.json", f"audit_*.json{ARCHIVE_SUFFIX}")
+        for path in args.log_dir.glob(pattern)
+    }
+    files = [args.log_dir / name for name in sorted(names)]
+    if not files:
+        print(f"No audit log files found in {args.log_dir}", file=sys.stderr)
+        return 1
+
+    store = AuditStore(args.db)
+    total = 0
+    try:
+        for path in files:
+            imported = store.import_file(path)
+            total += imported
+            print(f"{path.name}: {imported} records imported")
+    finally:
+        store.close()
+
+    print(f"Total: {total} records imported into {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
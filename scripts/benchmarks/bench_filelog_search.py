@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+ファイルログ検索ベンチマーク
+
+数GBの合成ログファイルを生成し、行単位の逐次走査と
+adminui-filelog-reader.py の並列チャンク検索を比較する。
+
+使用方法:
+    python scripts/benchmarks/bench_filelog_search.py --size-gb 5 --dir /var/tmp
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+READER_PATH = PROJECT_ROOT / "wrappers" / "adminui-filelog-reader.py"
+
+NEEDLE = "203.0.113.77"
+
+
+def load_reader():
+    """読み取りヘルパーをモジュールとして読み込む"""
+    spec = importlib.util.spec_from_file_location("adminui_filelog_reader", READER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate(path: Path, size_bytes: int, needle_every: int) -> None:
+    """syslog 風の合成ログを生成（needle_every 行ごとに検索対象 IP を含める）"""
+    template = (
+        "Jan 15 03:12:{sec:02d} web01 sshd[{pid}]: Accepted publickey for deploy "
+        "from {ip} port {port} ssh2: RSA SHA256:abcdefghijklmnopqrstuvwxyz0123456789\n"
+    )
+    block_lines = []
+    for i in range(10000):
+        ip = NEEDLE if i % needle_every == needle_every - 1 else f"198.51.100.{i % 250}"
+        block_lines.append(template.format(sec=i % 60, pid=1000 + i, ip=ip, port=40000 + i))
+    block = "".join(block_lines).encode()
+
+    written = 0
+    with open(path, "wb") as f:
+        while written < size_bytes:
+            f.write(block)
+            written += len(block)
+
+
+def naive_search(path: Path, pattern: str, limit: int) -> int:
+    """行単位の逐次走査（比較用ベースライン）"""
+    found = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if pattern in line:
+                found += 1
+                if found >= limit:
+                    break
+    return found
+
+
+def timed(label: str, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.2f} s")
+    return result, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-gb", type=float, default=2.0)
+    parser.add_argument("--dir", default="/tmp")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--needle-every", type=int, default=5000)
+    parser.add_argument("--keep", action="store_true", help="生成ファイルを削除しない")
+    args = parser.parse_args()
+
+    reader = load_reader()
+    path = Path(args.dir) / "bench_filelog_search.log"
+    size_bytes = int(args.size_gb * 1024**3)
+
+    print(f"Generating {args.size_gb:.1f} GB at {path} ...")
+    generate(path, size_bytes, args.needle_every)
+    print(f"File size: {os.path.getsize(path) / 1024**3:.2f} GB, cpus={os.cpu_count()}")
+    print()
+
+    try:
+        # limit に達しない件数で全体を走査させる（最悪ケース）
+        full_limit = 10**9
+        timed("naive line-by-line (full scan)", naive_search, path, NEEDLE, full_limit)
+        timed(
+            "chunked mmap, 1 worker (full scan)",
+            reader.search_file, str(path), NEEDLE, full_limit, workers=1,
+        )
+        result, _ = timed(
+            "chunked mmap, parallel (full scan)",
+            reader.search_file, str(path), NEEDLE, full_limit,
+        )
+        print(f"  matches={result['matches_returned']}, workers={result['workers']}, "
+              f"chunks={result['chunks_total']}")
+        print()
+
+        # limit 件で打ち切るケース
+        timed(f"naive line-by-line (limit={args.limit})", naive_search, path, NEEDLE, args.limit)
+        result, _ = timed(
+            f"chunked mmap, parallel (limit={args.limit})",
+            reader.search_file, str(path), NEEDLE, args.limit,
+        )
+        print(f"  chunks scanned={result['chunks_scanned']}/{result['chunks_total']}")
+    finally:
+        if not args.keep:
+            path.unlink(missing_ok=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+ログイン集中時のベンチマーク
+
+本番環境の認証（ユーザーストア + パスワード検証）に対してログインを同時に発行し、
+その間に実行した軽量リクエスト（イベントループ上の処理）の待ち時間を計測する。
+パスワード検証をイベントループ上で直接実行した場合と、専用スレッドプールで
+実行した場合（現在の実装）を比較し、ログインのスループットと軽量リクエストの
+p50 / p99 を出力する。
+
+使用方法:
+    python scripts/benchmarks/bench_login.py --logins 40 --concurrency 20
+    python scripts/benchmarks/bench_login.py --scheme pbkdf2_sha256  # bcrypt が使えない環境
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("ENV", "dev")
+
+from passlib.context import CryptContext  # noqa: E402
+
+from backend.core import auth  # noqa: E402
+from backend.core.config import settings  # noqa: E402
+from backend.core.user_store import UserStore  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+
+async def _verify_on_loop(plain_password: str, hashed_password: str) -> bool:
+    """比較用: イベントループ上で直接検証"""
+    return auth.verify_password(plain_password, hashed_password)
+
+
+async def _probe(stop: asyncio.Event, latencies: list[float], interval: float) -> None:
+    """軽量リクエストの代わりに、一定間隔で起床し、予定時刻からの遅れを計測"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        latencies.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def run(store: UserStore, logins: int, concurrency: int) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    latencies: list[float] = []
+
+    async def login(n: int) -> None:
+        async with semaphore:
+            user = await auth.authenticate_user(f"user{n % 10}@example.com", PASSWORD)
+            assert user is not None
+
+    probe = asyncio.create_task(_probe(stop, latencies, 0.005))
+    start = time.perf_counter()
+    await asyncio.gather(*(login(n) for n in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+
+    return logins / elapsed, latencies
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    context = CryptContext(schemes=[args.scheme])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = UserStore(Path(tmp) / "users.db")
+        hashed = context.hash(PASSWORD)
+        for n in range(10):
+            await store.create_user(f"user_{n}", f"user{n}", f"user{n}@example.com", "Viewer", hashed)
+
+        print(
+            f"logins={args.logins}, concurrency={args.concurrency}, scheme={args.scheme}, "
+            f"password_hash_workers={settings.security.password_hash_workers}"
+        )
+        print(f"{'scenario':<24}{'logins/sec':>12}{'probe p50 ms':>14}{'probe p99 ms':>14}")
+
+        with patch.object(settings, "environment", "production"), patch.object(
+            auth, "user_store", store
+        ), patch.object(auth, "pwd_context", context):
+            scenarios = [
+                ("verify on event loop", patch.object(auth, "verify_password_async", _verify_on_loop)),
+                ("verify in thread pool", nullcontext()),
+            ]
+            for name, scenario in scenarios:
+                with scenario:
+                    throughput, latencies = await run(store, args.logins, args.concurrency)
+                p50 = statistics.median(latencies)
+                p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else p50
+                print(f"{name:<24}{throughput:>12.1f}{p50:>14.2f}{p99:>14.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Login storm benchmark")
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--scheme", default="bcrypt", choices=["bcrypt", "pbkdf2_sha256"])
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+応答のシリアライズのベンチマーク
+
+ラッパーの出力（JSON 文字列）から応答本文のバイト列を作るまで
+（パース → 検証 → シリアライズ）を、従来の経路と高速化した経路で比較する。
+
+- 従来: json.loads → Model(**result) → FastAPI の応答モデル検証 → JSONResponse
+- 高速: orjson.loads → Model(**result) → model_dump_json
+
+検証（pydantic-core）は1回だけ行う。model_construct による検証の省略は、
+1000件の ProcessInfo では Python 側のオブジェクト生成の方が遅くなるため使わない
+（--construct で比較できる）。
+
+使用方法:
+    python scripts/benchmarks/bench_serialization.py --rows 1000 --iterations 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from backend.api.routes.logs import LogsResponse  # noqa: E402
+from backend.api.routes.processes import ProcessListResponse  # noqa: E402
+from backend.core import serialization  # noqa: E402
+
+
+def process_output(rows: int) -> str:
+    """adminui-processes.sh と同じ形式の出力"""
+    processes = [
+        {
+            "pid": 1000 + i,
+            "user": "www-data" if i % 3 else "root",
+            "cpu_percent": round((i % 97) * 0.7, 1),
+            "mem_percent": round((i % 53) * 0.3, 1),
+            "vsz": 100000 + i * 17,
+            "rss": 20000 + i * 7,
+            "tty": "?",
+            "stat": "Ssl",
+            "start": "Jan15",
+            "time": "0:12",
+            "command": f"/usr/bin/python3 /opt/app/worker.py --id={i} --queue=default",
+        }
+        for i in range(rows)
+    ]
+    return json.dumps(
+        {
+            "status": "success",
+            "total_processes": rows * 2,
+            "returned_processes": rows,
+            "sort_by": "cpu",
+            "filters": {"user": None, "min_cpu": 0.0, "min_mem": 0.0},
+            "processes": processes,
+            "timestamp": "2025-01-15T03:12:00+09:00",
+        }
+    )
+
+
+def logs_output(rows: int) -> str:
+    """adminui-logs.sh と同じ形式の出力"""
+    logs = [
+        f"Jan 15 03:12:{i % 60:02d} web01 nginx[{1000 + i}]: 198.51.100.{i % 250} "
+        f'"GET /api/system/status HTTP/1.1" 200 512'
+        for i in range(rows)
+    ]
+    return json.dumps(
+        {
+            "status": "success",
+            "service": "nginx",
+            "lines_requested": rows,
+            "lines_returned": rows,
+            "logs": logs,
+            "timestamp": "2025-01-15T03:12:00+09:00",
+        }
+    )
+
+
+def baseline(model, field, loop):
+    """従来の経路（FastAPI が response_model で応答を作る場合と同じ処理）"""
+
+    def run(output: str) -> bytes:
+        content = model(**json.loads(output))
+        value = loop.run_until_complete(serialize_response(field=field, response_content=content))
+        return JSONResponse(value).body
+
+    return run
+
+
+def fast(build):
+    """高速化した経路"""
+
+    def run(output: str) -> bytes:
+        return build(serialization.loads(output)).model_dump_json().encode("utf-8")
+
+    return run
+
+
+def construct(model):
+    """model_construct で検証を省略する経路（入れ子のモデルも model_construct）"""
+    nested = {
+        name: field.annotation.__args__[0]
+        for name, field in model.model_fields.items()
+        if getattr(field.annotation, "__origin__", None) is list
+        and isinstance(field.annotation.__args__[0], type)
+        and hasattr(field.annotation.__args__[0], "model_construct")
+    }
+
+    def build(result: dict):
+        values = dict(result)
+        for name, item_model in nested.items():
+            values[name] = [item_model.model_construct(**item) for item in result[name]]
+        return model.model_construct(**values)
+
+    return build
+
+
+def measure(func, output: str, iterations: int) -> float:
+    """1回あたりの時間（ミリ秒）"""
+    func(output)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(output)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--construct", action="store_true", help="model_construct の経路も計測する"
+    )
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    cases = [
+        ("processes", process_output(args.rows), ProcessListResponse),
+        ("service logs", logs_output(args.rows), LogsResponse),
+    ]
+
+    print(f"rows={args.rows}, iterations={args.iterations}")
+    header = f"{'case':<16} {'baseline ms':>12} {'fast ms':>10} {'speedup':>8}"
+    print(header + (f" {'construct ms':>13}" if args.construct else ""))
+    try:
+        for name, output, model in cases:
+            field = create_model_field(name="Response_" + model.__name__, type_=model)
+            before_func = baseline(model, field, loop)
+            after_func = fast(lambda result, model=model: model(**result))
+            # 両方の経路で同じ内容の JSON になることを確認
+            assert json.loads(before_func(output)) == json.loads(after_func(output))
+
+            before = measure(before_func, output, args.iterations)
+            after = measure(after_func, output, args.iterations)
+            line = f"{name:<16} {before:12.2f} {after:10.2f} {before / after:7.1f}x"
+            if args.construct:
+                line += f" {measure(fast(construct(model)), output, args.iterations):13.2f}"
+            print(line)
+    finally:
+        loop.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
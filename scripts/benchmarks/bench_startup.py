@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+API プロセスの起動（import）時間のベンチマーク
+
+新しいプロセスで `python -X importtime -c "import backend.api.main"` を実行し、
+モジュール毎の import 時間（自身 / 累積）を集計する。gunicorn のワーカー起動や
+--max-requests による再起動で毎回かかる時間の目安になる。
+
+バックエンド自身のモジュール（backend.*）の import 時間の合計が予算を超えた場合、
+起動時に読み込まないはずのモジュール（jose / passlib）が読み込まれた場合、
+import だけで設定ファイル（config/*.json・.env）が読み込まれた場合、
+遅延生成のシングルトン（audit_log / sudo_wrapper など）が生成された場合は
+終了コード 1 を返す（tests/unit/test_startup.py から実行）。
+
+使用方法:
+    python scripts/benchmarks/bench_startup.py --runs 5
+    python scripts/benchmarks/bench_startup.py --runs 3 --budget-ms 250 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# 起動時に読み込まない（最初の使用時に読み込む）モジュール
+DEFERRED_MODULES = ("jose", "passlib")
+
+# backend.* の import 時間の合計の予算（ミリ秒）
+DEFAULT_BUDGET_MS = 250.0
+
+# 子プロセスでカバレッジ計測を自動開始させる環境変数
+COVERAGE_ENV_PREFIXES = ("COV_CORE_", "COVERAGE_PROCESS_START")
+
+PROBE = """
+import json, sys
+import backend.api.main
+from backend.core import audit_log, sudo_wrapper
+from backend.core.auth import _password_executor, token_cache, user_store
+from backend.core.config import config_manager
+from backend.core.login_limiter import login_limiter
+from backend.core.session_store import session_store
+from backend.core.snapshot import snapshot_cache
+singletons = {
+    "audit_log": audit_log,
+    "sudo_wrapper": sudo_wrapper,
+    "user_store": user_store,
+    "token_cache": token_cache,
+    "password_executor": _password_executor,
+    "login_limiter": login_limiter,
+    "session_store": session_store,
+    "snapshot_cache": snapshot_cache,
+}
+print(json.dumps({
+    "loaded": sorted({name.split(".")[0] for name in sys.modules}),
+    "config_loaded": config_manager.loaded,
+    "initialized": sorted(name for name, obj in singletons.items() if obj.lazy_initialized),
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """-X importtime の出力をモジュール名 → (自身, 累積)（マイクロ秒）に変換"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_once() -> tuple[dict[str, tuple[int, int]], dict]:
+    # pytest-cov 配下で実行されても子プロセスを計測対象にしない（import 時間が膨らむため）
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if not key.startswith(COVERAGE_ENV_PREFIXES)
+    }
+    env["ENV"] = os.environ.get("ENV", "dev")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr), json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(runs: int) -> dict:
+    # 1回目は .pyc の生成を含むため捨てる
+    measure_once()
+
+    totals, own, samples = [], [], []
+    probe = {}
+    for _ in range(runs):
+        modules, probe = measure_once()
+        samples.append(modules)
+        totals.append(modules["backend.api.main"][1] / 1000)
+        own.append(
+            sum(self_us for name, (self_us, _) in modules.items() if name.startswith("backend"))
+            / 1000
+        )
+
+    names = set().union(*samples)
+    slowest = sorted(
+        (
+            (statistics.median(s.get(name, (0, 0))[0] for s in samples) / 1000, name)
+            for name in names
+        ),
+        reverse=True,
+    )[:15]
+
+    return {
+        "runs": runs,
+        "total_ms": statistics.median(totals),
+        "backend_ms": statistics.median(own),
+        "deferred_loaded": [name for name in DEFERRED_MODULES if name in probe["loaded"]],
+        "config_loaded": probe["config_loaded"],
+        "initialized": probe["initialized"],
+        "slowest": [{"module": name, "self_ms": round(ms, 2)} for ms, name in slowest],
+    }
+
+
+def violations(report: dict, budget_ms: float) -> list[str]:
+    problems = []
+    if report["backend_ms"] > budget_ms:
+        problems.append(f"backend import time {report['backend_ms']:.1f} ms > budget {budget_ms} ms")
+    if report["deferred_loaded"]:
+        problems.append(f"deferred modules loaded at import: {', '.join(report['deferred_loaded'])}")
+    if report["config_loaded"]:
+        problems.append("config loaded at import")
+    if report["initialized"]:
+        problems.append(f"singletons initialized at import: {', '.join(report['initialized'])}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API import-time benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = measure(args.runs)
+    problems = violations(report, args.budget_ms)
+    report["violations"] = problems
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(f"runs={report['runs']}")
+        print(f"import backend.api.main: {report['total_ms']:.1f} ms (median)")
+        print(f"backend.* modules:       {report['backend_ms']:.1f} ms (budget {args.budget_ms} ms)")
+        print(f"{'module':<48}{'self ms':>10}")
+        for row in report["slowest"]:
+            print(f"{row['module']:<48}{row['self_ms']:>10.2f}")
+        for problem in problems:
+            print(f"VIOLATION: {problem}")
+
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
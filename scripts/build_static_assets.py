@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+静的ファイルのビルド（事前圧縮と ?v= の付与）
+
+frontend/css・frontend/js の各ファイルについて:
+- 最大圧縮の .gz（brotli がインストールされている場合は .br も）を隣に生成する
+  （元より小さくならない場合は生成せず、古い圧縮済みファイルは削除する）
+- frontend/dev・frontend/prod の HTML の参照を ?v=<内容のハッシュ> 付きに書き換える
+
+配信側（backend/api/static_files.py）は、ハッシュが現在の内容と一致する参照にのみ
+長期間のキャッシュを許可する。
+
+使用方法:
+    python scripts/build_static_assets.py
+"""
+
+import argparse
+import gzip
+import re
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.api.static_files import PRECOMPRESSED_SUFFIXES, content_hash  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ASSET_DIRS = ("css", "js")
+ASSET_SUFFIXES = (".css", ".js")
+HTML_DIRS = ("dev", "prod")
+
+# ../js/api.js・/css/style.css（?v= があれば置き換える）
+ASSET_REF = re.compile(
+    r"""(?P<path>(?:\.\./|/)(?P<dir>css|js)/(?P<name>[\w.-]+))(?:\?v=[0-9a-f]*)?(?=["'])"""
+)
+
+
+def compress(data: bytes) -> dict[str, bytes]:
+    """圧縮形式 → 圧縮後のデータ"""
+    compressed = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(data, quality=11)
+    return compressed
+
+
+def build_asset(path: Path) -> tuple[str, int, dict[str, int]]:
+    """1ファイル分の圧縮済みファイルを生成（ハッシュ・元のサイズ・圧縮後のサイズを返す）"""
+    data = path.read_bytes()
+    written = {}
+    compressed = compress(data)
+    for encoding, suffix in PRECOMPRESSED_SUFFIXES.items():
+        target = path.with_name(path.name + suffix)
+        output = compressed.get(encoding)
+        if output is None or len(output) >= len(data):
+            target.unlink(missing_ok=True)
+            continue
+        target.write_bytes(output)
+        written[encoding] = len(output)
+    return content_hash(data), len(data), written
+
+
+def rewrite_html(path: Path, hashes: dict[tuple[str, str], str]) -> bool:
+    """HTML の静的ファイルの参照に ?v= を付ける（変更した場合 True）"""
+    html = path.read_text(encoding="utf-8")
+
+    def replace(match: re.Match) -> str:
+        digest = hashes.get((match["dir"], match["name"]))
+        return f"{match['path']}?v={digest}" if digest else match[0]
+
+    updated = ASSET_REF.sub(replace, html)
+    if updated == html:
+        return False
+    path.write_text(updated, encoding="utf-8")
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frontend-dir", type=Path, default=PROJECT_ROOT / "frontend")
+    parser.add_argument("--no-html", action="store_true", help="HTML を書き換えない")
+    args = parser.parse_args()
+
+    hashes = {}
+    for directory in ASSET_DIRS:
+        for path in sorted((args.frontend_dir / directory).iterdir()):
+            if path.suffix not in ASSET_SUFFIXES:
+                continue
+            digest, size, written = build_asset(path)
+            hashes[(directory, path.name)] = digest
+            sizes = ", ".join(f"{enc}={n}" for enc, n in written.items()) or "not compressed"
+            print(f"{directory + '/' + path.name:<28} {digest}  {size:>7} -> {sizes}")
+
+    if not args.no_html:
+        for directory in HTML_DIRS:
+            for path in sorted((args.frontend_dir / directory).glob("*.html")):
+                if rewrite_html(path, hashes):
+                    print(f"updated {path.relative_to(args.frontend_dir)}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
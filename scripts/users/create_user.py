@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+本番環境のユーザー登録ツール
+
+ユーザーストア（database.path）にユーザーを登録する。パスワードは対話入力。
+
+使用方法:
+    ENV=prod python scripts/users/create_user.py --email admin@example.com \
+        --username admin --role Admin
+"""
+
+import argparse
+import asyncio
+import getpass
+import os
+import sys
+import uuid
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+os.environ.setdefault("ENV", "dev")
+
+from backend.core.auth import ROLES, get_password_hash_async  # noqa: E402
+from backend.core.config import settings  # noqa: E402
+from backend.core.user_store import UserStore  # noqa: E402
+
+
+async def create(args: argparse.Namespace, password: str) -> None:
+    store = UserStore(args.db)
+    await store.create_user(
+        user_id=args.user_id or f"user_{uuid.uuid4().hex[:12]}",
+        username=args.username,
+        email=args.email,
+        role=args.role,
+        hashed_password=await get_password_hash_async(password),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Create a user in the SQLite user store")
+    parser.add_argument("--email", required=True, help="メールアドレス（ログイン ID）")
+    parser.add_argument("--username", required=True, help="ユーザー名")
+    parser.add_argument("--role", required=True, choices=sorted(ROLES), help="ロール")
+    parser.add_argument("--user-id", help="ユーザーID（デフォルト: 自動生成）")
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=Path(settings.database.path),
+        help="SQLite データベース（デフォルト: database.path）",
+    )
+    args = parser.parse_args()
+
+    password = getpass.getpass("Password: ")
+    if password != getpass.getpass("Confirm password: "):
+        print("Passwords do not match", file=sys.stderr)
+        return 1
+
+    try:
+        asyncio.run(create(args, password))
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+
+    print(f"User created: {args.username} ({args.role}) in {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
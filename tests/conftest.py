@@ -18,14 +18,54 @@ os.environ["ENV"] = "dev"
 
 
 @pytest.fixture(scope="session")
-def test_client():
+def test_client(tmp_path_factory):
     """FastAPI テストクライアント"""
     from backend.api.main import app
+    from backend.core.audit_log import audit_log
+    from backend.core.auth import user_store
+    from backend.core.login_limiter import login_limiter
+    from backend.core.session_store import session_store
+
+    # ログイン失敗回数・セッションはテスト実行毎に独立させる
+    login_limiter.close()
+    login_limiter.db_path = tmp_path_factory.mktemp("login_limiter") / "database.db"
+    session_store.close()
+    session_store.db_path = tmp_path_factory.mktemp("session_store") / "database.db"
+
+    # 監査ログ（チェックポイント・サマリを含む）・索引ストア・ユーザーストアも
+    # 開発用の logs/ data/ には書き込まない
+    audit_log.close()
+    audit_log.log_dir = tmp_path_factory.mktemp("audit_log")
+    if audit_log.store is not None:
+        audit_log.store.close()
+        audit_log.store.db_path = tmp_path_factory.mktemp("audit_store") / "database.db"
+    user_store.db_path = tmp_path_factory.mktemp("user_store") / "database.db"
 
     with TestClient(app) as client:
         yield client
 
 
+@pytest.fixture(scope="session", autouse=True)
+def isolate_metrics(tmp_path_factory):
+    """メトリクスは開発用データベースではなくテスト実行毎のデータベースに書き込む"""
+    from backend.core.metrics import metrics
+
+    metrics.close()
+    metrics.db_path = tmp_path_factory.mktemp("metrics") / "database.db"
+    yield metrics
+    metrics.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshot_cache():
+    """テスト間でスナップショット（モックの応答）を持ち越さない"""
+    from backend.core.snapshot import snapshot_cache
+
+    snapshot_cache.clear()
+    yield
+    snapshot_cache.clear()
+
+
 @pytest.fixture
 def auth_token(test_client):
     """認証トークンを取得"""
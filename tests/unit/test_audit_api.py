@@ -0,0 +1,221 @@
+"""
+監査ログ API のユニットテスト
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core.audit_log import AuditLog
+
+
+@pytest.fixture(params=[False, True], ids=["scan", "indexed"])
+def seeded_audit_log(request, tmp_path):
+    """user_002（Operator）と user_003（Admin）のレコードを持つ監査ログ（索引ストアの有無）"""
+    db_path = tmp_path / "audit.db" if request.param else None
+    audit_log = AuditLog(log_dir=tmp_path / "audit", buffered=False, db_path=db_path)
+    for i in range(3):
+        audit_log.record("service_restart", "user_002", "nginx", "success", {"n": i})
+        audit_log.record("login", "user_003", "system", "success", {"n": i})
+
+    with patch("backend.api.routes.audit.audit_log", audit_log):
+        yield audit_log
+    audit_log.close()
+
+
+def _ndjson(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestAuditExport:
+    """GET /api/audit/export のテスト"""
+
+    def test_admin_exports_all_records(self, test_client, admin_token, seeded_audit_log):
+        response = test_client.get(
+            "/api/audit/export", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        entries = _ndjson(response)
+        # エクスポート自身の試行レコードも含まれる
+        assert [e["operation"] for e in entries].count("audit_export") == 1
+        assert len(entries) == 7
+        assert entries[0]["user_id"] == "user_002"
+
+    def test_operator_exports_only_own_records(self, test_client, auth_headers, seeded_audit_log):
+        response = test_client.get("/api/audit/export?order=desc", headers=auth_headers)
+
+        assert response.status_code == 200
+        entries = _ndjson(response)
+        assert {e["user_id"] for e in entries} == {"user_002"}
+        assert [e["details"]["n"] for e in entries if e["operation"] == "service_restart"] == [
+            2, 1, 0,
+        ]
+
+    def test_viewer_is_denied(self, test_client, viewer_token, seeded_audit_log):
+        response = test_client.get(
+            "/api/audit/export", headers={"Authorization": f"Bearer {viewer_token}"}
+        )
+
+        assert response.status_code == 403
+
+    def test_export_is_audited(self, test_client, admin_token, seeded_audit_log):
+        """エクスポートの試行と完了（件数）を監査ログに残す"""
+        test_client.get(
+            "/api/audit/export?operation=login",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        exports = seeded_audit_log.query("Admin", "admin", operation="audit_export")
+        assert [e["status"] for e in exports] == ["attempt", "success"]
+        assert exports[-1]["details"]["records"] == 3
+
+    def test_inverted_range(self, test_client, admin_token):
+        response = test_client.get(
+            "/api/audit/export?start_date=2026-01-02T00:00:00&end_date=2026-01-01T00:00:00",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 400
+
+
+class TestAuditQuery:
+    """GET /api/audit のテスト"""
+
+    def test_cursor_pagination(self, test_client, admin_token, seeded_audit_log):
+        """next_cursor で続きを取得し、最後のページでは None"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        whole = test_client.get("/api/audit?limit=4&operation=login", headers=headers).json()
+        assert [e["details"]["n"] for e in whole["entries"]] == [2, 1, 0]
+        assert whole["next_cursor"] is None
+
+        page = test_client.get("/api/audit?limit=2&operation=login", headers=headers).json()
+        rest = test_client.get(
+            f"/api/audit?limit=2&operation=login&cursor={page['next_cursor']}", headers=headers
+        ).json()
+        assert [e["details"]["n"] for e in page["entries"] + rest["entries"]] == [2, 1, 0]
+        assert rest["next_cursor"] is None
+
+    def test_invalid_cursor(self, test_client, admin_token, seeded_audit_log):
+        response = test_client.get(
+            "/api/audit?cursor=bogus", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+
+        assert response.status_code == 400
+
+    def test_viewer_is_denied(self, test_client, viewer_token, seeded_audit_log):
+        response = test_client.get(
+            "/api/audit", headers={"Authorization": f"Bearer {viewer_token}"}
+        )
+
+        assert response.status_code == 403
+
+    def test_corrupt_segment_is_an_error(self, test_client, admin_token, tmp_path):
+        """壊れたファイルを飛ばして欠けた結果を 200 で返さない"""
+        audit_log = AuditLog(log_dir=tmp_path / "audit", buffered=False)
+        audit_log.record("login", "user_003", "system", "success", {})
+        with open(audit_log.log_file, "a", encoding="utf-8") as f:
+            f.write("{corrupt\n")
+        client = TestClient(test_client.app, raise_server_exceptions=False)
+
+        with patch("backend.api.routes.audit.audit_log", audit_log):
+            response = client.get(
+                "/api/audit", headers={"Authorization": f"Bearer {admin_token}"}
+            )
+
+        assert response.status_code == 500
+
+    @pytest.mark.parametrize("path", ["/api/audit", "/api/audit/export"])
+    def test_timezone_aware_range(self, test_client, admin_token, seeded_audit_log, path):
+        """タイムゾーン付きの期間はローカル時刻に変換して比較する"""
+        response = test_client.get(
+            f"{path}?operation=login&start_date=2000-01-01T00:00:00Z"
+            "&end_date=2100-01-01T00:00:00%2B09:00",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 200
+        assert "user_003" in response.text
+
+
+class TestAuditStats:
+    """GET /api/audit/stats のテスト"""
+
+    def test_restarts_per_service_per_day(self, test_client, admin_token, seeded_audit_log):
+        response = test_client.get(
+            "/api/audit/stats?operation=service_restart&group_by=target",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["group_by"] == ["target"]
+        assert [(b["target"], b["count"]) for b in data["buckets"]] == [("nginx", 3)]
+        assert "timestamp" in data
+
+    def test_columnar_format(self, test_client, admin_token, seeded_audit_log):
+        response = test_client.get(
+            "/api/audit/stats?operation=service_restart&group_by=target&format=columnar",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["format"] == "columnar"
+        assert "timestamp" in data
+        table = data["buckets"]
+        names = [field["name"] for field in table["fields"]]
+        columns = dict(zip(names, table["columns"]))
+        assert (columns["target"], columns["count"]) == (["nginx"], [3])
+
+    def test_aware_and_naive_range(self, test_client, admin_token, seeded_audit_log):
+        """タイムゾーン付きとなしが混在しても比較できる"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        response = test_client.get(
+            "/api/audit/stats?operation=login&start_date=2000-01-01T00:00:00Z"
+            "&end_date=2100-01-01T00:00:00",
+            headers=headers,
+        )
+        inverted = test_client.get(
+            "/api/audit/stats?start_date=2100-01-01T00:00:00Z&end_date=2000-01-01T00:00:00",
+            headers=headers,
+        )
+
+        assert response.status_code == 200
+        assert sum(b["count"] for b in response.json()["buckets"]) == 3
+        assert inverted.status_code == 400
+
+    def test_invalid_group_by(self, test_client, admin_token):
+        response = test_client.get(
+            "/api/audit/stats?group_by=details",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+
+        assert response.status_code == 422
+
+
+class TestAuditVerify:
+    """/api/audit/verify のテスト"""
+
+    def test_admin_verifies_and_reads_status(self, test_client, admin_token, seeded_audit_log):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        before = test_client.get("/api/audit/verify", headers=headers)
+        response = test_client.post("/api/audit/verify", headers=headers)
+        status = test_client.get("/api/audit/verify", headers=headers)
+
+        assert before.status_code == 404
+        assert response.status_code == 200
+        assert response.json()["status"] == "ok"
+        assert response.json()["new_records"] == 6
+        assert status.json()["verified_at"] == response.json()["verified_at"]
+
+    def test_operator_is_denied(self, test_client, auth_headers, seeded_audit_log):
+        response = test_client.post("/api/audit/verify", headers=auth_headers)
+
+        assert response.status_code == 403
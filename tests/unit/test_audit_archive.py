@@ -0,0 +1,251 @@
+"""
+監査ログのアーカイブ（日別ファイルの圧縮）のユニットテスト
+"""
+
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from backend.core import audit_archive
+from backend.core.audit_archive import (
+    AuditArchiveError,
+    archive_path,
+    read_index,
+    read_lines,
+    read_lines_reverse,
+    write_archive,
+)
+from backend.core.audit_log import AuditLog
+
+
+def _write_log(log_dir, day, count, user_id="user1"):
+    path = log_dir / f"audit_{day}.json"
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(
+                json.dumps(
+                    {
+                        "timestamp": f"{day[:4]}-{day[4:6]}-{day[6:]}T{i // 60 % 24:02d}:{i % 60:02d}:00",
+                        "operation": "op",
+                        "user_id": user_id,
+                        "target": "t",
+                        "status": "success",
+                        "details": {"n": i},
+                    }
+                )
+                + "\n"
+            )
+    return path
+
+
+def _age(path, seconds=3600):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+class TestArchiveFormat:
+    """audit_archive のテスト"""
+
+    def test_roundtrip_keeps_offsets(self, tmp_path):
+        """展開した行とオフセットが元ファイルと一致する"""
+        log_file = _write_log(tmp_path, "20260101", 200)
+        original = log_file.read_bytes()
+        expected = list(
+            itertools.accumulate(len(line) for line in original.splitlines(True))
+        )
+
+        archive = write_archive(log_file, block_raw_bytes=1024)
+
+        assert not log_file.exists()
+        index = read_index(archive)
+        assert index["raw_size"] == len(original)
+        assert index["summary"]["records"] == 200
+        assert len(index["blocks"]) > 1
+
+        forward = list(read_lines(archive))
+        assert b"\n".join(line for _, line in forward) + b"\n" == original
+        assert [offset for offset, _ in forward] == expected
+
+        reverse = list(read_lines_reverse(archive))
+        assert reverse[0][1] == forward[-1][1]
+        assert all(original[offset:].startswith(line) for offset, line in reverse)
+
+    def test_source_bytes_are_kept(self, tmp_path):
+        """空行・壊れた行・改行のない末尾の行も残し、後続の行のオフセットを変えない"""
+        log_file = _write_log(tmp_path, "20260101", 3)
+        with open(log_file, "ab") as f:
+            f.write(b"\n{broken\n")
+        _write_log(tmp_path, "20260101", 3)
+        with open(log_file, "ab") as f:
+            f.write(b'{"timestamp": "2026-01-01T1')
+        original = log_file.read_bytes()
+
+        archive = write_archive(log_file, block_raw_bytes=150)
+
+        index = read_index(archive)
+        assert b"".join(audit_archive.read_raw_lines(archive)) == original
+        assert index["raw_size"] == len(original)
+        assert index["summary"]["records"] == 6
+        # 改行で終わる行は元ファイルと同じオフセットで読める（書き込み途中の末尾は除く）
+        offset, expected = 0, []
+        for raw in original.splitlines(True):
+            offset += len(raw)
+            if raw.strip() and raw.endswith(b"\n"):
+                expected.append((offset, raw.strip()))
+        assert list(read_lines(archive)) == expected
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_cursor_survives_compression_with_blank_lines(self, tmp_path, order):
+        """空行や書き込み途中の末尾があっても、圧縮前のカーソルで続きを取得できる"""
+        log_file = _write_log(tmp_path, "20260101", 3)
+        with open(log_file, "ab") as f:
+            f.write(b"\n\n")
+        _write_log(tmp_path, "20260101", 3)
+        with open(log_file, "ab") as f:
+            f.write(b'{"timestamp": "2026-01-01T1')
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        first = list(
+            itertools.islice(audit_log.iter_query("Admin", "admin", order=order), 4)
+        )
+        _age(log_file)
+        assert len(audit_log.compress_sealed_segments(grace_seconds=0)) == 1
+
+        rest = list(
+            audit_log.iter_query("Admin", "admin", order=order, cursor=first[-1][1])
+        )
+
+        seen = [e["details"]["n"] for e, _ in first + rest]
+        expected = [0, 1, 2, 0, 1, 2]
+        assert seen == (expected if order == "asc" else expected[::-1])
+
+    def test_blocks_outside_range_are_not_decompressed(self, tmp_path):
+        """期間外のブロックは展開しない"""
+        archive = write_archive(
+            _write_log(tmp_path, "20260101", 600), block_raw_bytes=4096
+        )
+        blocks = len(read_index(archive)["blocks"])
+
+        with patch.object(
+            audit_archive.zlib, "decompress", wraps=audit_archive.zlib.decompress
+        ) as mock_decompress:
+            lines = list(
+                read_lines(
+                    archive,
+                    start_date=datetime(2026, 1, 1, 9, 0),
+                    end_date=datetime(2026, 1, 1, 9, 30),
+                )
+            )
+
+        assert lines
+        assert mock_decompress.call_count < blocks
+
+    def test_late_writes_are_appended(self, tmp_path):
+        """同じ日付のアーカイブが既にあれば、その後ろに追加する"""
+        log_file = _write_log(tmp_path, "20260101", 3)
+        write_archive(log_file)
+        _write_log(tmp_path, "20260101", 2, user_id="late")
+        archive = write_archive(log_file)
+
+        users = [json.loads(line)["user_id"] for _, line in read_lines(archive)]
+        assert users == ["user1"] * 3 + ["late"] * 2
+
+    def test_corrupted_archive(self, tmp_path):
+        path = tmp_path / "audit_20260101.json.blk"
+        path.write_bytes(b"garbage")
+
+        with pytest.raises(AuditArchiveError):
+            read_index(path)
+
+
+class TestAuditLogArchive:
+    """AuditLog の圧縮・検索のテスト"""
+
+    def test_records_roll_over_by_timestamp_date(self, tmp_path):
+        """レコードはタイムスタンプの日付のファイルに書き込まれる"""
+        audit_log = AuditLog(log_dir=tmp_path)
+        days = [datetime(2026, 1, 1, 23, 59, 59), datetime(2026, 1, 2, 0, 0, 1)]
+
+        with patch("backend.core.audit_log.datetime") as mock_datetime:
+            mock_datetime.now.side_effect = days
+            audit_log.record("op", "user1", "t", "success")
+            audit_log.record("op", "user1", "t", "success")
+        audit_log.close()
+
+        assert sorted(p.name for p in tmp_path.glob("audit_*.json")) == [
+            "audit_20260101.json",
+            "audit_20260102.json",
+        ]
+
+    def test_compress_sealed_segments(self, tmp_path):
+        """今日より前で、猶予時間を過ぎたファイルのみ圧縮する"""
+        old = _write_log(tmp_path, "20260101", 3)
+        recent = _write_log(tmp_path, "20260102", 3)
+        today = _write_log(tmp_path, datetime.now().strftime("%Y%m%d"), 3)
+        _age(old)
+        _age(today)
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        archived = audit_log.compress_sealed_segments(grace_seconds=600)
+
+        assert archived == [archive_path(old)]
+        assert recent.exists() and today.exists()
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_cursor_survives_compression(self, tmp_path, order):
+        """圧縮前に発行したカーソルで、圧縮後も重複・欠落なく続きを取得できる"""
+        _write_log(tmp_path, "20260101", 7)
+        _write_log(tmp_path, "20260102", 6)
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        first = list(
+            itertools.islice(audit_log.iter_query("Admin", "admin", order=order), 4)
+        )
+        for path in tmp_path.glob("audit_*.json"):
+            _age(path)
+        assert len(audit_log.compress_sealed_segments(grace_seconds=0)) == 2
+
+        rest = list(
+            audit_log.iter_query("Admin", "admin", order=order, cursor=first[-1][1])
+        )
+
+        seen = [(e["timestamp"][:10], e["details"]["n"]) for e, _ in first + rest]
+        expected = [("2026-01-01", n) for n in range(7)] + [
+            ("2026-01-02", n) for n in range(6)
+        ]
+        assert seen == (expected if order == "asc" else expected[::-1])
+
+    def test_query_reads_archive_and_late_writes(self, tmp_path):
+        """アーカイブ後に遅れて書き込まれた行も検索対象になる"""
+        log_file = _write_log(tmp_path, "20260101", 3)
+        write_archive(log_file)
+        _write_log(tmp_path, "20260101", 2, user_id="late")
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        asc = audit_log.query("Admin", "admin", order="asc")
+        desc = audit_log.query("Admin", "admin", order="desc")
+        late = audit_log.query("Admin", "admin", user_id="late")
+
+        assert [e["user_id"] for e in asc] == ["user1"] * 3 + ["late"] * 2
+        assert desc == asc[::-1]
+        assert len(late) == 2
+
+    def test_archiver_thread(self, tmp_path):
+        """アーカイブスレッドが起動時に圧縮し、停止できる"""
+        _age(_write_log(tmp_path, "20260101", 3))
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        audit_log.start_archiver(interval=3600)
+        for _ in range(100):
+            if archive_path(tmp_path / "audit_20260101.json").exists():
+                break
+            time.sleep(0.01)
+        audit_log.stop_archiver()
+
+        assert archive_path(tmp_path / "audit_20260101.json").exists()
+        assert audit_log._archiver is None
@@ -0,0 +1,148 @@
+"""
+監査ログのハッシュチェーン・検証のユニットテスト
+"""
+
+import json
+
+import pytest
+
+from backend.core.audit_archive import write_archive
+from backend.core.audit_chain import CHECKPOINT_FILE, GENESIS_HASH, record_hash
+from backend.core.audit_log import AuditLog
+
+
+@pytest.fixture
+def audit_log(tmp_path):
+    audit_log = AuditLog(log_dir=tmp_path, buffered=False, checkpoint_interval=5)
+    yield audit_log
+    audit_log.close()
+
+
+def _record(audit_log, count, start=0):
+    for i in range(start, start + count):
+        audit_log.record("op", "user1", "t", "success", details={"n": i})
+
+
+def _log_file(tmp_path):
+    (log_file,) = tmp_path.glob("audit_*.json")
+    return log_file
+
+
+def _rewrite(log_file, edit):
+    lines = log_file.read_text(encoding="utf-8").splitlines(keepends=True)
+    log_file.write_text("".join(edit(lines)), encoding="utf-8")
+
+
+class TestHashChain:
+    """レコードのハッシュチェーンのテスト"""
+
+    def test_records_are_chained(self, tmp_path, audit_log):
+        _record(audit_log, 3)
+
+        entries = [json.loads(line) for line in _log_file(tmp_path).read_text().splitlines()]
+
+        assert entries[0]["prev_hash"] == GENESIS_HASH
+        assert [e["prev_hash"] for e in entries[1:]] == [e["hash"] for e in entries[:-1]]
+        assert all(record_hash(e) == e["hash"] for e in entries)
+
+    def test_checkpoints_every_interval_and_on_close(self, tmp_path, audit_log):
+        _record(audit_log, 7)
+        audit_log.close()
+
+        checkpoints = [
+            json.loads(line) for line in (tmp_path / CHECKPOINT_FILE).read_text().splitlines()
+        ]
+
+        assert [cp["seq"] for cp in checkpoints] == [5, 7]
+        assert all(cp["writer"] == audit_log.writer_id for cp in checkpoints)
+
+
+class TestVerify:
+    """AuditLog.verify のテスト"""
+
+    def test_incremental_verification(self, audit_log):
+        """2回目以降は新たに追記されたレコードのみを検証する"""
+        _record(audit_log, 12)
+
+        first = audit_log.verify()
+        second = audit_log.verify()
+        _record(audit_log, 3, start=12)
+        third = audit_log.verify()
+
+        assert first["status"] == "ok"
+        assert (first["new_records"], first["new_checkpoints"]) == (12, 2)
+        assert second["new_records"] == 0
+        assert third["new_records"] == 3
+        assert third["records_verified"] == 15
+        assert audit_log.verification_status() == third
+
+    def test_modified_record(self, tmp_path, audit_log):
+        _record(audit_log, 4)
+        _rewrite(_log_file(tmp_path), lambda lines: [
+            line.replace('"success"', '"failure"') if i == 1 else line
+            for i, line in enumerate(lines)
+        ])
+
+        report = audit_log.verify()
+
+        assert report["status"] == "tampered"
+        assert [e["error"] for e in report["errors"]] == ["record hash mismatch"]
+        assert report["errors"][0]["seq"] == 2
+
+    def test_deleted_record(self, tmp_path, audit_log):
+        _record(audit_log, 4)
+        _rewrite(_log_file(tmp_path), lambda lines: lines[:1] + lines[2:])
+
+        report = audit_log.verify()
+
+        assert [e["error"] for e in report["errors"]] == ["chain broken"]
+
+    def test_truncated_tail_detected_by_checkpoint(self, tmp_path, audit_log):
+        """チェックポイント済みの末尾レコードを削除すると検出する"""
+        _record(audit_log, 5)
+        _rewrite(_log_file(tmp_path), lambda lines: lines[:3])
+
+        report = audit_log.verify()
+
+        assert [e["error"] for e in report["errors"]] == ["checkpointed record missing"]
+
+    def test_truncated_after_verification(self, tmp_path, audit_log):
+        _record(audit_log, 4)
+        audit_log.verify()
+        _rewrite(_log_file(tmp_path), lambda lines: lines[:2])
+
+        report = audit_log.verify()
+
+        assert [e["error"] for e in report["errors"]] == ["segment truncated"]
+
+    def test_forged_checkpoint(self, tmp_path, audit_log):
+        _record(audit_log, 5)
+        path = tmp_path / CHECKPOINT_FILE
+        checkpoint = json.loads(path.read_text())
+        checkpoint["hash"] = "f" * 64
+        path.write_text(json.dumps(checkpoint) + "\n")
+
+        report = audit_log.verify()
+
+        assert [e["error"] for e in report["errors"]] == ["invalid checkpoint signature"]
+
+    def test_archived_segment_continues(self, tmp_path, audit_log):
+        """検証済みのセグメントが圧縮されても続きから検証できる"""
+        _record(audit_log, 3)
+        audit_log.verify()
+        write_archive(_log_file(tmp_path))
+        _record(audit_log, 2, start=3)
+
+        report = audit_log.verify()
+
+        assert report["status"] == "ok"
+        assert report["new_records"] == 2
+
+    def test_full_reverification(self, audit_log):
+        _record(audit_log, 3)
+        audit_log.verify()
+
+        report = audit_log.verify(full=True)
+
+        assert report["new_records"] == 3
+        assert report["full"] is True
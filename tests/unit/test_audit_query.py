@@ -0,0 +1,164 @@
+"""
+監査ログ検索（並び順・カーソル）のユニットテスト
+"""
+
+import itertools
+import json
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.audit_archive import archive_path
+from backend.core.audit_log import AuditLog, AuditLogReadError, _read_lines_reverse, encode_cursor
+
+
+def _write_log(log_dir, day, count, user_id="user1"):
+    with open(log_dir / f"audit_{day}.json", "a", encoding="utf-8") as f:
+        for i in range(count):
+            f.write(json.dumps({
+                "timestamp": f"{day[:4]}-{day[4:6]}-{day[6:]}T00:00:{i % 60:02d}",
+                "operation": "op", "user_id": user_id, "target": "t",
+                "status": "success", "details": {"n": i},
+            }) + "\n")
+
+
+class TestReverseRead:
+    """_read_lines_reverse のテスト"""
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64, 65536])
+    def test_lines_in_reverse(self, tmp_path, block_size):
+        """ブロック境界に関係なく全行を逆順で返す"""
+        path = tmp_path / "log"
+        lines = [f"line-{i}-{'あ' * (i % 5)}".encode() for i in range(50)]
+        path.write_bytes(b"\n".join(lines) + b"\n")
+
+        result = list(_read_lines_reverse(path, block_size))
+
+        assert [line for _, line in result] == lines[::-1]
+        # オフセットは各行の先頭
+        data = path.read_bytes()
+        assert all(data[offset:].startswith(line) for offset, line in result)
+
+    @pytest.mark.parametrize("block_size", [1, 64])
+    def test_partial_last_line_is_skipped(self, tmp_path, block_size):
+        """改行のない末尾の行（書き込み途中）は返さない"""
+        path = tmp_path / "log"
+        path.write_bytes(b"a\nb")
+        assert list(_read_lines_reverse(path, block_size)) == [(0, b"a")]
+
+        path.write_bytes(b"b")
+        assert list(_read_lines_reverse(path, block_size)) == []
+
+
+class TestQueryOrder:
+    """AuditLog.query(order=...) のテスト"""
+
+    def test_desc_returns_newest_first(self, tmp_path):
+        """新しいファイル・新しい行から返す"""
+        _write_log(tmp_path, "20260101", 5)
+        _write_log(tmp_path, "20260102", 5)
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        results = audit_log.query(
+            user_role="Admin", requesting_user_id="admin", limit=7, order="desc"
+        )
+
+        assert [(r["timestamp"][:10], r["details"]["n"]) for r in results] == [
+            ("2026-01-02", 4), ("2026-01-02", 3), ("2026-01-02", 2), ("2026-01-02", 1),
+            ("2026-01-02", 0), ("2026-01-01", 4), ("2026-01-01", 3),
+        ]
+
+    def test_desc_reads_only_tail(self, tmp_path):
+        """limit 件揃えば古いファイルは読まない"""
+        _write_log(tmp_path, "20260101", 100)
+        _write_log(tmp_path, "20260102", 100)
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        with patch(
+            "backend.core.audit_log._read_lines_reverse", wraps=_read_lines_reverse
+        ) as mock_reverse:
+            results = audit_log.query(
+                user_role="Admin", requesting_user_id="admin", limit=10, order="desc"
+            )
+
+        assert len(results) == 10
+        assert mock_reverse.call_count == 1
+
+    def test_invalid_order(self, tmp_path):
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        with pytest.raises(ValueError):
+            audit_log.query(user_role="Admin", requesting_user_id="admin", order="random")
+
+
+class TestCursorPagination:
+    """AuditLog.iter_query のカーソルのテスト"""
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_pages_cover_all_entries_once(self, tmp_path, order):
+        """カーソルで続きを取得すると、全件を重複・欠落なく辿れる"""
+        _write_log(tmp_path, "20260101", 7)
+        _write_log(tmp_path, "20260102", 6)
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        seen = []
+        cursor = None
+        while True:
+            page = list(itertools.islice(
+                audit_log.iter_query("Admin", "admin", order=order, cursor=cursor), 4
+            ))
+            if not page:
+                break
+            seen.extend((e["timestamp"][:10], e["details"]["n"]) for e, _ in page)
+            cursor = page[-1][1]
+
+        expected = [("2026-01-01", n) for n in range(7)] + [("2026-01-02", n) for n in range(6)]
+        assert seen == (expected if order == "asc" else expected[::-1])
+
+    def test_cursor_order_mismatch(self, tmp_path):
+        """別の並び順で発行されたカーソルは拒否"""
+        _write_log(tmp_path, "20260101", 2)
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+        _, cursor = next(audit_log.iter_query("Admin", "admin", order="asc"))
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            audit_log.iter_query("Admin", "admin", order="desc", cursor=cursor)
+
+    @pytest.mark.parametrize("cursor", ["!!!", encode_cursor("../etc/passwd", 0, "asc")])
+    def test_invalid_cursor(self, tmp_path, cursor):
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            audit_log.iter_query("Admin", "admin", cursor=cursor)
+
+
+class TestReadErrors:
+    """読めないファイルは飛ばさずにエラーにする"""
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_corrupt_line_raises(self, tmp_path, order):
+        _write_log(tmp_path, "20260101", 3)
+        with open(tmp_path / "audit_20260101.json", "a", encoding="utf-8") as f:
+            f.write("{corrupt\n")
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        with pytest.raises(AuditLogReadError, match="audit_20260101.json"):
+            audit_log.query("Admin", "admin", order=order)
+
+    def test_corrupt_archive_raises(self, tmp_path):
+        _write_log(tmp_path, "20260101", 3)
+        archive_path(tmp_path / "audit_20260101.json").write_bytes(b"not an archive")
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        with pytest.raises(AuditLogReadError):
+            audit_log.query("Admin", "admin")
+
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    def test_partial_last_line_is_not_an_error(self, tmp_path, order):
+        """書き込み途中の末尾の行は壊れたレコードとして扱わない"""
+        _write_log(tmp_path, "20260101", 3)
+        with open(tmp_path / "audit_20260101.json", "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2026-01-01T0')
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+
+        assert len(audit_log.query("Admin", "admin", order=order)) == 3
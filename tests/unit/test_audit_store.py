@@ -0,0 +1,291 @@
+"""
+監査ログ索引ストアのユニットテスト
+"""
+
+import json
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from backend.core.audit_archive import archive_path, write_archive
+from backend.core.audit_log import AuditLog
+from backend.core.audit_store import AuditStore
+
+
+@pytest.fixture
+def indexed_audit_log(tmp_path):
+    audit_log = AuditLog(log_dir=tmp_path / "audit", db_path=tmp_path / "audit.db")
+    yield audit_log
+    audit_log.close()
+
+
+class TestAuditStore:
+    """AuditStore のテスト"""
+
+    def test_schema_uses_wal_and_indexes(self, tmp_path):
+        """WAL モードで作成され、検索用インデックスを持つ"""
+        store = AuditStore(tmp_path / "audit.db")
+        store.insert_many(
+            [{"timestamp": "2026-01-01T00:00:00", "operation": "op", "user_id": "u",
+              "target": "t", "status": "success", "details": {}, "writer": "w", "seq": 1}]
+        )
+        store.close()
+
+        conn = sqlite3.connect(tmp_path / "audit.db")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(audit_events)")}
+        assert {"idx_audit_timestamp", "idx_audit_user", "idx_audit_operation",
+                "idx_audit_status"} <= indexes
+        conn.close()
+
+    def test_import_is_idempotent(self, tmp_path):
+        """旧形式（writer/seq なし）の JSON を重複なく取り込む"""
+        log_file = tmp_path / "audit_20260101.json"
+        with open(log_file, "w", encoding="utf-8") as f:
+            for i in range(3):
+                f.write(json.dumps({
+                    "timestamp": f"2026-01-01T00:00:0{i}", "operation": "op",
+                    "user_id": f"user{i}", "target": "t", "status": "success", "details": {},
+                }) + "\n")
+            f.write("not json\n")
+
+        store = AuditStore(tmp_path / "audit.db")
+        assert store.import_file(log_file) == 3
+        assert store.import_file(log_file) == 0
+        store.close()
+
+    def test_import_archived_segment(self, tmp_path):
+        """圧縮済みのセグメントも取り込み、圧縮前に取り込んだレコードと重複しない"""
+        log_file = tmp_path / "audit_20260101.json"
+        with open(log_file, "w", encoding="utf-8") as f:
+            for i in range(5):
+                f.write(json.dumps({
+                    "timestamp": f"2026-01-01T00:00:0{i}", "operation": "op",
+                    "user_id": f"user{i}", "target": "t", "status": "success", "details": {},
+                }) + "\n")
+
+        before = AuditStore(tmp_path / "before.db")
+        assert before.import_file(log_file) == 5
+        write_archive(log_file, block_raw_bytes=200)
+        assert not log_file.exists()
+
+        # 封印後に遅れて書き込まれたレコードはアーカイブの後ろに続く
+        with open(log_file, "w", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "timestamp": "2026-01-01T23:59:59", "operation": "late",
+                "user_id": "user9", "target": "t", "status": "success", "details": {},
+            }) + "\n")
+
+        assert before.import_file(archive_path(log_file)) == 1
+        after = AuditStore(tmp_path / "after.db")
+        assert after.import_file(log_file) == 6
+        before.close()
+        after.close()
+
+        keys = [
+            sqlite3.connect(tmp_path / name).execute(
+                "SELECT writer, seq FROM audit_events ORDER BY seq"
+            ).fetchall()
+            for name in ("before.db", "after.db")
+        ]
+        assert keys[0] == keys[1]
+
+    @pytest.mark.asyncio
+    async def test_query_filters(self, tmp_path):
+        """索引付き列でのフィルタと期間指定"""
+        store = AuditStore(tmp_path / "audit.db")
+        store.insert_many(
+            {"timestamp": f"2026-01-0{day}T12:00:00", "operation": op, "user_id": "u1",
+             "target": "nginx", "status": "success", "details": {"day": day},
+             "writer": "w", "seq": day}
+            for day, op in [(1, "login"), (2, "service_restart"), (3, "service_restart")]
+        )
+
+        results = await store.query(
+            operation="service_restart", start_date=datetime(2026, 1, 3)
+        )
+
+        assert [r["details"]["day"] for r in results] == [3]
+        store.close()
+
+
+class TestAuditLogQueryAsync:
+    """AuditLog.query_async のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_records_are_indexed(self, indexed_audit_log):
+        """記録したレコードが索引ストアから検索できる"""
+        indexed_audit_log.record("service_restart", "user1", "nginx", "success")
+        indexed_audit_log.record("login", "user2", "system", "success")
+
+        results, next_cursor = await indexed_audit_log.query_async(
+            user_role="Admin", requesting_user_id="admin", operation="service_restart"
+        )
+
+        assert next_cursor is None
+        assert len(results) == 1
+        assert results[0]["user_id"] == "user1"
+        assert results[0]["seq"] == 1
+
+    @pytest.mark.asyncio
+    async def test_operator_sees_only_own_records(self, indexed_audit_log):
+        """Operator は自分のレコードのみ（他ユーザー指定は空）"""
+        indexed_audit_log.record("service_restart", "user1", "nginx", "success")
+        indexed_audit_log.record("service_restart", "user2", "nginx", "success")
+
+        own, _ = await indexed_audit_log.query_async(
+            user_role="Operator", requesting_user_id="user1"
+        )
+        other, _ = await indexed_audit_log.query_async(
+            user_role="Operator", requesting_user_id="user1", user_id="user2"
+        )
+
+        assert [r["user_id"] for r in own] == ["user1"]
+        assert other == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("order", ["asc", "desc"])
+    async def test_cursor_pagination(self, indexed_audit_log, order):
+        """次カーソルで続きを取得（同じ timestamp のレコードも飛ばさない）"""
+        for i in range(5):
+            indexed_audit_log.record("login", "user1", "system", "success", {"n": i})
+
+        pages, cursor = [], None
+        while True:
+            page, cursor = await indexed_audit_log.query_async(
+                user_role="Admin", requesting_user_id="admin", limit=2, order=order, cursor=cursor
+            )
+            pages.append([entry["details"]["n"] for entry in page])
+            if cursor is None:
+                break
+
+        expected = [0, 1, 2, 3, 4] if order == "asc" else [4, 3, 2, 1, 0]
+        assert pages == [expected[0:2], expected[2:4], expected[4:]]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor(self, indexed_audit_log):
+        """不正なカーソル・JSON ログ走査のカーソルは ValueError"""
+        indexed_audit_log.record("login", "user1", "system", "success")
+        indexed_audit_log.record("login", "user1", "system", "success")
+        indexed_audit_log.flush()
+        _, file_cursor = await AuditLog(log_dir=indexed_audit_log.log_dir).query_async(
+            user_role="Admin", requesting_user_id="admin", limit=1
+        )
+        assert file_cursor is not None
+
+        for cursor in ("bogus", file_cursor):
+            with pytest.raises(ValueError):
+                await indexed_audit_log.query_async(
+                    user_role="Admin", requesting_user_id="admin", cursor=cursor
+                )
+
+    @pytest.mark.asyncio
+    async def test_viewer_denied(self, indexed_audit_log):
+        """Viewer は監査ログにアクセス不可"""
+        with pytest.raises(PermissionError):
+            await indexed_audit_log.query_async(user_role="Viewer", requesting_user_id="v")
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_json_scan(self, tmp_path):
+        """索引ストアが無効な場合は JSON ログを検索"""
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False)
+        audit_log.record("service_restart", "user1", "nginx", "success")
+
+        results, next_cursor = await audit_log.query_async(
+            user_role="Admin", requesting_user_id="admin"
+        )
+
+        assert audit_log.store is None
+        assert len(results) == 1
+        assert next_cursor is None
+
+
+def _event(timestamp, seq, operation="service_restart", target="nginx", user_id="u1",
+           status="success"):
+    return {"timestamp": timestamp, "operation": operation, "user_id": user_id,
+            "target": target, "status": status, "details": {}, "writer": "w", "seq": seq}
+
+
+class TestAuditRollups:
+    """集計テーブルのテスト"""
+
+    @pytest.mark.asyncio
+    async def test_rollups_are_maintained_on_insert(self, tmp_path):
+        """登録時に日次・時間別の件数が加算され、重複登録は数えない"""
+        store = AuditStore(tmp_path / "audit.db")
+        events = [
+            _event("2026-01-01T10:00:00", 1),
+            _event("2026-01-01T10:30:00", 2, target="postgresql"),
+            _event("2026-01-01T11:00:00", 3),
+            _event("2026-01-02T09:00:00", 4),
+        ]
+        store.insert_many(events)
+        store.insert_many(events)
+
+        daily = await store.stats(group_by=["target"])
+        hourly = await store.stats(granularity="hour", group_by=[], end_date=datetime(2026, 1, 1, 23))
+
+        assert daily == [
+            {"bucket": "2026-01-01", "target": "nginx", "count": 2},
+            {"bucket": "2026-01-01", "target": "postgresql", "count": 1},
+            {"bucket": "2026-01-02", "target": "nginx", "count": 1},
+        ]
+        assert hourly == [
+            {"bucket": "2026-01-01T10", "count": 2},
+            {"bucket": "2026-01-01T11", "count": 1},
+        ]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_rollups_rebuilt_for_existing_database(self, tmp_path):
+        """集計導入前に登録済みのレコードも集計する"""
+        store = AuditStore(tmp_path / "audit.db")
+        store.insert_many([_event("2026-01-01T10:00:00", 1)])
+        store.close()
+
+        conn = sqlite3.connect(tmp_path / "audit.db")
+        conn.execute("DROP TRIGGER trg_audit_rollup")
+        conn.execute("DELETE FROM audit_rollups")
+        conn.commit()
+        conn.close()
+
+        store = AuditStore(tmp_path / "audit.db")
+        store.insert_many([_event("2026-01-01T12:00:00", 2)])
+
+        assert await store.stats(group_by=[]) == [{"bucket": "2026-01-01", "count": 2}]
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_group_by(self, tmp_path):
+        store = AuditStore(tmp_path / "audit.db")
+
+        with pytest.raises(ValueError):
+            await store.stats(group_by=["details"])
+
+
+class TestAuditLogStats:
+    """AuditLog.stats_async のテスト"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("indexed", [True, False])
+    async def test_stats_with_and_without_store(self, tmp_path, indexed):
+        """索引ストアの集計と JSON 走査の集計が一致し、Operator は自分の分のみ"""
+        audit_log = AuditLog(
+            log_dir=tmp_path / "audit",
+            db_path=tmp_path / "audit.db" if indexed else None,
+            buffered=False,
+        )
+        audit_log.record("login", "user1", "system", "failure")
+        audit_log.record("login", "user1", "system", "failure")
+        audit_log.record("login", "user2", "system", "failure")
+
+        admin = await audit_log.stats_async(
+            "Admin", "admin", granularity="hour", group_by=["user_id"], status="failure"
+        )
+        operator = await audit_log.stats_async("Operator", "user2", group_by=["user_id"])
+
+        assert [(row["user_id"], row["count"]) for row in admin] == [("user1", 2), ("user2", 1)]
+        assert len(admin[0]["bucket"]) == 13
+        assert [(row["user_id"], row["count"]) for row in operator] == [("user2", 1)]
+        audit_log.close()
@@ -0,0 +1,121 @@
+"""
+監査ログのファイル絞り込み（日付・サマリ）のユニットテスト
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from backend.core.audit_log import AuditLog
+from backend.core.audit_summary import load_summary, summary_path
+
+
+def _write_log(log_dir, day, entries):
+    log_file = log_dir / f"audit_{day}.json"
+    with open(log_file, "a", encoding="utf-8") as f:
+        for timestamp, user_id, operation in entries:
+            f.write(json.dumps({
+                "timestamp": timestamp, "operation": operation, "user_id": user_id,
+                "target": "nginx", "status": "success", "details": {},
+            }) + "\n")
+    return log_file
+
+
+class TestAuditSummary:
+    """サイドカーサマリのテスト"""
+
+    def test_summary_is_built_and_extended(self, tmp_path):
+        """初回に生成し、追記分だけ読み足す"""
+        log_file = _write_log(tmp_path, "20260101", [
+            ("2026-01-01T10:00:00", "user1", "login"),
+            ("2026-01-01T11:00:00", "user2", "service_restart"),
+        ])
+
+        summary = load_summary(log_file)
+        assert summary_path(log_file).exists()
+        assert summary["records"] == 2
+        assert summary["users"] == {"user1": 1, "user2": 1}
+        assert summary["min_timestamp"] == "2026-01-01T10:00:00"
+
+        _write_log(tmp_path, "20260101", [("2026-01-01T12:00:00", "user1", "login")])
+        summary = load_summary(log_file)
+        assert summary["records"] == 3
+        assert summary["users"]["user1"] == 2
+        assert summary["max_timestamp"] == "2026-01-01T12:00:00"
+        assert summary["size"] == log_file.stat().st_size
+
+    def test_partial_line_is_not_summarized(self, tmp_path):
+        """書き込み途中の行はサマリに含めない"""
+        log_file = _write_log(tmp_path, "20260101", [("2026-01-01T10:00:00", "u", "op")])
+        complete_size = log_file.stat().st_size
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2026-01-01T1')
+
+        summary = load_summary(log_file)
+        assert summary["records"] == 1
+        assert summary["size"] == complete_size
+
+    def test_concurrent_updates_from_threads(self, tmp_path, caplog):
+        """同一プロセスの複数スレッドが同時に更新しても一時ファイルが衝突しない"""
+        log_file = _write_log(tmp_path, "20260101", [
+            (f"2026-01-01T10:00:{i:02d}", "u", "op") for i in range(50)
+        ])
+
+        def update():
+            for _ in range(20):
+                summary_path(log_file).unlink(missing_ok=True)
+                load_summary(log_file)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for future in [executor.submit(update) for _ in range(8)]:
+                future.result()
+
+        assert "Failed to write audit log summary" not in caplog.text
+        assert load_summary(log_file)["records"] == 50
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestQueryPlanning:
+    """AuditLog._plan_files のテスト"""
+
+    def _setup(self, tmp_path):
+        _write_log(tmp_path, "20260101", [("2026-01-01T10:00:00", "user1", "login")])
+        _write_log(tmp_path, "20260102", [("2026-01-02T10:00:00", "user2", "service_restart")])
+        _write_log(tmp_path, "20260103", [("2026-01-03T10:00:00", "user1", "service_restart")])
+        return AuditLog(log_dir=tmp_path, buffered=False)
+
+    def test_date_range_prunes_files(self, tmp_path):
+        """期間外のファイルは対象外"""
+        audit_log = self._setup(tmp_path)
+
+        files = audit_log._plan_files(
+            start_date=datetime(2026, 1, 2), end_date=datetime(2026, 1, 2, 23, 59)
+        )
+
+        assert [f.name for f in files] == ["audit_20260102.json"]
+
+    def test_future_files_are_not_opened(self, tmp_path):
+        """end_date より後の日付のファイルはサマリも作らない"""
+        audit_log = self._setup(tmp_path)
+
+        audit_log._plan_files(end_date=datetime(2026, 1, 1, 23, 59))
+
+        assert not summary_path(tmp_path / "audit_20260103.json").exists()
+
+    def test_user_and_operation_prune_files(self, tmp_path):
+        """ユーザー・操作種別が含まれないファイルは対象外"""
+        audit_log = self._setup(tmp_path)
+
+        files = audit_log._plan_files(user_id="user1", operation="service_restart")
+
+        assert [f.name for f in files] == ["audit_20260103.json"]
+
+    def test_query_results_unchanged(self, tmp_path):
+        """絞り込み後も検索結果は全走査と同じ"""
+        audit_log = self._setup(tmp_path)
+
+        results = audit_log.query(
+            user_role="Operator", requesting_user_id="user1", start_date=datetime(2026, 1, 2)
+        )
+
+        assert [r["timestamp"] for r in results] == ["2026-01-03T10:00:00"]
@@ -0,0 +1,175 @@
+"""
+監査ログ グループコミット書き込みのユニットテスト
+"""
+
+import json
+import multiprocessing
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.audit_log import AuditLog
+
+
+def _read_entries(audit_log: AuditLog) -> list[dict]:
+    with open(audit_log.log_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestAuditWriter:
+    """AuditWriter のテスト"""
+
+    def test_records_are_batched(self, tmp_path):
+        """複数レコードが1回の fsync でまとめて書き込まれる"""
+        audit_log = AuditLog(log_dir=tmp_path, buffered=True, flush_interval=1.0)
+
+        with patch("backend.core.audit_log.os.fsync") as mock_fsync:
+            for i in range(50):
+                audit_log.record("op", f"user{i}", "system", "success")
+            audit_log.flush()
+
+        assert len(_read_entries(audit_log)) == 50
+        assert mock_fsync.call_count == 1
+        audit_log.close()
+
+    def test_record_order_is_preserved_across_threads(self, tmp_path):
+        """複数スレッドからの記録も欠落・行の破損なく書き込まれる"""
+        audit_log = AuditLog(log_dir=tmp_path, buffered=True, fsync_policy="none")
+
+        def worker(n):
+            for i in range(200):
+                audit_log.record("op", f"t{n}", "system", "success", {"seq": i})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        audit_log.flush()
+
+        entries = _read_entries(audit_log)
+        assert len(entries) == 800
+        for n in range(4):
+            seqs = [e["details"]["seq"] for e in entries if e["user_id"] == f"t{n}"]
+            assert seqs == list(range(200))
+        audit_log.close()
+
+    def test_durable_record_is_fsynced_before_return(self, tmp_path):
+        """durable=True は fsync 完了後に戻る（fsync_policy=none でも）"""
+        audit_log = AuditLog(
+            log_dir=tmp_path, buffered=True, flush_interval=10.0, fsync_policy="none"
+        )
+
+        with patch("backend.core.audit_log.os.fsync") as mock_fsync:
+            audit_log.record("service_restart", "user1", "nginx", "attempt", durable=True)
+            assert mock_fsync.call_count == 1
+
+        assert _read_entries(audit_log)[0]["operation"] == "service_restart"
+        audit_log.close()
+
+    def test_fsync_policy_record(self, tmp_path):
+        """fsync_policy=record ではレコード毎に fsync"""
+        audit_log = AuditLog(
+            log_dir=tmp_path, buffered=True, flush_interval=0.2, fsync_policy="record"
+        )
+
+        with patch("backend.core.audit_log.os.fsync") as mock_fsync:
+            for i in range(5):
+                audit_log.record("op", "user", "system", "success")
+            audit_log.flush()
+
+        assert mock_fsync.call_count == 5
+        audit_log.close()
+
+    def test_durable_write_failure_is_raised(self, tmp_path):
+        """durable 書き込みの失敗は呼び出し元に伝わる"""
+        audit_log = AuditLog(log_dir=tmp_path, buffered=True)
+
+        with patch("backend.core.audit_log.os.fsync", side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                audit_log.record("op", "user", "system", "attempt", durable=True)
+        audit_log.close()
+
+    def test_close_flushes_and_restarts(self, tmp_path):
+        """close() で残りを書き込み、その後の記録でスレッドが再起動する"""
+        audit_log = AuditLog(log_dir=tmp_path, buffered=True, flush_interval=10.0)
+
+        audit_log.record("op", "user", "system", "success")
+        audit_log.close()
+        assert len(_read_entries(audit_log)) == 1
+
+        audit_log.record("op", "user", "system", "success")
+        audit_log.flush()
+        assert len(_read_entries(audit_log)) == 2
+        audit_log.close()
+
+    def test_unbuffered_mode_writes_synchronously(self, tmp_path):
+        """buffered=False では即時に書き込まれる"""
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False, fsync_policy="none")
+
+        audit_log.record("op", "user", "system", "success")
+
+        entries = _read_entries(audit_log)
+        assert len(entries) == 1
+        assert entries[0]["seq"] == 1
+
+
+def _write_from_worker(log_dir, count):
+    """別プロセスから PIPE_BUF を超えるレコードを書き込む"""
+    audit_log = AuditLog(log_dir=log_dir, buffered=True, max_batch_size=8, fsync_policy="none")
+    for i in range(count):
+        audit_log.record("op", "worker", "system", "success", {"seq": i, "pad": "x" * 8192})
+    audit_log.close()
+
+
+class TestMultiWorkerAppend:
+    """複数ワーカープロセスからの追記のテスト"""
+
+    def test_concurrent_processes_do_not_tear_lines(self, tmp_path):
+        """4プロセス同時書き込みでも行が混ざらず、writer 毎の seq が連続する"""
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_write_from_worker, args=(tmp_path, 100)) for _ in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+            assert p.exitcode == 0
+
+        log_file = next(tmp_path.glob("audit_*.json"))
+        with open(log_file, encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f]
+
+        assert len(entries) == 400
+        by_writer: dict[str, list[int]] = {}
+        for entry in entries:
+            by_writer.setdefault(entry["writer"], []).append(entry["seq"])
+        assert len(by_writer) == 4
+        for seqs in by_writer.values():
+            assert seqs == list(range(1, 101))
+
+    def test_oversized_record_is_truncated(self, tmp_path):
+        """max_record_bytes を超えるレコードは details を切り詰めて記録"""
+        audit_log = AuditLog(log_dir=tmp_path, buffered=False, max_record_bytes=1024)
+
+        audit_log.record("op", "user", "system", "success", {"pad": "x" * 4096})
+
+        entry = _read_entries(audit_log)[0]
+        assert entry["details"]["truncated"] is True
+        assert entry["details"]["original_bytes"] > 4096
+        assert entry["operation"] == "op"
+
+    def test_reset_after_fork_starts_new_writer(self, tmp_path):
+        """fork 後は新しい writer ID と seq=1 から記録する"""
+        audit_log = AuditLog(log_dir=tmp_path, buffered=True)
+        audit_log.record("op", "user", "system", "success")
+        parent_writer = audit_log.writer_id
+
+        audit_log.reset_after_fork()
+        audit_log.record("op", "user", "system", "success")
+        audit_log.flush()
+
+        entries = _read_entries(audit_log)
+        assert entries[-1]["writer"] != parent_writer
+        assert entries[-1]["seq"] == 1
+        audit_log.close()
@@ -2,7 +2,26 @@
 認証・認可のユニットテスト
 """
 
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
 import pytest
+from fastapi import HTTPException
+from jose import JWTError
+
+from backend.core.auth import (
+    ROLE_MASKS,
+    ROLES,
+    TokenCache,
+    TokenData,
+    create_access_token,
+    decode_token,
+    permission_mask,
+    permission_names,
+    require_permission,
+    token_cache,
+)
 
 
 class TestAuthentication:
@@ -97,3 +116,114 @@ class TestAuthorization:
 
         # 権限チェックは通過（sudo ラッパーの実行結果は問わない）
         assert response.status_code != 403
+
+
+class TestTokenCache:
+    """検証済みトークンキャッシュのテスト"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        token_cache.clear()
+        yield
+        token_cache.clear()
+
+    def _token(self, **kwargs):
+        return create_access_token(
+            {"sub": "user_002", "username": "operator", "role": "Operator"}, **kwargs
+        )
+
+    def test_second_decode_skips_verification(self):
+        token = self._token()
+
+        first = decode_token(token)
+        hits = token_cache.stats()["hits"]
+        with patch("jose.jwt.decode") as mock_decode:
+            second = decode_token(token)
+
+        assert second == first
+        mock_decode.assert_not_called()
+        assert token_cache.stats()["hits"] == hits + 1
+
+    def test_expired_entry_is_rejected(self):
+        """キャッシュ済みでも exp を過ぎたトークンは拒否する"""
+        token = self._token(expires_delta=timedelta(seconds=30))
+        decode_token(token)
+
+        with patch("backend.core.auth.time.time", return_value=time.time() + 60), patch(
+            "jose.jwt.decode", side_effect=JWTError("Signature has expired.")
+        ) as mock_decode:
+            with pytest.raises(HTTPException) as exc_info:
+                decode_token(token)
+
+        mock_decode.assert_called_once()
+        assert exc_info.value.status_code == 401
+
+    def test_invalid_token_is_not_cached(self):
+        with pytest.raises(HTTPException):
+            decode_token("invalid.token.value")
+
+        assert token_cache.stats()["size"] == 0
+
+    def test_lru_eviction(self):
+        cache = TokenCache(maxsize=2)
+        data = TokenData(user_id="u", username="u", role="Viewer")
+        expires_at = time.time() + 60
+        for token in ("a", "b"):
+            cache.put(token, data, expires_at)
+
+        cache.get("a")
+        cache.put("c", data, expires_at)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is data
+        assert cache.stats() == {"hits": 2, "misses": 1, "size": 2, "maxsize": 2}
+
+
+class TestPermissionBits:
+    """権限ビットマスクのテスト"""
+
+    def test_role_masks_match_role_definitions(self):
+        for name, role in ROLES.items():
+            assert permission_names(ROLE_MASKS[name]) == role.permissions
+
+    def test_unknown_permission_rejected_at_definition(self):
+        with pytest.raises(ValueError):
+            require_permission("read:everything")
+
+    @pytest.mark.asyncio
+    async def test_multiple_permissions(self):
+        check = require_permission("read:audit", "verify:audit")
+        admin = TokenData(user_id="u3", username="admin", role="Admin")
+        operator = TokenData(user_id="u2", username="operator", role="Operator")
+
+        assert await check(current_user=admin) is admin
+        with pytest.raises(HTTPException) as exc_info:
+            await check(current_user=operator)
+
+        assert exc_info.value.status_code == 403
+        assert exc_info.value.detail == "Permission denied: verify:audit required"
+
+    @pytest.mark.asyncio
+    async def test_invalid_role(self):
+        check = require_permission("read:status")
+
+        with pytest.raises(HTTPException) as exc_info:
+            await check(current_user=TokenData(user_id="u", username="u", role="Root"))
+
+        assert exc_info.value.detail == "Invalid role: Root"
+
+    def test_perm_claim_cannot_exceed_role(self):
+        """perm クレームはロールの権限の範囲内でのみ有効"""
+        token = create_access_token({
+            "sub": "user_001", "username": "viewer", "role": "Viewer",
+            "perm": permission_mask(["read:status", "manage:users"]),
+        })
+
+        token_data = decode_token(token)
+
+        assert permission_names(token_data.permission_mask) == ["read:status"]
+
+    def test_me_lists_permissions_from_mask(self, test_client, auth_headers):
+        response = test_client.get("/api/auth/me", headers=auth_headers)
+
+        assert response.json()["permissions"] == ROLES["Operator"].permissions
@@ -0,0 +1,83 @@
+"""
+列指向の応答形式（format=columnar）のユニットテスト
+"""
+
+from typing import Optional
+from unittest.mock import patch
+
+from pydantic import BaseModel
+
+from backend.core import sudo_wrapper
+from backend.core.columnar import column_schema, to_columnar
+
+PROCESS = {
+    "pid": 1,
+    "user": "root",
+    "cpu_percent": 0.5,
+    "mem_percent": 0.1,
+    "vsz": 1000,
+    "rss": 500,
+    "tty": "?",
+    "stat": "Ss",
+    "start": "Jan15",
+    "time": "0:01",
+    "command": "/sbin/init",
+}
+
+PROCESS_RESULT = {
+    "status": "success",
+    "total_processes": 10,
+    "returned_processes": 2,
+    "sort_by": "cpu",
+    "filters": {"user": None, "min_cpu": 0.0, "min_mem": 0.0},
+    "processes": [PROCESS, {**PROCESS, "pid": 2, "user": "www-data", "command": "nginx"}],
+    "timestamp": "2025-01-15T03:12:00+09:00",
+}
+
+
+class Row(BaseModel):
+    name: str
+    count: int
+    note: Optional[str] = None
+
+
+class TestColumnar:
+    """to_columnar のテスト"""
+
+    def test_schema(self):
+        schema = [(f.name, f.type, f.nullable) for f in column_schema(Row)]
+
+        assert schema == [
+            ("name", "string", False),
+            ("count", "integer", False),
+            ("note", "string", True),
+        ]
+
+    def test_columns(self):
+        table = to_columnar(Row, [Row(name="a", count=1), Row(name="b", count=2, note="x")])
+
+        assert table.columns == [["a", "b"], [1, 2], [None, "x"]]
+
+
+class TestProcessesColumnar:
+    """GET /api/processes?format=columnar のテスト"""
+
+    def _get(self, test_client, auth_headers, query):
+        with patch.object(sudo_wrapper, "get_processes", return_value=PROCESS_RESULT):
+            return test_client.get(f"/api/processes{query}", headers=auth_headers)
+
+    def test_same_data_as_rows(self, test_client, auth_headers):
+        rows = self._get(test_client, auth_headers, "").json()
+        columnar = self._get(test_client, auth_headers, "?format=columnar").json()
+
+        assert columnar["format"] == "columnar"
+        assert columnar["returned_processes"] == rows["returned_processes"]
+        table = columnar["processes"]
+        names = [field["name"] for field in table["fields"]]
+        rebuilt = [dict(zip(names, values)) for values in zip(*table["columns"])]
+        assert rebuilt == rows["processes"]
+
+    def test_invalid_format(self, test_client, auth_headers):
+        response = self._get(test_client, auth_headers, "?format=csv")
+
+        assert response.status_code == 422
@@ -0,0 +1,152 @@
+"""
+応答の圧縮と静的ファイルの配信のユニットテスト
+"""
+
+import gzip
+import os
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response
+from fastapi.testclient import TestClient
+
+from backend.api.compression import CompressionMiddleware, negotiate_encoding
+from backend.api.static_files import PrecompressedStaticFiles, content_hash
+
+LARGE = "x" * 4096
+
+
+@pytest.fixture
+def compressed_client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/large")
+    def large():
+        return Response(LARGE, media_type="application/json", headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/gzip-file")
+    def gzip_file():
+        return Response(gzip.compress(LARGE.encode()), media_type="application/gzip")
+
+    return TestClient(app)
+
+
+class TestNegotiateEncoding:
+    """negotiate_encoding のテスト"""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, None),
+            ("gzip", "gzip"),
+            ("gzip, br", "br"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("gzip;q=0", None),
+            ("*", "br"),
+            ("identity", None),
+        ],
+    )
+    def test_preference(self, header, expected):
+        assert negotiate_encoding(header, ("br", "gzip")) == expected
+
+
+class TestCompressionMiddleware:
+    """CompressionMiddleware のテスト"""
+
+    def test_large_response_gzipped(self, compressed_client):
+        response = compressed_client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.text == LARGE
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == 'W/"abc"'
+        assert int(response.headers["content-length"]) < len(LARGE)
+
+    def test_not_accepted(self, compressed_client):
+        response = compressed_client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.headers["etag"] == '"abc"'
+
+    @pytest.mark.parametrize("path", ["/small", "/gzip-file"])
+    def test_not_compressed(self, compressed_client, path):
+        response = compressed_client.get(path, headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_streaming_flushed_per_chunk(self):
+        async def app(scope, receive, send):
+            headers = [(b"content-type", b"application/x-ndjson")]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"line 1\n", "more_body": True})
+            await send({"type": "http.response.body", "body": b"line 2\n"})
+
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        await CompressionMiddleware(app)(scope, None, send)
+
+        start, first, last = messages
+        assert (b"content-encoding", b"gzip") in start["headers"]
+        # 各チャンクはその時点で展開できる（バッファに溜めずに送っている）
+        decompressor = zlib.decompressobj(31)
+        assert decompressor.decompress(first["body"]) == b"line 1\n"
+        assert decompressor.decompress(last["body"]) == b"line 2\n"
+        assert decompressor.eof
+
+
+class TestPrecompressedStaticFiles:
+    """PrecompressedStaticFiles のテスト"""
+
+    @pytest.fixture
+    def static_dir(self, tmp_path):
+        source = tmp_path / "app.js"
+        source.write_text(LARGE)
+        (tmp_path / "app.js.gz").write_bytes(gzip.compress(LARGE.encode()))
+        return tmp_path
+
+    @pytest.fixture
+    def client(self, static_dir):
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware)
+        app.mount("/js", PrecompressedStaticFiles(directory=str(static_dir)), name="js")
+        return TestClient(app)
+
+    def test_precompressed_served(self, client):
+        response = client.get("/js/app.js", headers={"Accept-Encoding": "gzip"})
+
+        assert response.text == LARGE
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["content-type"].startswith("text/javascript")
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_stale_precompressed_ignored(self, client, static_dir):
+        mtime = os.stat(static_dir / "app.js").st_mtime
+        os.utime(static_dir / "app.js.gz", (mtime - 10, mtime - 10))
+
+        response = client.get("/js/app.js", headers={"Accept-Encoding": "identity"})
+
+        assert response.text == LARGE
+        assert "content-encoding" not in response.headers
+
+    def test_cache_control_by_content_hash(self, client):
+        digest = content_hash(LARGE.encode())
+
+        current = client.get(f"/js/app.js?v={digest}")
+        outdated = client.get("/js/app.js?v=0000000000000000")
+        unversioned = client.get("/js/app.js")
+
+        assert current.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert outdated.headers["cache-control"] == "no-cache"
+        assert unversioned.headers["cache-control"] == "no-cache"
@@ -0,0 +1,151 @@
+"""
+設定の再読み込みのユニットテスト
+"""
+
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from backend.core.config import ConfigManager, SettingsProxy
+from backend.core.file_watcher import FileWatcher
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "dev.json"
+    path.write_text((PROJECT_ROOT / "config" / "dev.json").read_text(encoding="utf-8"))
+    return path
+
+
+def _update(path, section, key, value):
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data[section][key] = value
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestConfigManager:
+    """ConfigManager のテスト"""
+
+    def test_reload_swaps_settings(self, config_file):
+        manager = ConfigManager("dev", config_file)
+        proxy = SettingsProxy(manager)
+        before = manager.current
+        changes = []
+        manager.subscribe(lambda old, new: changes.append((old, new)))
+
+        _update(config_file, "security", "allowed_services", ["nginx"])
+        assert manager.reload() is True
+
+        assert proxy.security.allowed_services == ["nginx"]
+        assert before.security.allowed_services == ["nginx", "postgresql", "redis"]
+        assert manager.reload_count == 1
+        assert changes == [(before, manager.current)]
+
+    def test_invalid_config_keeps_current(self, config_file):
+        manager = ConfigManager("dev", config_file)
+        before = manager.current
+
+        _update(config_file, "logging", "level", "VERBOSE")
+        assert manager.reload() is False
+
+        assert manager.current is before
+        assert manager.reload_count == 0
+        assert "ValidationError" in manager.status()["last_error"]
+
+    def test_validator_rejects_config(self, config_file):
+        manager = ConfigManager("dev", config_file)
+
+        def reject_debug(config):
+            if config.features.debug_mode:
+                raise RuntimeError("debug mode not allowed")
+
+        manager.add_validator(reject_debug)
+        assert manager.reload() is False
+        assert manager.last_error == "RuntimeError: debug mode not allowed"
+
+    def test_restart_required_fields_not_applied(self, config_file):
+        manager = ConfigManager("dev", config_file)
+        http_port = manager.current.server.http_port
+
+        _update(config_file, "server", "http_port", 9999)
+        _update(config_file, "logging", "level", "DEBUG")
+        assert manager.reload() is True
+
+        assert manager.current.server.http_port == http_port
+        assert manager.current.logging.level == "DEBUG"
+
+    def test_failing_subscriber_does_not_block_others(self, config_file):
+        manager = ConfigManager("dev", config_file)
+        called = []
+
+        def broken(old, new):
+            raise RuntimeError("boom")
+
+        manager.subscribe(broken)
+        manager.subscribe(lambda old, new: called.append(new))
+
+        assert manager.reload() is True
+        assert called == [manager.current]
+
+
+class TestFileWatcher:
+    """FileWatcher のテスト"""
+
+    @pytest.mark.parametrize("mode", ["inotify", "polling"])
+    def test_detects_replace(self, tmp_path, monkeypatch, mode):
+        path = tmp_path / "dev.json"
+        path.write_text("{}")
+        changed = threading.Event()
+        watcher = FileWatcher(path, changed.set, poll_interval=0.05, debounce=0.01)
+        if mode == "polling":
+            monkeypatch.setattr(watcher, "_inotify_fd", lambda: None)
+
+        watcher.start()
+        try:
+            # 一時ファイルからの rename での置き換え
+            tmp = tmp_path / "dev.json.tmp"
+            tmp.write_text('{"changed": true}')
+            tmp.replace(path)
+
+            assert changed.wait(5)
+        finally:
+            watcher.stop()
+
+        assert watcher.mode == mode
+
+    def test_ignores_other_files(self, tmp_path):
+        path = tmp_path / "dev.json"
+        path.write_text("{}")
+        changed = threading.Event()
+        watcher = FileWatcher(path, changed.set, poll_interval=0.05, debounce=0.01)
+
+        watcher.start()
+        try:
+            (tmp_path / "other.json").write_text("{}")
+            assert not changed.wait(0.3)
+        finally:
+            watcher.stop()
+
+
+class TestConfigApi:
+    """/api/system/config のテスト"""
+
+    def test_status_requires_manage_settings(self, test_client, auth_headers):
+        response = test_client.get("/api/system/config", headers=auth_headers)
+
+        assert response.status_code == 403
+
+    def test_reload(self, test_client, admin_token):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        response = test_client.post("/api/system/config/reload", headers=headers)
+
+        assert response.status_code == 200
+        assert response.json()["applied"] is True
+        status = test_client.get("/api/system/config", headers=headers).json()
+        assert status["reload_count"] >= 1
+        assert status["last_error"] is None
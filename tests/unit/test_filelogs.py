@@ -0,0 +1,255 @@
+"""
+ファイルログ閲覧のユニットテスト
+
+読み取りヘルパー（wrappers/adminui-filelog-reader.py）と API エンドポイントを検証
+"""
+
+import gzip
+import importlib.util
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+READER_PATH = Path(__file__).parent.parent.parent / "wrappers" / "adminui-filelog-reader.py"
+
+
+@pytest.fixture(scope="module")
+def reader():
+    """読み取りヘルパーをモジュールとして読み込む"""
+    spec = importlib.util.spec_from_file_location("adminui_filelog_reader", READER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # プロセスプールのワーカーへ関数を渡すため sys.modules に登録する
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    yield module
+    sys.modules.pop(spec.name, None)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    """10行のログファイル（現行 + .1 + .2.gz）"""
+    base = tmp_path / "app.log"
+    base.write_text("".join(f"current {i}\n" for i in range(10)))
+    (tmp_path / "app.log.1").write_text("".join(f"rotated {i}\n" for i in range(5)))
+    with gzip.open(tmp_path / "app.log.2.gz", "wt") as f:
+        f.write("".join(f"compressed {i}\n" for i in range(5)))
+    return base
+
+
+class TestFileLogReader:
+    """読み取りヘルパーのテスト"""
+
+    def test_tail_returns_last_lines_in_order(self, reader, log_file):
+        """末尾から指定行数を古い順で返す"""
+        result = reader.read_tail(str(log_file), 3)
+
+        assert result["lines"] == ["current 7", "current 8", "current 9"]
+        assert result["generation"] == 0
+        assert result["next_cursor"] is not None
+
+    def test_cursor_pages_backwards_into_rotated_files(self, reader, log_file):
+        """カーソルで過去方向にページングし、ローテート済みファイルへ移る"""
+        collected = []
+        cursor = None
+        while True:
+            result = reader.read_tail(str(log_file), 4, cursor)
+            collected = result["lines"] + collected
+            cursor = result["next_cursor"]
+            if cursor is None:
+                break
+
+        assert collected[:5] == [f"compressed {i}" for i in range(5)]
+        assert collected[5:10] == [f"rotated {i}" for i in range(5)]
+        assert collected[10:] == [f"current {i}" for i in range(10)]
+
+    def test_cursor_survives_rotation(self, reader, log_file):
+        """ページング中のローテート（rename）後も同じ inode を追跡する"""
+        first = reader.read_tail(str(log_file), 3)
+
+        log_file.parent.joinpath("app.log.1").rename(log_file.parent / "app.log.3")
+        log_file.rename(log_file.parent / "app.log.1")
+        log_file.write_text("new file\n")
+
+        second = reader.read_tail(str(log_file), 2, first["next_cursor"])
+        assert second["generation"] == 1
+        assert second["lines"] == ["current 5", "current 6"]
+
+    def test_empty_file(self, reader, tmp_path):
+        """空ファイルは空リストを返す"""
+        base = tmp_path / "empty.log"
+        base.write_bytes(b"")
+
+        result = reader.read_tail(str(base), 10)
+        assert result["lines"] == []
+        assert result["next_cursor"] is None
+
+    def test_long_line_is_truncated(self, reader, tmp_path):
+        """長大な行は MAX_LINE_BYTES で切り詰める"""
+        base = tmp_path / "long.log"
+        base.write_bytes(b"x" * (reader.MAX_LINE_BYTES * 2) + b"\n")
+
+        result = reader.read_tail(str(base), 1)
+        assert len(result["lines"][0]) == reader.MAX_LINE_BYTES
+
+    @pytest.mark.parametrize("cursor", ["1:2", "a:1:2", "1:2:-3", "99:1:0"])
+    def test_invalid_cursor_rejected(self, reader, log_file, cursor):
+        """不正なカーソルは拒否する"""
+        with pytest.raises(reader.FileLogError):
+            reader.read_tail(str(log_file), 1, cursor)
+
+
+class TestFileLogSearch:
+    """並列チャンク検索のテスト"""
+
+    @pytest.fixture
+    def big_log(self, tmp_path):
+        """複数チャンクに分割される検索対象ファイル"""
+        base = tmp_path / "search.log"
+        with open(base, "w") as f:
+            for i in range(2000):
+                ip = "10.0.0.1" if i % 100 == 7 else "192.168.1.1"
+                f.write(f"line {i:05d} from {ip}\n")
+        return base
+
+    def test_chunk_ranges_are_newline_aligned(self, reader, big_log):
+        """チャンク境界は必ず行頭になる"""
+        ranges = reader.chunk_ranges(str(big_log), 1000)
+        data = big_log.read_bytes()
+
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(data)
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[end - 1:end] == b"\n"
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_matches_in_file_order_with_offsets(self, reader, big_log, workers):
+        """マッチはファイル順で、オフセットは行頭を指す"""
+        result = reader.search_file(
+            str(big_log), "10.0.0.1", limit=100, workers=workers, chunk_size=1000
+        )
+        data = big_log.read_bytes()
+
+        assert result["matches_returned"] == 20
+        assert result["truncated"] is False
+        assert [m["line"][:10] for m in result["matches"]] == [
+            f"line {i:05d}" for i in range(7, 2000, 100)
+        ]
+        for match in result["matches"]:
+            assert data[match["offset"]:].startswith(match["line"].encode())
+
+    def test_stops_early_at_limit(self, reader, big_log):
+        """limit 件に達したら残りのチャンクは走査しない"""
+        result = reader.search_file(
+            str(big_log), "10.0.0.1", limit=3, workers=2, chunk_size=1000
+        )
+
+        assert result["matches_returned"] == 3
+        assert result["truncated"] is True
+        assert result["chunks_scanned"] < result["chunks_total"]
+
+        resumed = reader.search_file(
+            str(big_log), "10.0.0.1", limit=100, offset=result["resume_offset"], workers=1
+        )
+        assert resumed["matches_returned"] == 17
+        assert resumed["matches"][0]["line"].startswith("line 00307")
+
+    def test_empty_pattern_rejected(self, reader, big_log):
+        """空パターンは拒否する"""
+        with pytest.raises(reader.FileLogError):
+            reader.search_file(str(big_log), "", limit=10)
+
+
+class TestFileLogsEndpoint:
+    """ファイルログ API のテスト"""
+
+    def test_file_logs_success(self, test_client, auth_headers):
+        """ラッパーの結果をそのまま返す"""
+        wrapper_result = {
+            "status": "success",
+            "path": "/var/log/syslog",
+            "generation": 0,
+            "compressed": False,
+            "file_size": 100,
+            "lines_requested": 2,
+            "lines_returned": 2,
+            "lines": ["a", "b"],
+            "start_offset": 50,
+            "next_cursor": "0:123:50",
+            "timestamp": "2026-01-01T00:00:00+09:00",
+        }
+
+        with patch(
+            "backend.api.routes.logs.sudo_wrapper.get_file_logs", return_value=wrapper_result
+        ) as mock_get:
+            response = test_client.get("/api/logs/files/syslog?lines=2", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["log_name"] == "syslog"
+        assert response.json()["next_cursor"] == "0:123:50"
+        mock_get.assert_called_once_with("syslog", 2, None)
+
+    def test_file_logs_denied_by_wrapper(self, test_client, auth_headers):
+        """allowlist 外のログは 403"""
+        with patch(
+            "backend.api.routes.logs.sudo_wrapper.get_file_logs",
+            return_value={"status": "error", "message": "Log not allowed: shadow"},
+        ):
+            response = test_client.get("/api/logs/files/shadow", headers=auth_headers)
+
+        assert response.status_code == 403
+
+    def test_file_logs_invalid_cursor(self, test_client, auth_headers):
+        """不正な形式のカーソルは 422"""
+        response = test_client.get(
+            "/api/logs/files/syslog?cursor=0;rm%20-rf", headers=auth_headers
+        )
+
+        assert response.status_code == 422
+
+    def test_file_log_search_success(self, test_client, auth_headers):
+        """検索結果をそのまま返す"""
+        wrapper_result = {
+            "status": "success",
+            "path": "/var/log/syslog",
+            "pattern": "10.0.0.1",
+            "limit": 10,
+            "file_size": 100,
+            "matches_returned": 1,
+            "matches": [{"offset": 42, "line": "from 10.0.0.1"}],
+            "truncated": False,
+            "resume_offset": None,
+            "chunks_scanned": 1,
+            "chunks_total": 1,
+            "workers": 1,
+            "timestamp": "2026-01-01T00:00:00+09:00",
+        }
+
+        with patch(
+            "backend.api.routes.logs.sudo_wrapper.search_file_logs",
+            return_value=wrapper_result,
+        ) as mock_search:
+            response = test_client.get(
+                "/api/logs/files/syslog/search?pattern=10.0.0.1&limit=10",
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["matches"][0]["offset"] == 42
+        mock_search.assert_called_once_with("syslog", "10.0.0.1", 10, 0)
+
+    def test_file_log_search_rejects_unsafe_pattern(self, test_client, auth_headers):
+        """特殊文字を含む検索文字列は 422"""
+        response = test_client.get(
+            "/api/logs/files/syslog/search?pattern=a%3Bb", headers=auth_headers
+        )
+
+        assert response.status_code == 422
+
+    def test_file_logs_requires_auth(self, test_client):
+        """認証なしは拒否"""
+        response = test_client.get("/api/logs/files/syslog")
+
+        assert response.status_code == 403
@@ -0,0 +1,100 @@
+"""
+ログ出力の構成とアクセスログのユニットテスト
+"""
+
+import io
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+import pytest
+
+from backend.core import settings
+from backend.core.config import LoggingConfig
+from backend.core.logging_setup import DroppingQueueHandler, setup_logging, stop_logging
+
+
+@pytest.fixture
+def log_output():
+    """JSON 形式の出力を StringIO に向け、終了後に元の構成へ戻す"""
+    stream = io.StringIO()
+    setup_logging(LoggingConfig(level="INFO", format="json"), stream=stream)
+    yield stream
+    setup_logging(settings.logging)
+
+
+def _records(stream):
+    stop_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+class TestLoggingSetup:
+    """setup_logging のテスト"""
+
+    def test_json_output(self, log_output):
+        logging.getLogger("backend.test").info("hello %s", "world", extra={"user": "alice"})
+
+        record = _records(log_output)[-1]
+
+        assert record["message"] == "hello world"
+        assert record["level"] == "INFO"
+        assert record["logger"] == "backend.test"
+        assert record["user"] == "alice"
+        assert "time" in record
+
+    def test_exception_kept_separate(self, log_output):
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("backend.test").exception("failed")
+
+        record = _records(log_output)[-1]
+
+        assert record["message"] == "failed"
+        assert "ValueError: boom" in record["exc_info"]
+
+    def test_full_queue_drops_records(self):
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        logger = logging.getLogger("backend.test.dropping")
+        logger.propagate = False
+        logger.addHandler(handler)
+        try:
+            for n in range(3):
+                logger.warning("record %d", n)
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+
+        assert handler.queue.qsize() == 1
+        assert handler.dropped == 2
+
+
+class TestAccessLog:
+    """AccessLogMiddleware のテスト"""
+
+    def _access_records(self, caplog):
+        return [r for r in caplog.records if r.name == "backend.access"]
+
+    def test_one_record_per_request(self, test_client, auth_headers, caplog):
+        caplog.set_level(logging.INFO, logger="backend.access")
+
+        test_client.get("/api/auth/me", headers=auth_headers)
+
+        records = self._access_records(caplog)
+        assert len(records) == 1
+        record = records[0]
+        assert (record.method, record.path, record.status) == ("GET", "/api/auth/me", 200)
+        assert record.user == "operator"
+        assert record.duration_ms >= 0
+
+    def test_sampled_paths(self, test_client, caplog):
+        caplog.set_level(logging.INFO, logger="backend.access")
+
+        with patch.object(settings.logging, "access_log_sample_rate", 0.0):
+            test_client.get("/health")
+            # エラーはサンプリング対象のパスでも記録する
+            test_client.get("/api/processes")
+
+        records = self._access_records(caplog)
+        assert [(r.path, r.status) for r in records] == [("/api/processes", 403)]
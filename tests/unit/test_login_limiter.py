@@ -0,0 +1,145 @@
+"""
+ログイン試行回数制限のユニットテスト
+"""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from backend.core.login_limiter import LoginLimiter, login_limiter
+
+NOW = 1_800_000_000.0  # ウィンドウ（900 秒）の境界
+
+
+def _limiter(tmp_path, **kwargs):
+    options = dict(max_attempts=3, max_attempts_per_ip=5, window_seconds=900)
+    options.update(kwargs)
+    return LoginLimiter(tmp_path / "database.db", **options)
+
+
+def _at(seconds):
+    return patch("backend.core.login_limiter.time.time", return_value=NOW + seconds)
+
+
+class TestLoginLimiter:
+    """LoginLimiter のテスト"""
+
+    def test_account_blocked_after_max_failures(self, tmp_path):
+        limiter = _limiter(tmp_path)
+
+        with _at(10):
+            for _ in range(3):
+                assert limiter.check("alice@example.com", "10.0.0.1") is None
+
+            retry_after = limiter.check("ALICE@example.com", "10.0.0.2")
+            other = limiter.check("bob@example.com", "10.0.0.1")
+
+        assert retry_after == 890
+        assert other is None
+
+    def test_ip_blocked_across_accounts(self, tmp_path):
+        limiter = _limiter(tmp_path)
+
+        with _at(10):
+            for n in range(5):
+                limiter.record_failure(f"user{n}@example.com", "10.0.0.1")
+
+            assert limiter.check("new@example.com", "10.0.0.1") is not None
+            assert limiter.check("new@example.com", "10.0.0.2") is None
+
+    def test_state_shared_between_workers(self, tmp_path):
+        """同じデータベースを使う別インスタンス（別ワーカー）の失敗も数える"""
+        workers = [_limiter(tmp_path), _limiter(tmp_path)]
+
+        with _at(10):
+            for n in range(3):
+                workers[n % 2].record_failure("alice@example.com", None)
+
+            assert workers[0].check("alice@example.com", None) is not None
+            assert workers[1].check("alice@example.com", None) is not None
+
+    def test_sliding_window_decays(self, tmp_path):
+        """直前のウィンドウの失敗は経過時間に応じて減っていく"""
+        limiter = _limiter(tmp_path)
+
+        with _at(800):
+            for _ in range(3):
+                limiter.record_failure("alice@example.com", None)
+        with _at(850):
+            blocked = limiter.check("alice@example.com", None)
+        # 次のウィンドウの 1/3 経過: 3 × 2/3 = 2 件とみなす
+        with _at(900 + 300):
+            allowed = limiter.check("alice@example.com", None)
+            blocked_again = limiter.check("alice@example.com", None)
+
+        assert blocked == 50
+        assert allowed is None
+        assert blocked_again == 600
+
+    def test_reset_on_success(self, tmp_path):
+        limiter = _limiter(tmp_path)
+
+        with _at(10):
+            for _ in range(3):
+                limiter.record_failure("alice@example.com", "10.0.0.1")
+            limiter.reset("alice@example.com")
+
+            assert limiter.check("alice@example.com", "10.0.0.1") is None
+
+    def test_concurrent_checks_are_counted(self, tmp_path):
+        """並行した試行は判定の時点で数え、上限を超えた分は受け付けない"""
+        workers = [_limiter(tmp_path) for _ in range(4)]
+
+        with _at(10):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(
+                    executor.map(
+                        lambda n: workers[n % 4].check("alice@example.com", None), range(20)
+                    )
+                )
+
+        assert results.count(None) == 3
+        # 拒否した試行は数えない
+        with sqlite3.connect(tmp_path / "database.db") as conn:
+            count = conn.execute(
+                "SELECT curr_count FROM login_attempts WHERE key = 'account:alice@example.com'"
+            ).fetchone()[0]
+        assert count == 3
+
+    def test_success_releases_ip_reservation(self, tmp_path):
+        limiter = _limiter(tmp_path)
+
+        with _at(10):
+            for n in range(4):
+                limiter.record_failure(f"user{n}@example.com", "10.0.0.1")
+            assert limiter.check("alice@example.com", "10.0.0.1") is None
+            limiter.reset("alice@example.com", "10.0.0.1")
+
+            # 成功した試行は IP の失敗回数に残らない（4 件のまま）
+            assert limiter.check("bob@example.com", "10.0.0.1") is None
+            assert limiter.check("carol@example.com", "10.0.0.1") is not None
+
+    def test_disabled(self, tmp_path):
+        limiter = _limiter(tmp_path, max_attempts=0, max_attempts_per_ip=0)
+
+        for _ in range(10):
+            limiter.record_failure("alice@example.com", "10.0.0.1")
+
+        assert limiter.check("alice@example.com", "10.0.0.1") is None
+
+
+class TestLoginRateLimitApi:
+    """POST /api/auth/login の試行回数制限のテスト"""
+
+    def test_rejected_before_password_check(self, test_client):
+        email = "limited@example.com"
+        for _ in range(login_limiter.max_attempts):
+            response = test_client.post("/api/auth/login", json={"email": email, "password": "x"})
+            assert response.status_code == 401
+
+        with patch("backend.api.routes.auth.authenticate_user") as mock_authenticate:
+            response = test_client.post("/api/auth/login", json={"email": email, "password": "x"})
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+        mock_authenticate.assert_not_called()
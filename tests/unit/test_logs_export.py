@@ -0,0 +1,210 @@
+"""
+ログ一括エクスポートのユニットテスト
+"""
+
+import asyncio
+import gzip
+import json
+import sys
+from typing import AsyncIterator
+from unittest.mock import AsyncMock, patch
+
+import anyio
+import pytest
+
+from backend.api.routes.logs import _stream_export
+from backend.core.sudo_wrapper import SudoWrapperError, WrapperStream
+
+
+class FakeStream:
+    """WrapperStream の代替（固定チャンクを返す）"""
+
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self):
+        self.closed = True
+
+
+class StalledStream(FakeStream):
+    """最初のチャンクを返した後は出力が止まるストリーム（終了処理で await する）"""
+
+    async def __aiter__(self):
+        yield self.chunks[0]
+        await anyio.sleep_forever()
+
+    async def aclose(self):
+        await anyio.sleep(0)
+        self.closed = True
+
+
+async def _disconnect_after_first_chunk(chunks: AsyncIterator[bytes]) -> None:
+    """最初のチャンクを受け取った時点で応答をキャンセル（クライアント切断と同じ）"""
+    received = anyio.Event()
+
+    async def consume():
+        async for _ in chunks:
+            received.set()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(consume)
+        await received.wait()
+        tg.cancel_scope.cancel()
+
+
+async def _spawn(code: str, chunk_size: int = 16) -> WrapperStream:
+    """テスト用プロセスの出力を WrapperStream で包む"""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-c",
+        code,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    return await WrapperStream.open("test.sh", process, chunk_size)
+
+
+class TestWrapperStream:
+    """WrapperStream のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_streams_all_output_in_chunks(self):
+        """出力を chunk_size 単位で全て返す"""
+        stream = await _spawn("import sys; sys.stdout.write('x' * 100)")
+        chunks = [chunk async for chunk in stream]
+
+        assert b"".join(chunks) == b"x" * 100
+        assert max(len(chunk) for chunk in chunks) <= 16
+        assert stream.error is None
+
+    @pytest.mark.asyncio
+    async def test_early_exit_sets_error(self):
+        """入力検証で即時終了した場合は error を保持する"""
+        stream = await _spawn(
+            "import sys; print('{\"status\": \"error\", \"message\": \"nope\"}'); sys.exit(1)",
+            chunk_size=1024,
+        )
+
+        assert stream.error == {"status": "error", "message": "nope"}
+
+    @pytest.mark.asyncio
+    async def test_failure_mid_stream_raises(self):
+        """出力途中で異常終了した場合は SudoWrapperError"""
+        stream = await _spawn(
+            "import sys; sys.stdout.write('y' * 64); sys.stdout.flush(); sys.exit(2)"
+        )
+
+        with pytest.raises(SudoWrapperError):
+            async for _ in stream:
+                pass
+
+
+    @pytest.mark.asyncio
+    async def test_disconnect_kills_wrapper_and_observes(self):
+        """途中で切断された場合もラッパーを終了させ、実行時間を記録する"""
+        stream = await _spawn(
+            "import sys, time; sys.stdout.write('z' * 64); sys.stdout.flush(); time.sleep(30)"
+        )
+
+        await _disconnect_after_first_chunk(stream.__aiter__())
+
+        assert stream.process.returncode is not None
+        assert stream._observed
+
+
+class TestStreamExport:
+    """_stream_export のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_client_disconnect_is_audited(self):
+        """切断でキャンセルされても失敗（client_disconnected）を監査ログに残す"""
+        stream = StalledStream([b"a\n"])
+
+        with patch("backend.api.routes.logs.audit_log.record") as mock_record:
+            await _disconnect_after_first_chunk(
+                _stream_export(stream, "nginx", "user_002", False, {})
+            )
+
+        final = mock_record.call_args_list[-1].kwargs
+        assert final["status"] == "failure"
+        assert final["details"]["error"] == "client_disconnected"
+        assert final["details"]["lines"] == 1
+        assert stream.closed
+
+
+class TestLogExportEndpoint:
+    """エクスポート API のテスト"""
+
+    def test_export_ndjson_streams_and_audits(self, test_client, auth_headers):
+        """NDJSON をそのまま中継し、行数・バイト数を監査ログに残す"""
+        lines = [json.dumps({"MESSAGE": f"line {i}"}).encode() + b"\n" for i in range(5)]
+        stream = FakeStream([b"".join(lines[:2]), b"".join(lines[2:])])
+
+        with patch(
+            "backend.api.routes.logs.sudo_wrapper.stream_logs_export",
+            new=AsyncMock(return_value=stream),
+        ) as mock_export, patch("backend.api.routes.logs.audit_log.record") as mock_record:
+            response = test_client.get(
+                "/api/logs/nginx/export?since=2026-01-01T00:00:00&until=2026-01-02T00:00:00",
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.content == b"".join(lines)
+        assert mock_export.await_args.kwargs["output_format"] == "ndjson"
+
+        final = mock_record.call_args_list[-1].kwargs
+        assert final["status"] == "success"
+        assert final["details"]["lines"] == 5
+        assert final["details"]["bytes"] == len(b"".join(lines))
+
+    def test_export_gzip_text(self, test_client, auth_headers):
+        """compress=true で gzip 圧縮したテキストを返す"""
+        stream = FakeStream([b"a\n", b"b\n"])
+
+        with patch(
+            "backend.api.routes.logs.sudo_wrapper.stream_logs_export",
+            new=AsyncMock(return_value=stream),
+        ):
+            response = test_client.get(
+                "/api/logs/nginx/export?format=text&compress=true", headers=auth_headers
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert ".log.gz" in response.headers["content-disposition"]
+        assert gzip.decompress(response.content) == b"a\nb\n"
+
+    def test_export_denied_by_wrapper(self, test_client, auth_headers):
+        """ラッパーが拒否した場合は 403"""
+        stream = FakeStream([], error={"status": "error", "message": "Service not allowed"})
+
+        with patch(
+            "backend.api.routes.logs.sudo_wrapper.stream_logs_export",
+            new=AsyncMock(return_value=stream),
+        ):
+            response = test_client.get("/api/logs/malicious/export", headers=auth_headers)
+
+        assert response.status_code == 403
+
+    def test_export_rejects_inverted_range(self, test_client, auth_headers):
+        """since > until は 400"""
+        response = test_client.get(
+            "/api/logs/nginx/export?since=2026-01-02T00:00:00&until=2026-01-01T00:00:00",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 400
+
+    def test_export_rejects_invalid_format(self, test_client, auth_headers):
+        """未対応の出力形式は 422"""
+        response = test_client.get("/api/logs/nginx/export?format=csv", headers=auth_headers)
+
+        assert response.status_code == 422
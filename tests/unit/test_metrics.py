@@ -0,0 +1,119 @@
+"""
+メトリクス（Prometheus のテキスト形式・ワーカー間の集計）のユニットテスト
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.config import settings
+from backend.core.metrics import MetricsRegistry
+
+
+@pytest.fixture
+def make_registry(tmp_path):
+    """同じデータベースを共有するレジストリ（ワーカーの代わり）を作る"""
+    registries = []
+
+    def make():
+        registry = MetricsRegistry(tmp_path / "database.db", flush_interval=60)
+        registry.counter("jobs_total", "Jobs", ("result",))
+        registry.histogram("job_seconds", "Job time", ("job",), buckets=(0.1, 1.0))
+        registries.append(registry)
+        return registry
+
+    yield make
+    for registry in registries:
+        registry.close()
+
+
+class TestRegistry:
+    """レジストリのテスト"""
+
+    def test_render_counter_and_histogram(self, make_registry):
+        registry = make_registry()
+        registry._metrics["jobs_total"].inc(result="ok")
+        registry._metrics["jobs_total"].inc(2, result="ok")
+        histogram = registry._metrics["job_seconds"]
+        histogram.observe(0.05, job="a")
+        histogram.observe(0.5, job="a")
+        histogram.observe(3.0, job="a")
+
+        lines = registry.render().splitlines()
+
+        assert "# TYPE jobs_total counter" in lines
+        assert 'jobs_total{result="ok"} 3.0' in lines
+        assert "# TYPE job_seconds histogram" in lines
+        assert 'job_seconds_bucket{job="a",le="0.1"} 1.0' in lines
+        assert 'job_seconds_bucket{job="a",le="1.0"} 2.0' in lines
+        assert 'job_seconds_bucket{job="a",le="+Inf"} 3.0' in lines
+        assert 'job_seconds_count{job="a"} 3.0' in lines
+        assert 'job_seconds_sum{job="a"} 3.55' in lines
+
+    def test_aggregates_across_workers(self, make_registry):
+        first, second = make_registry(), make_registry()
+        first._metrics["jobs_total"].inc(result="ok")
+        second._metrics["jobs_total"].inc(result="ok")
+        second._metrics["jobs_total"].inc(result="failed")
+        second.flush()
+
+        lines = first.render().splitlines()
+
+        assert 'jobs_total{result="ok"} 2.0' in lines
+        assert 'jobs_total{result="failed"} 1.0' in lines
+
+    def test_label_escaping_and_validation(self, make_registry):
+        registry = make_registry()
+        registry._metrics["jobs_total"].inc(result='a"b\\c')
+
+        assert 'jobs_total{result="a\\"b\\\\c"} 1.0' in registry.render()
+        with pytest.raises(ValueError):
+            registry._metrics["jobs_total"].inc(status="ok")
+        with pytest.raises(ValueError):
+            registry.counter("jobs_total", "Duplicate")
+
+    def test_disabled_records_nothing(self, make_registry):
+        registry = make_registry()
+        registry.enabled = False
+        registry._metrics["jobs_total"].inc(result="ok")
+
+        assert "jobs_total{" not in registry.render()
+
+    def test_failed_flush_is_retried(self, make_registry, tmp_path):
+        registry = make_registry()
+        registry.db_path = tmp_path / "missing" / "file" / "database.db"
+        registry.db_path.parent.parent.mkdir()
+        registry.db_path.parent.write_text("not a directory")
+        registry._metrics["jobs_total"].inc(result="ok")
+
+        registry.flush()
+        assert registry._unsent
+
+        registry.db_path = tmp_path / "database.db"
+        assert 'jobs_total{result="ok"} 1.0' in registry.render()
+
+
+class TestMetricsEndpoint:
+    """/metrics のテスト"""
+
+    def test_forbidden_by_default(self, test_client):
+        response = test_client.get("/metrics")
+
+        assert response.status_code == 403
+
+    def test_exposes_request_and_token_metrics(self, test_client, auth_headers):
+        test_client.get("/health")
+        test_client.get("/api/auth/me", headers=auth_headers)
+        test_client.get("/no-such-path")
+
+        with patch.object(settings.metrics, "allowed_ips", ["testclient"]):
+            response = test_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in body
+        assert 'route="/api/auth/me"' in body
+        assert 'route="unmatched",status="404"' in body
+        assert 'adminui_token_verifications_total{result="' in body
+        assert "# TYPE adminui_wrapper_duration_seconds histogram" in body
@@ -0,0 +1,53 @@
+"""
+JSON シリアライズ（orjson / model_dump_json）のユニットテスト
+"""
+
+import json
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from backend.api.routes.logs import LogsResponse
+from backend.core import serialization, sudo_wrapper
+
+LOGS_RESULT = {
+    "status": "success",
+    "service": "nginx",
+    "lines_requested": 2,
+    "lines_returned": 2,
+    "logs": ["line 1", "日本語の行"],
+    "timestamp": "2025-01-15T03:12:00+09:00",
+}
+
+
+class TestSerialization:
+    """loads / dumps のテスト"""
+
+    def test_model_and_dict_same_json(self):
+        model = LogsResponse(**LOGS_RESULT)
+
+        assert json.loads(serialization.dumps(model)) == LOGS_RESULT
+        assert json.loads(serialization.dumps(LOGS_RESULT)) == LOGS_RESULT
+
+    def test_non_native_values(self):
+        body = serialization.dumps({1: Decimal("1.5")})
+
+        assert json.loads(body) == {"1": 1.5}
+
+    def test_decode_error_compatible_with_json(self):
+        with pytest.raises(json.JSONDecodeError):
+            serialization.loads("not json")
+
+
+class TestServiceLogsResponse:
+    """GET /api/logs/{service_name} の応答のテスト"""
+
+    def test_body_matches_model(self, test_client, auth_headers):
+        with patch.object(sudo_wrapper, "get_logs", return_value={**LOGS_RESULT, "extra": 1}):
+            response = test_client.get("/api/logs/nginx?lines=2", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        # 応答モデルにない項目は含めない
+        assert response.json() == LOGS_RESULT
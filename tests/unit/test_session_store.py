@@ -0,0 +1,177 @@
+"""
+セッションストア（トークン失効・無操作タイムアウト）のユニットテスト
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from backend.core.session_store import BloomFilter, SessionStore
+
+NOW = 1_800_000_000.0
+
+
+def _store(tmp_path, **kwargs):
+    options = dict(
+        session_timeout=600, touch_interval=60, refresh_interval=1.0, filter_capacity=100
+    )
+    options.update(kwargs)
+    return SessionStore(tmp_path / "database.db", **options)
+
+
+def _at(seconds):
+    return patch("backend.core.session_store.time.time", return_value=NOW + seconds)
+
+
+class TestBloomFilter:
+    """BloomFilter のテスト"""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        items = [f"session-{n}" for n in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(item in bloom for item in items)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for n in range(1000):
+            bloom.add(f"session-{n}")
+
+        false_positives = sum(f"other-{n}" in bloom for n in range(10000))
+
+        assert false_positives < 300
+
+
+class TestSessionStore:
+    """SessionStore のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_revoked_in_same_worker(self, tmp_path):
+        store = _store(tmp_path)
+        with _at(0):
+            session_id = store.create("user_001", NOW + 3600)
+            other_id = store.create("user_001", NOW + 3600)
+            assert store.revoke(session_id) is True
+            assert store.revoke(session_id) is False
+
+            assert await store.validate(session_id) == "revoked"
+            assert await store.validate(other_id) is None
+
+    @pytest.mark.asyncio
+    async def test_revocation_propagates_to_other_worker(self, tmp_path):
+        """別インスタンス（別ワーカー）での失効は refresh_interval 以内に反映される"""
+        worker_a, worker_b = _store(tmp_path), _store(tmp_path)
+        with _at(0):
+            session_id = worker_a.create("user_001", NOW + 3600)
+            assert await worker_b.validate(session_id) is None
+            worker_a.revoke(session_id)
+
+        with _at(2):
+            assert await worker_b.validate(session_id) == "revoked"
+
+    @pytest.mark.asyncio
+    async def test_valid_session_checked_in_memory(self, tmp_path):
+        """有効なセッションの判定ではデータベースに問い合わせない"""
+        store = _store(tmp_path, refresh_interval=3600)
+        with _at(0):
+            session_id = store.create("user_001", NOW + 3600)
+            assert await store.validate(session_id) is None
+
+        with _at(30), patch.object(store, "_connect", wraps=store._connect) as mock_connect:
+            for _ in range(100):
+                assert await store.validate(session_id) is None
+
+        mock_connect.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_idle_timeout(self, tmp_path):
+        store = _store(tmp_path)
+        with _at(0):
+            session_id = store.create("user_001", NOW + 3600)
+        with _at(300):
+            assert await store.validate(session_id) is None
+        with _at(300 + 601):
+            assert await store.validate(session_id) == "expired"
+        with _at(300 + 602):
+            assert await store.validate(session_id) == "revoked"
+
+    @pytest.mark.asyncio
+    async def test_activity_in_other_worker_extends_session(self, tmp_path):
+        worker_a, worker_b = _store(tmp_path), _store(tmp_path)
+        with _at(0):
+            session_id = worker_a.create("user_001", NOW + 3600)
+            assert await worker_b.validate(session_id) is None
+        with _at(500):
+            assert await worker_a.validate(session_id) is None
+        # worker_b の最終アクセスからは timeout を超えているが、worker_a で使われている
+        with _at(700):
+            assert await worker_b.validate(session_id) is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_session(self, tmp_path):
+        store = _store(tmp_path)
+
+        assert await store.validate("0" * 32) == "unknown"
+
+    def test_rebuild_drops_expired_revocations(self, tmp_path):
+        store = _store(tmp_path, filter_capacity=10)
+        with _at(0):
+            expired = [store.create("user_001", NOW + 10) for _ in range(8)]
+            active = [store.create("user_001", NOW + 3600) for _ in range(4)]
+            for session_id in expired + active:
+                store.revoke(session_id)
+
+        with _at(100):
+            store.refresh()
+
+        assert store._filter.count == len(active)
+        assert all(session_id in store._filter for session_id in active)
+        assert not any(store._is_revoked(session_id) for session_id in expired)
+
+    def test_refresh_prunes_expired_sessions(self, tmp_path):
+        """失効がなくても、refresh PRUNE_EVERY 回毎に期限切れのセッションを削除する"""
+        store = _store(tmp_path)
+        with _at(0):
+            expired = store.create("user_001", NOW + 10)
+            idle = store.create("user_001", NOW + 3600)
+        with _at(500):
+            active = store.create("user_001", NOW + 3600)
+
+        with _at(700), patch("backend.core.session_store.PRUNE_EVERY", 3):
+            store.refresh()
+            store.refresh()
+            assert set(store._seen) == {expired, idle, active}
+            store.refresh()
+
+        rows = store._connect().execute("SELECT session_id FROM sessions").fetchall()
+        assert {row[0] for row in rows} == {idle, active}
+        assert set(store._seen) == {active}
+        assert store._filter.count == 0
+
+
+class TestLogoutRevocation:
+    """POST /api/auth/logout のテスト"""
+
+    def _login(self, test_client):
+        response = test_client.post(
+            "/api/auth/login",
+            json={"email": "viewer@example.com", "password": "viewer123"},
+        )
+        assert response.status_code == 200
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def test_token_rejected_after_logout(self, test_client):
+        headers = self._login(test_client)
+        other_headers = self._login(test_client)
+        # ログアウト前に検証キャッシュに載せておく
+        assert test_client.get("/api/auth/me", headers=headers).status_code == 200
+
+        response = test_client.post("/api/auth/logout", headers=headers)
+        assert response.status_code == 200
+
+        response = test_client.get("/api/auth/me", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["message"] == "Session revoked"
+        assert test_client.get("/api/auth/me", headers=other_headers).status_code == 200
@@ -0,0 +1,164 @@
+"""
+スナップショット応答（ETag / 条件付き GET）のユニットテスト
+"""
+
+from unittest.mock import patch
+
+import pytest
+from pydantic import BaseModel
+
+from backend.core import sudo_wrapper
+from backend.core.snapshot import (
+    SnapshotCache,
+    etag_matches,
+    make_snapshot,
+    snapshot_cache,
+)
+
+SYSTEM_STATUS = {
+    "cpu": {"usage_percent": 12.5},
+    "memory": {"usage_percent": 40.0},
+    "disk": {"usage_percent": 55.0},
+    "uptime": {"seconds": 3600},
+}
+
+
+class TestEtag:
+    """ETag の生成と比較のテスト"""
+
+    def test_same_content_same_etag(self):
+        assert make_snapshot({"a": 1}).etag == make_snapshot({"a": 1}).etag
+        assert make_snapshot({"a": 1}).etag != make_snapshot({"a": 2}).etag
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            (None, False),
+            ('"abc"', True),
+            ('W/"abc"', True),
+            ('"xyz", "abc"', True),
+            ("*", True),
+            ('"xyz"', False),
+        ],
+    )
+    def test_etag_matches(self, header, expected):
+        assert etag_matches(header, '"abc"') is expected
+
+
+class TestSnapshotCache:
+    """SnapshotCache のテスト"""
+
+    def test_reused_within_ttl(self):
+        cache = SnapshotCache(ttl_seconds=60, max_entries=2)
+        calls = []
+
+        def produce():
+            calls.append(1)
+            return {"n": len(calls)}
+
+        first = cache.get("key", produce)
+        second = cache.get("key", produce)
+
+        assert first is second
+        assert len(calls) == 1
+
+    def test_zero_ttl_disables_cache(self):
+        cache = SnapshotCache(ttl_seconds=0, max_entries=2)
+        calls = []
+
+        cache.get("key", lambda: calls.append(1) or {})
+        cache.get("key", lambda: calls.append(1) or {})
+
+        assert len(calls) == 2
+
+    def test_error_not_cached(self):
+        cache = SnapshotCache(ttl_seconds=60, max_entries=2)
+
+        def fail():
+            raise RuntimeError("wrapper failed")
+
+        with pytest.raises(RuntimeError):
+            cache.get("key", fail)
+        assert cache.get("key", lambda: {"ok": True}).content == {"ok": True}
+
+    def test_evicts_least_recently_used(self):
+        cache = SnapshotCache(ttl_seconds=60, max_entries=2)
+        cache.get("a", lambda: {"v": "a"})
+        cache.get("b", lambda: {"v": "b"})
+        cache.get("a", lambda: {"v": "a2"})
+        cache.get("c", lambda: {"v": "c"})
+
+        assert cache.get("a", lambda: {"v": "a3"}).content == {"v": "a"}
+        assert cache.get("b", lambda: {"v": "b2"}).content == {"v": "b2"}
+
+    def test_rebuild_with_new_timestamp_keeps_etag(self):
+        """作り直した内容が取得時刻以外同じなら、前回の本文と ETag を使う"""
+        cache = SnapshotCache(ttl_seconds=1e-9, max_entries=2)
+        first = cache.get("key", lambda: {"timestamp": "2026-01-01T00:00:00", "cpu": 1})
+        second = cache.get("key", lambda: {"timestamp": "2026-01-01T00:00:05", "cpu": 1})
+        third = cache.get("key", lambda: {"timestamp": "2026-01-01T00:00:10", "cpu": 2})
+
+        assert second.etag == first.etag
+        assert second.body == first.body
+        assert second.created_at > first.created_at
+        assert third.etag != first.etag
+        assert third.content["cpu"] == 2
+
+    def test_model_timestamp_is_ignored(self):
+        class Status(BaseModel):
+            timestamp: str
+            value: int
+
+        first = make_snapshot(Status(timestamp="a", value=1))
+        assert first.content_hash == make_snapshot(Status(timestamp="b", value=1)).content_hash
+        assert first.content_hash != make_snapshot(Status(timestamp="a", value=2)).content_hash
+
+
+class TestConditionalGet:
+    """/api/system/status の条件付き GET のテスト"""
+
+    def test_not_modified(self, test_client, auth_headers):
+        with patch.object(sudo_wrapper, "get_system_status", return_value=SYSTEM_STATUS) as mock:
+            first = test_client.get("/api/system/status", headers=auth_headers)
+            etag = first.headers["ETag"]
+
+            second = test_client.get(
+                "/api/system/status", headers={**auth_headers, "If-None-Match": etag}
+            )
+
+        assert first.status_code == 200
+        assert first.json()["cpu"] == SYSTEM_STATUS["cpu"]
+        assert first.headers["Cache-Control"] == "private, no-cache"
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == etag
+        # TTL 内はラッパーを再実行しない
+        assert mock.call_count == 1
+
+    def test_stale_etag_returns_body(self, test_client, auth_headers):
+        with patch.object(sudo_wrapper, "get_system_status", return_value=SYSTEM_STATUS):
+            response = test_client.get(
+                "/api/system/status", headers={**auth_headers, "If-None-Match": '"stale"'}
+            )
+
+        assert response.status_code == 200
+        assert response.json()["memory"] == SYSTEM_STATUS["memory"]
+
+    def test_not_modified_after_ttl_with_new_timestamp(self, test_client, auth_headers):
+        """TTL 切れで取得し直しても、取得時刻以外同じなら 304"""
+        responses = iter(
+            {**SYSTEM_STATUS, "timestamp": f"2026-01-01T00:00:{i:02d}+09:00"} for i in range(60)
+        )
+
+        with patch.object(
+            sudo_wrapper, "get_system_status", side_effect=lambda: next(responses)
+        ) as mock, patch.object(snapshot_cache, "ttl_seconds", 1e-9):
+            first = test_client.get("/api/system/status", headers=auth_headers)
+            second = test_client.get(
+                "/api/system/status",
+                headers={**auth_headers, "If-None-Match": first.headers["ETag"]},
+            )
+
+        assert mock.call_count == 2
+        assert second.status_code == 304
+        assert second.headers["ETag"] == first.headers["ETag"]
@@ -0,0 +1,67 @@
+"""
+API プロセスの起動時間（import）のテスト
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from backend.core.lazy import LazyObject
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+BENCH_STARTUP = PROJECT_ROOT / "scripts" / "benchmarks" / "bench_startup.py"
+
+
+class TestLazyObject:
+    """LazyObject のテスト"""
+
+    def test_created_on_first_access(self):
+        created = []
+
+        class Target:
+            def __init__(self):
+                created.append(self)
+                self.value = 1
+
+        proxy = LazyObject(Target)
+        assert created == []
+        assert proxy.lazy_initialized is False
+
+        assert proxy.value == 1
+        proxy.value = 2
+
+        assert len(created) == 1
+        assert created[0].value == 2
+        assert proxy.lazy_initialized is True
+
+
+class TestStartupBudget:
+    """import backend.api.main の時間の予算"""
+
+    def test_import_within_budget(self):
+        result = subprocess.run(
+            [sys.executable, str(BENCH_STARTUP), "--runs", "3", "--json"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=120,
+        )
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+
+        assert report["violations"] == [], report
+        assert report["config_loaded"] is False
+        assert report["initialized"] == []
+        assert result.returncode == 0
+
+
+class TestStartupConfig:
+    """設定に依存する構成は起動時に行う"""
+
+    def test_api_docs_registered_on_startup(self, test_client):
+        from backend.core import settings
+
+        response = test_client.get("/api/docs")
+
+        assert settings.features.api_docs_enabled is True
+        assert response.status_code == 200
@@ -0,0 +1,121 @@
+"""
+ユーザーストアと本番環境のログイン認証のユニットテスト
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from passlib.context import CryptContext
+
+from backend.core import auth
+from backend.core.auth import authenticate_user
+from backend.core.config import settings
+from backend.core.user_store import UserStore
+
+# テストでは bcrypt の代わりに軽量なスキームでハッシュ化する
+TEST_PWD_CONTEXT = CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__rounds=1000)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return UserStore(tmp_path / "users.db")
+
+
+@pytest.fixture
+def production_store(store):
+    """本番環境設定でユーザーストアを使用"""
+    with patch.object(settings, "environment", "production"), patch.object(
+        auth, "user_store", store
+    ), patch.object(auth, "pwd_context", TEST_PWD_CONTEXT), patch.object(
+        auth, "_dummy_password_hash", None
+    ):
+        yield store
+
+
+async def _create(store, email="alice@example.com", password="secret", role="Operator"):
+    await store.create_user(
+        user_id="user_100",
+        username="alice",
+        email=email,
+        role=role,
+        hashed_password=TEST_PWD_CONTEXT.hash(password),
+    )
+
+
+class TestUserStore:
+    """UserStore のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_create_and_lookup(self, store):
+        await _create(store)
+
+        user = await store.get_by_email("Alice@Example.com")
+
+        assert user["user_id"] == "user_100"
+        assert user["role"] == "Operator"
+        assert user["disabled"] is False
+        assert await store.get_by_email("bob@example.com") is None
+
+    @pytest.mark.asyncio
+    async def test_duplicate_email(self, store):
+        await _create(store)
+
+        with pytest.raises(ValueError):
+            await store.create_user("user_101", "alice2", "ALICE@example.com", "Viewer", "x")
+
+    @pytest.mark.asyncio
+    async def test_set_disabled(self, store):
+        await _create(store)
+
+        assert await store.set_disabled("user_100", True) is True
+        assert (await store.get_by_email("alice@example.com"))["disabled"] is True
+        assert await store.set_disabled("user_999", True) is False
+
+
+class TestProductionAuthentication:
+    """本番環境の authenticate_user のテスト"""
+
+    @pytest.mark.asyncio
+    async def test_success(self, production_store):
+        await _create(production_store)
+
+        user = await authenticate_user("alice@example.com", "secret")
+
+        assert user.user_id == "user_100"
+        assert user.role == "Operator"
+
+    @pytest.mark.asyncio
+    async def test_wrong_password(self, production_store):
+        await _create(production_store)
+
+        assert await authenticate_user("alice@example.com", "wrong") is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_still_verifies(self, production_store):
+        """存在しないユーザーでもパスワード検証を行う（応答時間で判別させない）"""
+        with patch.object(auth, "verify_password", wraps=auth.verify_password) as mock_verify:
+            assert await authenticate_user("nobody@example.com", "secret") is None
+
+        mock_verify.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled_user(self, production_store):
+        await _create(production_store)
+        await production_store.set_disabled("user_100", True)
+
+        assert await authenticate_user("alice@example.com", "secret") is None
+
+    @pytest.mark.asyncio
+    async def test_verification_runs_off_event_loop(self, production_store):
+        await _create(production_store)
+        threads = []
+
+        def verify(plain, hashed):
+            threads.append(threading.current_thread().name)
+            return TEST_PWD_CONTEXT.verify(plain, hashed)
+
+        with patch.object(auth, "verify_password", side_effect=verify):
+            await authenticate_user("alice@example.com", "secret")
+
+        assert threads and threads[0].startswith("password-hash")
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+# adminui-filelog-reader.py - ファイルログ読み取りヘルパー
+#
+# 用途: adminui-filelog.sh から exec される読み取り専用ヘルパー
+# 権限: root 権限で実行（adminui-filelog.sh 経由のみ）
+# 呼び出し: adminui-filelog.sh が検証済みの絶対パスを渡す（直接呼び出し禁止）
+#
+# セキュリティ原則:
+# - 標準ライブラリのみ使用（python3 -I -S で起動される）
+# - ファイル全体をメモリに読み込まない（mmap / 逆方向ブロック読み取り）
+# - 1行あたりの出力長を制限
+# - 検索は固定文字列のみ（正規表現による ReDoS を防止）
+
+"""
+ファイルログ読み取りヘルパー
+
+/var/log/*.log 形式のプレーンテキストログを末尾から読み取る。
+
+- 非圧縮ファイルは mmap 上で逆方向に改行を探索し、必要なページのみ参照する
+- カーソル（"<世代>:<inode>:<オフセット>"）で過去方向にページングする
+- ローテート済みファイル（.1 / .N.gz）はページングが到達した時点で初めて開く
+- 検索は改行境界で分割したチャンクをプロセスプールで並列走査し、
+  ファイル順に結果を確定させて limit 件に達した時点で打ち切る
+"""
+
+import argparse
+import gzip
+import json
+import mmap
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from typing import Optional
+
+# 1行あたりの最大出力バイト数（超過分は切り詰め）
+MAX_LINE_BYTES = 8192
+
+# 参照するローテート世代の上限（logrotate の rotate 設定に合わせる）
+MAX_GENERATIONS = 14
+
+# カーソルでファイル末尾を表す値（圧縮世代は伸長後サイズが事前に分からないため）
+END_OF_FILE = "end"
+
+# 並列検索のチャンクサイズ（改行境界に合わせて伸長される）
+SEARCH_CHUNK_SIZE = 64 * 1024 * 1024
+
+# 並列検索の最大ワーカー数
+SEARCH_MAX_WORKERS = 8
+
+
+class FileLogError(Exception):
+    """ファイルログ読み取りエラー"""
+
+    pass
+
+
+# ===================================================================
+# ローテート世代の解決
+# ===================================================================
+
+
+def generation_path(base_path: str, generation: int) -> Optional[str]:
+    """
+    世代番号からファイルパスを解決
+
+    Args:
+        base_path: 現行ログファイルのパス
+        generation: 世代番号（0: 現行, 1: .1, 2: .2 または .2.gz ...）
+
+    Returns:
+        存在するファイルのパス（存在しない場合は None）
+    """
+    if generation == 0:
+        candidates = [base_path]
+    else:
+        candidates = [f"{base_path}.{generation}", f"{base_path}.{generation}.gz"]
+
+    for candidate in candidates:
+        # シンボリックリンクは追跡しない
+        if os.path.isfile(candidate) and not os.path.islink(candidate):
+            return candidate
+
+    return None
+
+
+def find_generation_by_inode(base_path: str, inode: int, hint: int) -> Optional[int]:
+    """
+    inode から世代を再解決（ページング中にローテートが発生した場合）
+
+    Args:
+        base_path: 現行ログファイルのパス
+        inode: カーソルが指す inode
+        hint: カーソルが指していた世代番号
+
+    Returns:
+        inode が一致する世代番号（見つからない場合は None）
+    """
+    for generation in range(hint, MAX_GENERATIONS + 1):
+        path = generation_path(base_path, generation)
+        if path is None:
+            return None
+        if os.stat(path).st_ino == inode:
+            return generation
+    return None
+
+
+def parse_cursor(cursor: str) -> tuple[int, int, Optional[int]]:
+    """
+    カーソル文字列を (世代, inode, オフセット) に分解
+
+    オフセットが END_OF_FILE の場合は None（その世代の末尾）を返す。
+
+    Raises:
+        FileLogError: 形式が不正な場合
+    """
+    parts = cursor.split(":")
+    if (
+        len(parts) != 3
+        or not parts[0].isdigit()
+        or not parts[1].isdigit()
+        or not (parts[2].isdigit() or parts[2] == END_OF_FILE)
+    ):
+        raise FileLogError(f"Invalid cursor: {cursor}")
+
+    generation, inode = int(parts[0]), int(parts[1])
+    offset = None if parts[2] == END_OF_FILE else int(parts[2])
+    if generation > MAX_GENERATIONS:
+        raise FileLogError(f"Cursor generation out of range: {generation}")
+    return generation, inode, offset
+
+
+def format_cursor(generation: int, inode: int, offset: Optional[int]) -> str:
+    """カーソル文字列を生成（offset=None はその世代の末尾）"""
+    return f"{generation}:{inode}:{END_OF_FILE if offset is None else offset}"
+
+
+# ===================================================================
+# 逆方向読み取り
+# ===================================================================
+
+
+def _decode(raw: bytes) -> str:
+    """バイト列を1行の文字列に変換（長さ制限・不正バイト置換）"""
+    if len(raw) > MAX_LINE_BYTES:
+        raw = raw[:MAX_LINE_BYTES]
+    return raw.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def tail_plain(path: str, lines: int, end: Optional[int] = None) -> tuple[list[str], int, int]:
+    """
+    非圧縮ファイルの末尾（または end より前）から lines 行を取得
+
+    mmap 上で rfind を繰り返すため、参照されるのは末尾側のページのみ。
+
+    Args:
+        path: ファイルパス
+        lines: 取得行数
+        end: 読み取り終端オフセット（None の場合はファイル末尾）
+
+    Returns:
+        (古い順の行リスト, 先頭行の開始オフセット, ファイルサイズ)
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if end is None or end > size:
+            end = size
+        if end == 0:
+            return [], 0, size
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # 末尾の改行は行区切りとして扱わない
+            pos = end
+            if mm[pos - 1:pos] == b"\n":
+                pos -= 1
+
+            collected: list[str] = []
+            start = pos
+            while len(collected) < lines:
+                newline = mm.rfind(b"\n", 0, pos)
+                start = newline + 1
+                collected.append(_decode(mm[start:pos]))
+                if newline < 0:
+                    break
+                pos = newline
+
+    collected.reverse()
+    return collected, start, size
+
+
+def tail_gzip(path: str, lines: int, end: Optional[int] = None) -> tuple[list[str], int, int]:
+    """
+    gzip 圧縮ファイルの末尾（または end より前）から lines 行を取得
+
+    gzip は逆方向シークできないため前方にストリーム伸長し、
+    直近 lines 行のみを保持する（メモリ使用量は lines に比例）。
+
+    Args:
+        path: ファイルパス
+        lines: 取得行数
+        end: 伸長後ストリーム上の読み取り終端オフセット（None の場合は末尾）
+
+    Returns:
+        (古い順の行リスト, 先頭行の開始オフセット, 伸長済みバイト数)
+    """
+    window: deque[tuple[int, bytes]] = deque(maxlen=lines)
+    offset = 0
+
+    with gzip.open(path, "rb") as f:
+        for raw in f:
+            line_end = offset + len(raw)
+            if end is not None and line_end > end:
+                # 終端を跨ぐ行は含めない（end は行頭オフセット）
+                break
+            window.append((offset, raw.rstrip(b"\n")))
+            offset = line_end
+
+    if not window:
+        return [], 0, offset
+
+    start = window[0][0]
+    return [_decode(raw) for _, raw in window], start, offset
+
+
+def read_tail(base_path: str, lines: int, cursor: Optional[str] = None) -> dict:
+    """
+    ログファイルを末尾から読み取り、過去方向のカーソルを返す
+
+    現行ファイルの先頭に到達した場合、次のカーソルは1つ古い世代の末尾を指す。
+
+    Args:
+        base_path: 現行ログファイルのパス
+        lines: 取得行数
+        cursor: 前回レスポンスの next_cursor（None の場合は現行ファイル末尾）
+
+    Returns:
+        読み取り結果の辞書
+
+    Raises:
+        FileLogError: ファイルが存在しない / カーソルが無効な場合
+    """
+    generation, end = 0, None
+    if cursor is not None:
+        generation, inode, end = parse_cursor(cursor)
+        path = generation_path(base_path, generation)
+        if path is None or os.stat(path).st_ino != inode:
+            resolved = find_generation_by_inode(base_path, inode, generation)
+            if resolved is None:
+                raise FileLogError("Cursor is no longer valid (log rotated away)")
+            generation = resolved
+
+    path = generation_path(base_path, generation)
+    if path is None:
+        raise FileLogError(f"Log file not found: {base_path}")
+
+    inode = os.stat(path).st_ino
+    compressed = path.endswith(".gz")
+
+    if compressed:
+        collected, start, size = tail_gzip(path, lines, end)
+    else:
+        collected, start, size = tail_plain(path, lines, end)
+
+    if start > 0:
+        next_cursor: Optional[str] = format_cursor(generation, inode, start)
+    else:
+        # 先頭に到達: 1つ古い世代があればその末尾へ（この時点では開かない）
+        older = None
+        if generation < MAX_GENERATIONS:
+            older = generation_path(base_path, generation + 1)
+        if older is not None:
+            next_cursor = format_cursor(generation + 1, os.stat(older).st_ino, None)
+        else:
+            next_cursor = None
+
+    return {
+        "status": "success",
+        "path": path,
+        "generation": generation,
+        "compressed": compressed,
+        "file_size": size,
+        "lines_requested": lines,
+        "lines_returned": len(collected),
+        "lines": collected,
+        "start_offset": start,
+        "next_cursor": next_cursor,
+        "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+    }
+
+
+# ===================================================================
+# 並列チャンク検索
+# ===================================================================
+
+
+def chunk_ranges(path: str, chunk_size: int, start: int = 0) -> list[tuple[int, int]]:
+    """
+    ファイルを改行境界に揃えたチャンク [start, end) に分割
+
+    Args:
+        path: ファイルパス
+        chunk_size: 目安となるチャンクサイズ
+        start: 分割開始オフセット（行頭であること）
+
+    Returns:
+        (開始, 終了) オフセットのリスト（ファイル順）
+    """
+    ranges: list[tuple[int, int]] = []
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if start >= size:
+            return ranges
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            while start < size:
+                end = min(start + chunk_size, size)
+                if end < size:
+                    newline = mm.find(b"\n", end)
+                    end = size if newline < 0 else newline + 1
+                ranges.append((start, end))
+                start = end
+
+    return ranges
+
+
+def search_chunk(
+    path: str, start: int, end: int, pattern: bytes, limit: int
+) -> list[tuple[int, str]]:
+    """
+    チャンク内で固定文字列を含む行を検索（ワーカープロセスで実行）
+
+    1行に複数回出現しても1件として扱う。
+
+    Returns:
+        (行頭オフセット, 行) のリスト（最大 limit 件）
+    """
+    matches: list[tuple[int, str]] = []
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while len(matches) < limit:
+                hit = mm.find(pattern, pos, end)
+                if hit < 0:
+                    break
+
+                newline = mm.rfind(b"\n", start, hit)
+                line_start = start if newline < 0 else newline + 1
+                line_end = mm.find(b"\n", hit, end)
+                if line_end < 0:
+                    line_end = end
+
+                matches.append((line_start, _decode(mm[line_start:line_end])))
+                pos = line_end + 1
+
+    return matches
+
+
+def search_file(
+    base_path: str,
+    pattern: str,
+    limit: int,
+    offset: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = SEARCH_CHUNK_SIZE,
+) -> dict:
+    """
+    ログファイルを並列チャンク検索
+
+    チャンクはファイル順に確定させ、limit 件に達した時点で未着手のチャンクを
+    キャンセルする。投入中のチャンク数はワーカー数の2倍までに抑える。
+
+    Args:
+        base_path: 現行ログファイルのパス
+        pattern: 検索文字列（固定文字列）
+        limit: 最大取得件数
+        offset: 検索開始オフセット（前回の resume_offset）
+        workers: ワーカー数（None の場合は CPU 数と SEARCH_MAX_WORKERS の小さい方）
+        chunk_size: チャンクサイズ
+
+    Returns:
+        検索結果の辞書
+
+    Raises:
+        FileLogError: ファイルが存在しない / パターンが不正な場合
+    """
+    path = generation_path(base_path, 0)
+    if path is None:
+        raise FileLogError(f"Log file not found: {base_path}")
+
+    needle = pattern.encode("utf-8")
+    if not needle or b"\n" in needle:
+        raise FileLogError("Invalid search pattern")
+
+    if workers is None:
+        workers = min(os.cpu_count() or 1, SEARCH_MAX_WORKERS)
+
+    size = os.stat(path).st_size
+    ranges = chunk_ranges(path, chunk_size, offset)
+    matches: list[tuple[int, str]] = []
+    chunks_scanned = 0
+
+    if len(ranges) <= 1 or workers <= 1:
+        for start, end in ranges:
+            matches.extend(search_chunk(path, start, end, needle, limit - len(matches)))
+            chunks_scanned += 1
+            if len(matches) >= limit:
+                break
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            remaining = iter(ranges)
+            pending = deque(
+                pool.submit(search_chunk, path, start, end, needle, limit)
+                for start, end in islice(remaining, workers * 2)
+            )
+            while pending and len(matches) < limit:
+                found = pending.popleft().result()
+                matches.extend(found[: limit - len(matches)])
+                chunks_scanned += 1
+
+                next_range = next(remaining, None)
+                if next_range is not None:
+                    pending.append(pool.submit(search_chunk, path, *next_range, needle, limit))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    truncated = len(matches) >= limit
+    resume_offset = None
+    if truncated:
+        # 最後に返した行の次の行頭から再開できるようにする
+        with open(path, "rb") as f:
+            f.seek(matches[-1][0])
+            f.readline()
+            resume_offset = f.tell()
+        if resume_offset >= size:
+            resume_offset = None
+
+    return {
+        "status": "success",
+        "path": path,
+        "pattern": pattern,
+        "limit": limit,
+        "file_size": size,
+        "matches_returned": len(matches),
+        "matches": [{"offset": line_offset, "line": line} for line_offset, line in matches],
+        "truncated": truncated,
+        "resume_offset": resume_offset,
+        "chunks_scanned": chunks_scanned,
+        "chunks_total": len(ranges),
+        "workers": workers,
+        "timestamp": datetime.now().astimezone().isoformat(timespec="seconds"),
+    }
+
+
+# ===================================================================
+# エントリポイント
+# ===================================================================
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="adminui file log reader")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    tail_parser = subparsers.add_parser("tail")
+    tail_parser.add_argument("--path", required=True)
+    tail_parser.add_argument("--lines", type=int, default=100)
+    tail_parser.add_argument("--cursor", default=None)
+
+    search_parser = subparsers.add_parser("search")
+    search_parser.add_argument("--path", required=True)
+    search_parser.add_argument("--pattern", required=True)
+    search_parser.add_argument("--limit", type=int, default=100)
+    search_parser.add_argument("--offset", type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.mode == "tail":
+            result = read_tail(args.path, args.lines, args.cursor)
+        else:
+            result = search_file(args.path, args.pattern, args.limit, args.offset)
+    except (FileLogError, OSError) as e:
+        json.dump({"status": "error", "message": str(e)}, sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return 1
+
+    json.dump(result, sys.stdout, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
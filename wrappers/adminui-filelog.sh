@@ -0,0 +1,259 @@
+#!/bin/bash
+# adminui-filelog.sh - ファイルログ閲覧ラッパー
+#
+# 用途: /var/log 配下のプレーンテキストログの安全な閲覧（journald 非対応サービス向け）
+# 権限: root 権限必要（/var/log の読み取り）
+# 呼び出し: sudo /usr/local/sbin/adminui-filelog.sh <tail|search> <log_name> [options]
+#
+# セキュリティ原則:
+# - allowlist 方式（ログ名 → 固定パスの対応表のみ）
+# - 入力検証必須
+# - 読み取り処理は同梱ヘルパー（adminui-filelog-reader.py）に委譲
+# - ファイル全体をメモリに読み込まない
+
+set -euo pipefail
+
+# ログ出力
+log() {
+    logger -t adminui-filelog -p user.info "$*"
+    echo "[$(date -Iseconds)] $*" >&2
+}
+
+# エラーログ
+error() {
+    logger -t adminui-filelog -p user.err "ERROR: $*"
+    echo "[$(date -Iseconds)] ERROR: $*" >&2
+}
+
+# 使用方法
+usage() {
+    echo "Usage: $0 <tail|search> <log_name> [OPTIONS]" >&2
+    echo "" >&2
+    echo "Options (tail):" >&2
+    echo "  --lines=<N>        Number of lines (default: 100, max: 1000)" >&2
+    echo "  --cursor=<G:I:O>   Paging cursor returned as next_cursor" >&2
+    echo "" >&2
+    echo "Options (search):" >&2
+    echo "  --pattern=<TEXT>   Fixed string to search (required)" >&2
+    echo "  --limit=<N>        Max matches (default: 100, max: 1000)" >&2
+    echo "  --offset=<N>       Resume offset returned as resume_offset" >&2
+    echo "" >&2
+    echo "Allowed logs:" >&2
+    for name in "${!ALLOWED_LOGS[@]}"; do
+        echo "  - $name (${ALLOWED_LOGS[$name]})" >&2
+    done
+    exit 1
+}
+
+# ===================================================================
+# 許可ログリスト（allowlist）
+# ===================================================================
+declare -A ALLOWED_LOGS=(
+    ["syslog"]="/var/log/syslog"
+    ["auth"]="/var/log/auth.log"
+    ["kern"]="/var/log/kern.log"
+    ["nginx-access"]="/var/log/nginx/access.log"
+    ["nginx-error"]="/var/log/nginx/error.log"
+    ["postgresql"]="/var/log/postgresql/postgresql.log"
+    ["redis"]="/var/log/redis/redis-server.log"
+)
+
+# ===================================================================
+# 禁止文字パターン
+# ===================================================================
+# shellcheck disable=SC2016
+FORBIDDEN_CHARS='[;|&$()` ><*?{}[\]]'
+
+# ===================================================================
+# デフォルト設定
+# ===================================================================
+DEFAULT_LINES=100
+MAX_LINES=1000
+DEFAULT_LIMIT=100
+MAX_LIMIT=1000
+MAX_PATTERN_LENGTH=128
+PYTHON_BIN="/usr/bin/python3"
+READER="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/adminui-filelog-reader.py"
+
+# ===================================================================
+# 入力パース
+# ===================================================================
+
+if [ $# -lt 2 ]; then
+    error "Invalid number of arguments: expected at least 2, got $#"
+    usage
+fi
+
+MODE="$1"
+LOG_NAME="$2"
+shift 2
+
+LINES=$DEFAULT_LINES
+CURSOR=""
+PATTERN=""
+LIMIT=$DEFAULT_LIMIT
+OFFSET=0
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --lines=*)
+            LINES="${1#*=}"
+            shift
+            ;;
+        --cursor=*)
+            CURSOR="${1#*=}"
+            shift
+            ;;
+        --pattern=*)
+            PATTERN="${1#*=}"
+            shift
+            ;;
+        --limit=*)
+            LIMIT="${1#*=}"
+            shift
+            ;;
+        --offset=*)
+            OFFSET="${1#*=}"
+            shift
+            ;;
+        *)
+            error "Unknown argument: $1"
+            usage
+            ;;
+    esac
+done
+
+# 実行前ログ
+log "File log requested: mode=$MODE, log=$LOG_NAME, lines=$LINES, cursor=$CURSOR, pattern=$PATTERN, limit=$LIMIT, offset=$OFFSET, caller=${SUDO_USER:-$USER}"
+
+# ===================================================================
+# 入力検証
+# ===================================================================
+
+# モード検証
+if [ "$MODE" != "tail" ] && [ "$MODE" != "search" ]; then
+    error "Invalid mode: $MODE"
+    echo '{"status": "error", "message": "Invalid mode"}'
+    exit 1
+fi
+
+# ログ名の検証
+if [ ${#LOG_NAME} -gt 64 ]; then
+    error "Log name too long"
+    exit 1
+fi
+
+if [[ "$LOG_NAME" =~ $FORBIDDEN_CHARS ]]; then
+    error "Forbidden character detected in log name"
+    log "SECURITY: Forbidden character detected in log name - caller=${SUDO_USER:-$USER}"
+    exit 1
+fi
+
+if [[ ! "$LOG_NAME" =~ ^[a-zA-Z0-9_-]+$ ]]; then
+    error "Invalid log name format"
+    exit 1
+fi
+
+# allowlist チェック
+if [ -z "${ALLOWED_LOGS[$LOG_NAME]+x}" ]; then
+    error "Log not in allowlist: $LOG_NAME"
+    log "SECURITY: Unauthorized file log attempt - log=$LOG_NAME, caller=${SUDO_USER:-$USER}"
+    echo "{\"status\": \"error\", \"message\": \"Log not allowed: $LOG_NAME\"}"
+    exit 1
+fi
+
+LOG_PATH="${ALLOWED_LOGS[$LOG_NAME]}"
+
+# 行数の検証
+if [[ ! "$LINES" =~ ^[0-9]+$ ]]; then
+    error "Invalid lines parameter: must be a number"
+    echo '{"status": "error", "message": "Invalid lines"}'
+    exit 1
+fi
+
+if [ "$LINES" -lt 1 ]; then
+    LINES=1
+elif [ "$LINES" -gt "$MAX_LINES" ]; then
+    log "WARN: Requested lines ($LINES) exceeds max ($MAX_LINES), capping to $MAX_LINES"
+    LINES=$MAX_LINES
+fi
+
+# カーソルの検証（<世代>:<inode>:<オフセット|end>）
+if [ -n "$CURSOR" ] && [[ ! "$CURSOR" =~ ^[0-9]{1,2}:[0-9]{1,20}:([0-9]{1,20}|end)$ ]]; then
+    error "Invalid cursor format"
+    echo '{"status": "error", "message": "Invalid cursor"}'
+    exit 1
+fi
+
+# 検索パターンの検証（固定文字列、英数字と一部記号のみ）
+if [ "$MODE" = "search" ]; then
+    if [ -z "$PATTERN" ]; then
+        error "Search pattern is empty"
+        echo '{"status": "error", "message": "Invalid pattern"}'
+        exit 1
+    fi
+
+    if [ ${#PATTERN} -gt $MAX_PATTERN_LENGTH ]; then
+        error "Search pattern too long"
+        echo '{"status": "error", "message": "Invalid pattern"}'
+        exit 1
+    fi
+
+    if [[ "$PATTERN" =~ $FORBIDDEN_CHARS ]] || [[ ! "$PATTERN" =~ ^[a-zA-Z0-9._:@/=,+-]+$ ]]; then
+        error "Invalid search pattern format"
+        log "SECURITY: Invalid search pattern rejected - log=$LOG_NAME, caller=${SUDO_USER:-$USER}"
+        echo '{"status": "error", "message": "Invalid pattern"}'
+        exit 1
+    fi
+
+    if [[ ! "$LIMIT" =~ ^[0-9]+$ ]]; then
+        error "Invalid limit parameter: must be a number"
+        echo '{"status": "error", "message": "Invalid limit"}'
+        exit 1
+    fi
+
+    if [ "$LIMIT" -lt 1 ]; then
+        LIMIT=1
+    elif [ "$LIMIT" -gt "$MAX_LIMIT" ]; then
+        log "WARN: Requested limit ($LIMIT) exceeds max ($MAX_LIMIT), capping to $MAX_LIMIT"
+        LIMIT=$MAX_LIMIT
+    fi
+
+    if [[ ! "$OFFSET" =~ ^[0-9]{1,20}$ ]]; then
+        error "Invalid offset parameter: must be a number"
+        echo '{"status": "error", "message": "Invalid offset"}'
+        exit 1
+    fi
+fi
+
+# シンボリックリンクの拒否（allowlist 外のファイルへの誘導防止）
+if [ -L "$LOG_PATH" ]; then
+    error "Log path is a symbolic link: $LOG_PATH"
+    log "SECURITY: Symbolic link rejected - log=$LOG_NAME, caller=${SUDO_USER:-$USER}"
+    echo '{"status": "error", "message": "Log path is a symbolic link"}'
+    exit 1
+fi
+
+if [ ! -f "$READER" ]; then
+    error "Reader helper not found: $READER"
+    echo '{"status": "error", "message": "Reader helper not found"}'
+    exit 1
+fi
+
+# ===================================================================
+# ログ取得実行
+# ===================================================================
+
+log "File log authorized: mode=$MODE, log=$LOG_NAME, path=$LOG_PATH"
+
+# 読み取りヘルパーを実行（配列渡し、-I -S で環境変数・site-packages を無視）
+if [ "$MODE" = "search" ]; then
+    READER_ARGS=("$MODE" "--path=$LOG_PATH" "--pattern=$PATTERN" "--limit=$LIMIT" "--offset=$OFFSET")
+else
+    READER_ARGS=("$MODE" "--path=$LOG_PATH" "--lines=$LINES")
+    if [ -n "$CURSOR" ]; then
+        READER_ARGS+=("--cursor=$CURSOR")
+    fi
+fi
+
+exec "$PYTHON_BIN" -I -S "$READER" "${READER_ARGS[@]}"
@@ -0,0 +1,187 @@
+#!/bin/bash
+# adminui-logs-export.sh - ログ一括エクスポートラッパー
+#
+# 用途: journalctl の出力を行数制限なしでストリーミング出力（インシデント調査用）
+# 権限: root 権限必要（全ログへのアクセス）
+# 呼び出し: sudo /usr/local/sbin/adminui-logs-export.sh <service_name> [options]
+#
+# セキュリティ原則:
+# - allowlist 方式
+# - 入力検証必須
+# - 配列渡しによるコマンド実行
+# - 出力は journalctl から直接 stdout へ（メモリに溜めない）
+
+set -euo pipefail
+
+# ログ出力
+log() {
+    logger -t adminui-logs-export -p user.info "$*"
+    echo "[$(date -Iseconds)] $*" >&2
+}
+
+# エラーログ
+error() {
+    logger -t adminui-logs-export -p user.err "ERROR: $*"
+    echo "[$(date -Iseconds)] ERROR: $*" >&2
+}
+
+# 使用方法
+usage() {
+    echo "Usage: $0 <service_name> [OPTIONS]" >&2
+    echo "" >&2
+    echo "Options:" >&2
+    echo "  --since=@<epoch>        Start time (seconds since epoch)" >&2
+    echo "  --until=@<epoch>        End time (seconds since epoch)" >&2
+    echo "  --format=<ndjson|text>  Output format (default: ndjson)" >&2
+    echo "" >&2
+    echo "Allowed services:" >&2
+    for service in "${ALLOWED_SERVICES[@]}"; do
+        echo "  - $service" >&2
+    done
+    exit 1
+}
+
+# ===================================================================
+# 許可サービスリスト（allowlist）
+# ===================================================================
+ALLOWED_SERVICES=(
+    "nginx"
+    "postgresql"
+    "redis"
+    "sshd"
+    "systemd"
+)
+
+# ===================================================================
+# 禁止文字パターン
+# ===================================================================
+# shellcheck disable=SC2016
+FORBIDDEN_CHARS='[;|&$()` ><*?{}[\]]'
+
+# ===================================================================
+# デフォルト設定
+# ===================================================================
+FORMAT="ndjson"
+SINCE=""
+UNTIL=""
+
+# NDJSON 出力に含めるフィールド（journal の内部フィールドは除外）
+OUTPUT_FIELDS="__REALTIME_TIMESTAMP,PRIORITY,SYSLOG_IDENTIFIER,_PID,MESSAGE"
+
+# ===================================================================
+# 入力パース
+# ===================================================================
+
+if [ $# -lt 1 ]; then
+    error "Invalid number of arguments: expected at least 1, got $#"
+    usage
+fi
+
+SERVICE_NAME="$1"
+shift
+
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --since=*)
+            SINCE="${1#*=}"
+            shift
+            ;;
+        --until=*)
+            UNTIL="${1#*=}"
+            shift
+            ;;
+        --format=*)
+            FORMAT="${1#*=}"
+            shift
+            ;;
+        *)
+            error "Unknown argument: $1"
+            usage
+            ;;
+    esac
+done
+
+# 実行前ログ
+log "Log export requested: service=$SERVICE_NAME, since=$SINCE, until=$UNTIL, format=$FORMAT, caller=${SUDO_USER:-$USER}"
+
+# ===================================================================
+# 入力検証
+# ===================================================================
+
+# サービス名の検証
+if [ -z "$SERVICE_NAME" ]; then
+    error "Service name is empty"
+    exit 1
+fi
+
+if [ ${#SERVICE_NAME} -gt 64 ]; then
+    error "Service name too long"
+    exit 1
+fi
+
+if [[ "$SERVICE_NAME" =~ $FORBIDDEN_CHARS ]]; then
+    error "Forbidden character detected in service name"
+    exit 1
+fi
+
+if [[ ! "$SERVICE_NAME" =~ ^[a-zA-Z0-9_-]+$ ]]; then
+    error "Invalid service name format"
+    exit 1
+fi
+
+# allowlist チェック
+SERVICE_ALLOWED=false
+for allowed in "${ALLOWED_SERVICES[@]}"; do
+    if [ "$SERVICE_NAME" = "$allowed" ]; then
+        SERVICE_ALLOWED=true
+        break
+    fi
+done
+
+if [ "$SERVICE_ALLOWED" = false ]; then
+    error "Service not in allowlist: $SERVICE_NAME"
+    log "SECURITY: Unauthorized log export attempt - service=$SERVICE_NAME, caller=${SUDO_USER:-$USER}"
+    echo "{\"status\": \"error\", \"message\": \"Service not allowed: $SERVICE_NAME\"}"
+    exit 1
+fi
+
+# 期間の検証（@<epoch 秒> 形式のみ）
+for value in "$SINCE" "$UNTIL"; do
+    if [ -n "$value" ] && [[ ! "$value" =~ ^@[0-9]{1,12}$ ]]; then
+        error "Invalid time range: $value"
+        echo '{"status": "error", "message": "Invalid time range"}'
+        exit 1
+    fi
+done
+
+# 出力形式の検証
+case "$FORMAT" in
+    ndjson)
+        JOURNAL_ARGS=("-o" "json" "--output-fields=$OUTPUT_FIELDS")
+        ;;
+    text)
+        JOURNAL_ARGS=("-o" "short-iso")
+        ;;
+    *)
+        error "Invalid format: $FORMAT"
+        echo '{"status": "error", "message": "Invalid format"}'
+        exit 1
+        ;;
+esac
+
+# ===================================================================
+# エクスポート実行
+# ===================================================================
+
+JOURNAL_ARGS+=("-u" "$SERVICE_NAME" "--no-pager")
+if [ -n "$SINCE" ]; then
+    JOURNAL_ARGS+=("--since=$SINCE")
+fi
+if [ -n "$UNTIL" ]; then
+    JOURNAL_ARGS+=("--until=$UNTIL")
+fi
+
+log "Log export authorized: service=$SERVICE_NAME, format=$FORMAT"
+
+# journalctl の出力をそのまま stdout へ（配列渡し）
+exec journalctl "${JOURNAL_ARGS[@]}"
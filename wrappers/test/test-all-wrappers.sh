@@ -154,9 +154,81 @@ fi
 echo ""
 
 # ===================================================================
-# Test 4: セキュリティパターン検出
+# Test 4: adminui-filelog.sh
 # ===================================================================
-echo "Test 4: Security Pattern Detection"
+echo "Test 4: adminui-filelog.sh"
+echo "-----------------------------------------"
+
+# 異常系: 引数なし
+OUTPUT=$(bash "$WRAPPERS_DIR/adminui-filelog.sh" 2>&1 || true)
+if echo "$OUTPUT" | grep -qi "usage\|argument"; then
+    pass "Rejects execution without arguments"
+else
+    fail "Should reject execution without arguments"
+fi
+
+# 異常系: 特殊文字
+OUTPUT=$(bash "$WRAPPERS_DIR/adminui-filelog.sh" tail "syslog; cat /etc/shadow" 2>&1 || true)
+if echo "$OUTPUT" | grep -qi "forbidden\|invalid"; then
+    pass "Rejects command injection in file log name"
+else
+    fail "Should reject command injection in file log name"
+fi
+
+# 異常系: 許可リスト外のログ
+OUTPUT=$(bash "$WRAPPERS_DIR/adminui-filelog.sh" tail "shadow" 2>&1 || true)
+if echo "$OUTPUT" | grep -qi "not.*allowlist\|not allowed"; then
+    pass "Rejects non-allowlisted file log"
+else
+    fail "Should reject non-allowlisted file log"
+fi
+
+# 異常系: 不正なカーソル
+OUTPUT=$(bash "$WRAPPERS_DIR/adminui-filelog.sh" tail "syslog" "--cursor=../../etc" 2>&1 || true)
+if echo "$OUTPUT" | grep -qi "invalid.*cursor"; then
+    pass "Rejects malformed cursor"
+else
+    fail "Should reject malformed cursor"
+fi
+
+echo ""
+
+# ===================================================================
+# Test 5: adminui-logs-export.sh
+# ===================================================================
+echo "Test 5: adminui-logs-export.sh"
+echo "-----------------------------------------"
+
+# 異常系: 許可リスト外のサービス
+OUTPUT=$(bash "$WRAPPERS_DIR/adminui-logs-export.sh" "malicious" 2>&1 || true)
+if echo "$OUTPUT" | grep -qi "not.*allowlist\|not allowed"; then
+    pass "Rejects non-allowlisted service for export"
+else
+    fail "Should reject non-allowlisted service for export"
+fi
+
+# 異常系: 不正な期間指定
+OUTPUT=$(bash "$WRAPPERS_DIR/adminui-logs-export.sh" "nginx" "--since=yesterday" 2>&1 || true)
+if echo "$OUTPUT" | grep -qi "invalid time range"; then
+    pass "Rejects non-epoch time range"
+else
+    fail "Should reject non-epoch time range"
+fi
+
+# 異常系: 不正な出力形式
+OUTPUT=$(bash "$WRAPPERS_DIR/adminui-logs-export.sh" "nginx" "--format=cat" 2>&1 || true)
+if echo "$OUTPUT" | grep -qi "invalid format"; then
+    pass "Rejects unknown export format"
+else
+    fail "Should reject unknown export format"
+fi
+
+echo ""
+
+# ===================================================================
+# Test 6: セキュリティパターン検出
+# ===================================================================
+echo "Test 6: Security Pattern Detection"
 echo "-----------------------------------------"
 
 # shell=True が使用されていないことを確認